@@ -0,0 +1,130 @@
+"""
+MakkelijkPdf - Asyncio Conversie API
+
+Async varianten van de functies in core.py. Renderen gebeurt met een
+niet-blokkerend pdftoppm proces waarvan de pagina's gestreamd worden zodra
+ze klaar zijn; CPU werk (coderen, samenvoegen) draait in de default
+executor. Een semaphore per event loop begrenst het aantal gelijktijdige
+conversies.
+"""
+
+import asyncio
+import functools
+import os
+import weakref
+import core
+from poppler import poppler_command
+
+# Standaard maximum aantal gelijktijdige conversies per event loop
+DEFAULT_CONCURRENCY = os.cpu_count() or 4
+
+# Semaphore per event loop (asyncio primitives horen bij één loop)
+_limiters = weakref.WeakKeyDictionary()
+
+
+def get_limiter():
+    """Semaphore die het aantal gelijktijdige conversies op deze loop begrenst"""
+    loop = asyncio.get_running_loop()
+    if loop not in _limiters:
+        _limiters[loop] = asyncio.Semaphore(DEFAULT_CONCURRENCY)
+    return _limiters[loop]
+
+
+def set_concurrency(concurrency):
+    """Stel het maximum aantal gelijktijdige conversies op deze loop in"""
+    _limiters[asyncio.get_running_loop()] = asyncio.Semaphore(concurrency)
+
+
+async def _feed(stdin, data):
+    """Schrijf de PDF naar stdin van pdftoppm en sluit af"""
+    try:
+        stdin.write(data)
+        await stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # pdftoppm is al gestopt; de fout komt via de exit code
+        pass
+    finally:
+        stdin.close()
+
+
+async def _read_ppm(stdout):
+    """Lees één PPM (P6) afbeelding van een stream, None bij het einde"""
+    from PIL import Image
+
+    magic = await stdout.readline()
+    if not magic:
+        return None
+    if magic.strip() != b"P6":
+        raise RuntimeError("Onverwachte output van pdftoppm")
+    width, height = (int(value) for value in (await stdout.readline()).split())
+    if int(await stdout.readline()) != 255:
+        raise RuntimeError("Onverwachte output van pdftoppm")
+    data = await stdout.readexactly(width * height * 3)
+    return Image.frombytes("RGB", (width, height), data)
+
+
+async def render_images(source, dpi=300, first_page=None, last_page=None, limiter=None):
+    """Async iterator van (pagina nummer, PIL afbeelding), gestreamd uit pdftoppm"""
+    path, data = core.load_source(source)
+    args = [poppler_command("pdftoppm"), "-r", str(int(dpi)), "-f", str(first_page or 1)]
+    if last_page:
+        args += ["-l", str(last_page)]
+    args.append(path or "-")
+
+    async with limiter or get_limiter():
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE if data is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        feeder = asyncio.ensure_future(_feed(process.stdin, data)) if data is not None else None
+        errors = asyncio.ensure_future(process.stderr.read())
+        try:
+            page_number = first_page or 1
+            while True:
+                page = await _read_ppm(process.stdout)
+                if page is None:
+                    break
+                yield page_number, page
+                page_number += 1
+
+            if feeder:
+                await feeder
+            if await process.wait() != 0:
+                message = (await errors).decode("utf-8", "ignore").strip()
+                raise RuntimeError(f"pdftoppm gefaald: {message}")
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            for task in (feeder, errors):
+                if task and not task.done():
+                    task.cancel()
+
+
+async def render_pages(source, dpi=300, output_format="PNG", quality=95, first_page=None, last_page=None,
+                       limiter=None):
+    """Async iterator van (pagina nummer, gecodeerde bytes)"""
+    loop = asyncio.get_running_loop()
+    async for page_number, page in render_images(source, dpi, first_page, last_page, limiter):
+        encoded = await loop.run_in_executor(None, core.encode_page, page, output_format, quality)
+        yield page_number, encoded
+
+
+async def images_to_pdf(images, output, linearize=False, compact=False, limiter=None):
+    """Async variant van core.images_to_pdf"""
+    loop = asyncio.get_running_loop()
+    async with limiter or get_limiter():
+        return await loop.run_in_executor(
+            None, functools.partial(core.images_to_pdf, list(images), output, linearize, compact)
+        )
+
+
+async def merge(inputs, output, linearize=False, compact=False, limiter=None):
+    """Async variant van core.merge"""
+    loop = asyncio.get_running_loop()
+    async with limiter or get_limiter():
+        return await loop.run_in_executor(
+            None, functools.partial(core.merge, list(inputs), output, linearize, compact)
+        )
@@ -0,0 +1,61 @@
+"""
+MakkelijkPdf - Lege pagina's herkennen
+
+Gescande stapels bevatten vaak lege scheidingsvellen. Een snelle pre-scan
+op lage DPI meet per pagina de inktbedekking en de spreiding van de
+grijswaarden (met NumPy, zonder Python lus over pixels). Pagina's die
+binnen de tolerantie leeg zijn hoeven daarna niet op volle resolutie
+gerenderd, gecodeerd en opgeslagen te worden.
+"""
+
+import core
+
+# DPI van de pre-scan; genoeg om tekst als inkt te zien
+SCAN_DPI = 24
+
+# Zoveel donkerder dan het papier telt een pixel als inkt
+INK_LEVEL = 64
+
+# Maximale inktbedekking (fractie van de pagina) van een lege pagina
+DEFAULT_TOLERANCE = 0.002
+
+# Maximale standaarddeviatie van de grijswaarden (papierstructuur, ruis)
+MAX_DEVIATION = 8.0
+
+# Het papier van een lege pagina is minstens zo licht (donkere of zwarte pagina's zijn niet leeg)
+MIN_PAPER_LEVEL = 200
+
+# Randen van de scan tellen niet mee (scanner randen, perforatie)
+MARGIN = 0.04
+
+
+def page_stats(image):
+    """Inktbedekking (fractie), standaarddeviatie en papier niveau van de grijswaarden"""
+    import numpy as np
+
+    gray = np.asarray(image.convert("L"), dtype=np.float32)
+    height, width = gray.shape
+    top, left = int(height * MARGIN), int(width * MARGIN)
+    gray = gray[top:height - top, left:width - left]
+    if gray.size == 0:
+        return 0.0, 0.0, 255.0
+
+    # Het papier is de lichte meerderheid van de pixels, ook als het grijs is
+    paper = np.percentile(gray, 90)
+    coverage = np.count_nonzero(gray < paper - INK_LEVEL) / gray.size
+    return float(coverage), float(gray.std()), float(paper)
+
+
+def is_blank(image, tolerance=DEFAULT_TOLERANCE):
+    """Is deze pagina leeg binnen de tolerantie?"""
+    coverage, deviation, paper = page_stats(image)
+    return paper >= MIN_PAPER_LEVEL and coverage <= tolerance and deviation <= MAX_DEVIATION
+
+
+def find_blank_pages(source, tolerance=DEFAULT_TOLERANCE, dpi=SCAN_DPI, backend="auto"):
+    """Pre-scan: dict pagina nummer -> lage resolutie afbeelding van elke lege pagina"""
+    blank = {}
+    for page_number, page in core.render_images(source, dpi, backend=backend):
+        if is_blank(page, tolerance):
+            blank[page_number] = page
+    return blank
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+MakkelijkPdf - Kalibratie (prestatie-instellingen afstemmen op deze machine)
+
+Maakt een test PDF, meet render- en coderingssnelheid voor verschillende
+aantallen workers en compressie niveaus, kijkt hoeveel CPU en geheugen er
+echt beschikbaar zijn (ook binnen een container) en schrijft de beste
+waarden naar de instellingen.
+"""
+
+import argparse
+import os
+import platform
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import core
+from settings import SettingsManager
+
+# Standaard grootte van de benchmark
+BENCHMARK_PAGES = 8
+BENCHMARK_DPI = 150
+
+# Meer workers moeten minstens zoveel sneller zijn om gekozen te worden
+SPEEDUP_THRESHOLD = 1.1
+
+# Sterkere compressie mag maximaal dit deel van de tijd per pagina extra kosten
+ENCODE_BUDGET = 0.5
+
+# Deel van het beschikbare geheugen dat conversies mogen gebruiken
+MEMORY_FRACTION = 0.5
+
+# Een gerenderde pagina kost tijdens het coderen ongeveer zoveel keer zijn eigen grootte
+PAGE_MEMORY_FACTOR = 3
+
+COMPRESSION_LEVELS = ["none", "fast", "best"]
+
+
+def _read(path):
+    """Lees een klein systeem bestand, None als het niet bestaat"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_quota():
+    """Aantal CPU's dat dit proces mag gebruiken (affinity en cgroup quota)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2: "quota periode" of "max periode"
+    cpu_max = _read("/sys/fs/cgroup/cpu.max")
+    if cpu_max:
+        quota, period = cpu_max.split()[:2]
+        if quota != "max":
+            cpus = min(cpus, int(quota) / int(period))
+    else:
+        # cgroup v1: quota -1 betekent geen limiet
+        quota = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period = _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+        if quota and period and int(quota) > 0:
+            cpus = min(cpus, int(quota) / int(period))
+
+    return max(1, int(cpus))
+
+
+def available_memory():
+    """Beschikbaar geheugen in bytes (rekening houdend met cgroup limieten), None als onbekend"""
+    available = None
+    meminfo = _read("/proc/meminfo")
+    if meminfo:
+        for line in meminfo.splitlines():
+            if line.startswith("MemAvailable:"):
+                available = int(line.split()[1]) * 1024
+    elif platform.system() == "Windows":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("sullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            available = status.ullAvailPhys
+    else:
+        try:
+            available = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // 2
+        except (ValueError, OSError, AttributeError):
+            pass
+
+    # cgroup v2 en v1 (een enorme limiet betekent geen limiet)
+    for limit_file, usage_file in [("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+                                   ("/sys/fs/cgroup/memory/memory.limit_in_bytes",
+                                    "/sys/fs/cgroup/memory/memory.usage_in_bytes")]:
+        limit = _read(limit_file)
+        usage = _read(usage_file)
+        if limit and limit.isdigit() and int(limit) < 1 << 60:
+            remaining = int(limit) - int(usage or 0)
+            available = remaining if available is None else min(available, remaining)
+            break
+
+    return available
+
+
+def make_test_pdf(path, pages=BENCHMARK_PAGES):
+    """Maak een A4 test PDF met tekst-achtige regels en een foto-achtig vlak per pagina
+
+    Geeft de bron afbeeldingen terug (gebruikt als poppler ontbreekt).
+    """
+    from PIL import Image, ImageDraw
+
+    width, height = 827, 1169  # A4 op 100 DPI
+    images = []
+    for page in range(pages):
+        image = Image.new("RGB", (width, height), "white")
+        draw = ImageDraw.Draw(image)
+        for line in range(40):
+            y = 80 + line * 18
+            if y > height // 2:
+                break
+            # Regels van wisselende lengte als "tekst"
+            draw.rectangle([70, y, 70 + (300 + (line * 97 + page * 31) % 420), y + 8], fill="black")
+        photo = Image.effect_noise((width - 140, height // 2 - 140), 60).convert("RGB")
+        image.paste(photo, (70, height // 2 + 40))
+        images.append(image)
+    core.images_to_pdf(images, path)
+    return images
+
+
+def _render_job(pdf_path, page_number, dpi):
+    """Render en codeer één pagina; geeft (render seconden, codeer seconden) terug"""
+    start = time.perf_counter()
+    _, page = next(core.render_images(pdf_path, dpi, page_number, page_number))
+    rendered = time.perf_counter()
+    core.encode_page(page, "PNG")
+    return rendered - start, time.perf_counter() - rendered
+
+
+def _encode_job(image, compression):
+    """Codeer één pagina; geeft (seconden, bytes) terug"""
+    start = time.perf_counter()
+    size = len(core.encode_page(image, "PNG", compression=compression))
+    return time.perf_counter() - start, size
+
+
+def _worker_counts(max_workers):
+    """1, 2, 4, ... tot en met max_workers"""
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def benchmark_workers(jobs, workers):
+    """Pagina's per seconde voor een lijst (functie, argumenten) met een aantal workers"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Processen eerst opstarten, dat hoort niet bij de meting
+        list(executor.map(abs, range(workers)))
+        start = time.perf_counter()
+        results = [future.result() for future in [executor.submit(function, *args) for function, args in jobs]]
+    return len(jobs) / (time.perf_counter() - start), results
+
+
+def calibrate(settings=None, pages=BENCHMARK_PAGES, dpi=BENCHMARK_DPI, apply=True, log=print):
+    """Meet deze machine en schrijf afgestemde instellingen; geeft het rapport terug"""
+    settings = settings or SettingsManager()
+    cpus = cpu_quota()
+    memory = available_memory()
+    log(f"   🖥️ CPU's beschikbaar: {cpus}")
+    if memory:
+        log(f"   🧠 Geheugen beschikbaar: {memory / (1024 * 1024):.0f} MB")
+
+    # Genoeg pagina's zodat elke worker iets te doen heeft
+    pages = max(pages, 2 * cpus)
+    with tempfile.TemporaryDirectory() as temp_folder:
+        pdf_path = os.path.join(temp_folder, "kalibratie.pdf")
+        images = make_test_pdf(pdf_path, pages)
+
+        # Met poppler: renderen + coderen meten, anders alleen coderen
+        try:
+            samples = [page for _, page in core.render_images(pdf_path, dpi, 1, min(3, pages))]
+            jobs = [(_render_job, (pdf_path, page, dpi)) for page in range(1, pages + 1)]
+            log("   ✅ Renderen en coderen wordt gemeten")
+        except (OSError, RuntimeError) as e:
+            samples = images[:3]
+            jobs = [(_encode_job, (image, "none")) for image in images]
+            log(f"   ⚠️ Renderen niet mogelijk ({e}), alleen coderen wordt gemeten")
+
+        # Aantal workers: alleen meer als dat echt sneller is
+        throughput = {}
+        render_seconds = 0.0
+        for workers in _worker_counts(cpus):
+            throughput[workers], results = benchmark_workers(jobs, workers)
+            if workers == 1 and jobs[0][0] is _render_job:
+                render_seconds = sum(result[0] for result in results) / len(results)
+            log(f"   ⏱️ {workers} worker(s): {throughput[workers]:.1f} pagina's/s")
+        best_workers = 1
+        for workers in sorted(throughput):
+            if throughput[workers] >= throughput[best_workers] * SPEEDUP_THRESHOLD:
+                best_workers = workers
+
+        # Compressie: kleinste output die binnen het tijdsbudget blijft
+        encode = {}
+        for level in COMPRESSION_LEVELS:
+            timings = [_encode_job(image, level) for image in samples]
+            encode[level] = (
+                sum(seconds for seconds, _ in timings) / len(timings),
+                sum(size for _, size in timings) / len(timings)
+            )
+            log(f"   🗜️ Compressie {level}: {encode[level][0] * 1000:.0f} ms, {encode[level][1] / 1024:.0f} KB per pagina")
+
+    base_seconds = encode["none"][0]
+    budget = ENCODE_BUDGET * (render_seconds + base_seconds)
+    compression = min(
+        (level for level in COMPRESSION_LEVELS if encode[level][0] - base_seconds <= budget),
+        key=lambda level: encode[level][1]
+    )
+
+    # Geheugen limiet en genoeg geheugen per worker op de standaard DPI
+    if memory:
+        memory_limit = max(256, int(memory * MEMORY_FRACTION / (1024 * 1024)) // 64 * 64)
+    else:
+        memory_limit = settings.get("advanced", "memory_limit", 512)
+    default_dpi = settings.get("conversion", "default_dpi", 300)
+    page_bytes = int(8.27 * default_dpi) * int(11.69 * default_dpi) * 3 * PAGE_MEMORY_FACTOR
+    thread_count = max(1, min(best_workers, memory_limit * 1024 * 1024 // page_bytes))
+
+    report = {
+        "cpus": cpus,
+        "memory_available": memory,
+        "throughput": throughput,
+        "encode": encode,
+        "thread_count": thread_count,
+        "memory_limit": memory_limit,
+        "compression": compression,
+    }
+    log(f"   🎯 Workers: {thread_count}, geheugen limiet: {memory_limit} MB, compressie: {compression}")
+
+    if apply:
+        with settings.batch():
+            settings.set("advanced", "thread_count", thread_count)
+            settings.set("advanced", "memory_limit", memory_limit)
+            settings.set("conversion", "compression", compression)
+    return report
+
+
+def main():
+    """Kalibreer vanaf de command line"""
+    parser = argparse.ArgumentParser(description="MakkelijkPdf kalibratie: stem prestatie-instellingen af op deze machine")
+    parser.add_argument("--pages", type=int, default=BENCHMARK_PAGES, help="Aantal pagina's in de test PDF")
+    parser.add_argument("--dpi", type=int, default=BENCHMARK_DPI, help="DPI voor de render benchmark")
+    parser.add_argument("--dry-run", action="store_true", help="Alleen meten, instellingen niet aanpassen")
+    args = parser.parse_args()
+
+    print("📏 Kalibreer MakkelijkPdf...")
+    calibrate(pages=args.pages, dpi=args.dpi, apply=not args.dry_run)
+    if not args.dry_run:
+        print("✅ Instellingen bijgewerkt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+MakkelijkPdf - Conversie Kern (zonder GUI)
+
+Alle functies accepteren bestandspaden, bytes en file-like objecten, zodat
+ze zonder tijdelijke bestanden in andere programma's gebruikt kunnen worden.
+
+PyPDF2, pdf2image en Pillow worden pas geïmporteerd als een functie ze
+nodig heeft, zodat een import van deze module snel blijft.
+"""
+
+import importlib.util
+import os
+from io import BytesIO
+from pathlib import Path
+from poppler import poppler_command
+
+# Aantal pagina's dat per keer gerenderd wordt (begrenst het geheugen)
+RENDER_CHUNK = 10
+
+
+def load_source(source):
+    """Geef een bron terug als (pad, None) of (None, bytes)
+
+    Een file-like object wordt één keer helemaal gelezen.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source), None
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return None, bytes(source)
+    return None, source.read()
+
+
+def page_count(source):
+    """Aantal pagina's van een PDF"""
+    from PyPDF2 import PdfReader
+
+    path, data = load_source(source)
+    return len(PdfReader(path or BytesIO(data)).pages)
+
+
+def page_filename(filename_base, page_number, total_pages, output_format):
+    """Bestandsnaam van een geconverteerde pagina (pagina nummers vanaf 1)"""
+    if total_pages == 1:
+        return f"{filename_base}.{output_format.lower()}"
+    return f"{filename_base}_pagina_{page_number:03d}.{output_format.lower()}"
+
+
+def output_formats():
+    """Output formaten voor de menu's; WEBP en AVIF alleen als Pillow ze kan schrijven
+
+    Alleen zoeken, niet importeren: dit wordt bij het opstarten gebruikt.
+    """
+    formats = ["PNG", "JPG", "JPEG", "TIFF"]
+    if importlib.util.find_spec("PIL._webp") is not None:
+        formats.append("WEBP")
+    if importlib.util.find_spec("PIL._avif") is not None or importlib.util.find_spec("pillow_avif") is not None:
+        formats.append("AVIF")
+    return formats + ["BMP"]
+
+
+def avif_supported():
+    """Kan Pillow AVIF schrijven? Laadt zo nodig de pillow-avif-plugin"""
+    from PIL import Image
+
+    Image.init()
+    if "AVIF" not in Image.SAVE and importlib.util.find_spec("pillow_avif") is not None:
+        # Importeren registreert AVIF bij Pillow
+        import pillow_avif
+    return "AVIF" in Image.SAVE
+
+
+# Extra opties per compressie instelling ("none" = standaard van Pillow).
+# Bij WEBP (method 0-6) en AVIF (speed 10-0) is dit de moeite die de encoder doet.
+COMPRESSION_OPTIONS = {
+    "none": {},
+    "fast": {"PNG": {"compress_level": 1}, "TIFF": {"compression": "packbits"},
+             "WEBP": {"method": 0}, "AVIF": {"speed": 10}},
+    "best": {"PNG": {"compress_level": 9, "optimize": True}, "TIFF": {"compression": "tiff_adobe_deflate"},
+             "WEBP": {"method": 6}, "AVIF": {"speed": 2}},
+    # PNG met kleurenpalet (zie palette_page); de andere formaten zoals "best"
+    "palette": {"PNG": {"compress_level": 9}, "TIFF": {"compression": "tiff_adobe_deflate"},
+                "WEBP": {"method": 6}, "AVIF": {"speed": 2}},
+}
+
+# Kwaliteit 100 betekent bij WEBP verliesvrij
+LOSSLESS_QUALITY = 100
+
+# Maximale palet grootte bij compressie "palette"
+PALETTE_COLORS = 256
+
+
+def palette_page(page, max_colors=PALETTE_COLORS):
+    """Pagina met kleurenpalet (mode P)
+
+    Met hoogstens max_colors verschillende kleuren is het resultaat
+    verliesvrij; anders wordt de pagina gekwantiseerd (snelle octree,
+    zonder dithering zodat tekst en lijnen strak blijven).
+    """
+    import numpy as np
+    from PIL import Image
+
+    if page.mode not in ('RGB', 'RGBX', 'L'):
+        return page
+    colors = page.getcolors(max_colors)
+    if colors is None:
+        rgb = page.convert('RGB') if page.mode == 'RGBX' else page
+        return rgb.quantize(max_colors, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+
+    # Verliesvrij: elke kleur krijgt een eigen index (Pillow's eigen
+    # palet conversie zoekt via een grove kleurkubus en is niet exact)
+    pixels = np.asarray(page)
+    if page.mode == 'L':
+        values = np.array(sorted(color for _, color in colors), dtype=np.uint8)
+        lookup = np.zeros(256, dtype=np.uint8)
+        lookup[values] = np.arange(len(values), dtype=np.uint8)
+        indices = lookup[pixels]
+        palette = np.repeat(values, 3)
+    else:
+        keys = ((pixels[..., 0].astype(np.uint32) << 16) | (pixels[..., 1].astype(np.uint32) << 8)
+                | pixels[..., 2])
+        values = np.array(sorted((r << 16) | (g << 8) | b for _, (r, g, b, *_) in colors), dtype=np.uint32)
+        indices = np.searchsorted(values, keys).astype(np.uint8)
+        palette = np.stack([values >> 16, (values >> 8) & 255, values & 255], axis=1).astype(np.uint8).ravel()
+    result = Image.fromarray(indices, 'P')
+    result.putpalette(palette.tobytes())
+    return result
+
+
+def save_page(page, output, output_format, quality=95, compression="none"):
+    """Sla een gerenderde pagina op in het gekozen formaat (pad of file-like)"""
+    output_format = output_format.lower()
+    if output_format in ['jpg', 'jpeg']:
+        # Converteer naar RGB voor JPG (zwart-wit naar grijs)
+        if page.mode == 'RGBA':
+            page = page.convert('RGB')
+        elif page.mode == '1':
+            page = page.convert('L')
+        page.save(output, 'JPEG', quality=quality)
+    elif output_format in ['webp', 'avif']:
+        if output_format == 'avif' and not avif_supported():
+            raise ValueError("AVIF wordt niet ondersteund (installeer pillow-avif-plugin)")
+        if page.mode not in ('RGB', 'RGBA'):
+            page = page.convert('RGB')
+        options = dict(COMPRESSION_OPTIONS.get(compression, {}).get(output_format.upper(), {}))
+        if output_format == 'webp' and quality >= LOSSLESS_QUALITY:
+            options["lossless"] = True
+        else:
+            options["quality"] = quality
+        page.save(output, output_format.upper(), **options)
+    else:
+        if compression == "palette" and output_format == 'png':
+            page = palette_page(page)
+        # RGBX (pagina's uit gedeeld geheugen) kan alleen JPEG direct schrijven
+        if page.mode == 'RGBX':
+            page = page.convert('RGB')
+        options = COMPRESSION_OPTIONS.get(compression, {}).get(output_format.upper(), {})
+        if page.mode == '1' and output_format in ['tif', 'tiff']:
+            # Zwart-wit TIFF: CCITT Group 4 is veel kleiner en sneller dan deflate
+            options = {"compression": "group4"}
+        page.save(output, output_format.upper(), **options)
+
+
+def encode_page(page, output_format, quality=95, compression="none"):
+    """Codeer een gerenderde pagina naar bytes"""
+    buffer = BytesIO()
+    save_page(page, buffer, output_format, quality, compression)
+    return buffer.getvalue()
+
+
+def finish_pdf(output_path, linearize=False, compact=False):
+    """Optioneel: gelineariseerde (fast web view) of compacte output"""
+    from pdf_output import compact_pdf, linearize_pdf
+
+    if linearize:
+        linearize_pdf(output_path)
+    elif compact:
+        compact_pdf(output_path)
+
+
+def pdftoppm_args(path, dpi, first_page, last_page, gray=False):
+    """Command line voor pdftoppm; zonder pad leest pdftoppm de PDF van stdin"""
+    return [
+        poppler_command("pdftoppm"),
+        "-r", str(int(dpi)),
+        "-f", str(first_page),
+        "-l", str(last_page),
+    ] + (["-gray"] if gray else []) + [path or "-"]
+
+
+def render_images(source, dpi=300, first_page=None, last_page=None, chunk_size=RENDER_CHUNK, backend="auto",
+                  gray=False, total_pages=None):
+    """Render pagina's als PIL afbeeldingen: iterator van (pagina nummer, afbeelding)
+
+    backend is "auto" (gemeten per documentklasse), "pdftoppm", "pdftocairo",
+    "pymupdf" of een backend object; zie render_backends.py. Met gray
+    rendert de backend direct in grijstinten (mode L). Het document wordt
+    alleen geparsed voor het aantal pagina's als total_pages en last_page
+    allebei ontbreken.
+    """
+    from render_backends import get_backend
+
+    path, data = load_source(source)
+    if total_pages is None and last_page is None:
+        total_pages = page_count(path or data)
+    first_page = first_page or 1
+    last_page = min(last_page or total_pages, total_pages or last_page)
+
+    renderer = get_backend(backend, path, data, dpi)
+    return renderer.render(path, data, dpi, first_page, last_page, chunk_size, gray)
+
+
+def render_pages(source, dpi=300, output_format="PNG", quality=95, first_page=None, last_page=None, backend="auto"):
+    """Render en codeer pagina's: iterator van (pagina nummer, bytes)"""
+    for page_number, page in render_images(source, dpi, first_page, last_page, backend=backend):
+        yield page_number, encode_page(page, output_format, quality)
+
+
+def convert_pdf_to_images(source, output_folder, dpi=300, output_format="PNG", quality=95,
+                          progress_callback=None, filename_base=None, container="files", sizes=None):
+    """Converteer een PDF naar afbeeldingen, geeft de lijst met output paden terug
+
+    progress_callback(klaar, totaal) wordt na elke pagina aangeroepen.
+    container "files" geeft één bestand per pagina; "tiff", "zip", "cbz"
+    of "tar" geeft één bestand voor het hele document (zie output_sinks.py),
+    "dzi" een Deep Zoom tegel piramide per pagina (manifest en tegels, zie
+    deep_zoom.py).
+    sizes ("medium:150:JPG:85, thumb:50" of een lijst) voegt kleinere
+    formaten in submappen toe, uit dezelfde rendering (zie image_pyramid.py).
+    """
+    from output_sinks import open_sink
+
+    if isinstance(sizes, str):
+        from image_pyramid import parse_sizes
+
+        sizes = parse_sizes(sizes, output_format, quality)
+
+    path, data = load_source(source)
+    source = path or data
+    total_pages = page_count(source)
+    filename_base = filename_base or (Path(path).stem if path else "document")
+    sink = open_sink(container, output_folder, filename_base, total_pages, output_format, quality,
+                     sizes=sizes, dpi=dpi)
+
+    try:
+        for done, (page_number, page) in enumerate(render_images(source, dpi), 1):
+            sink.add(page_number, page)
+            if progress_callback:
+                progress_callback(done, total_pages)
+    finally:
+        output_paths = sink.close()
+
+    return output_paths + sink.derived if sizes else output_paths
+
+
+def _open_image(source):
+    """Open een afbeelding uit een pad, bytes, file-like of PIL afbeelding"""
+    from PIL import Image
+
+    if isinstance(source, Image.Image):
+        return source
+    path, data = load_source(source)
+    return Image.open(path or BytesIO(data))
+
+
+def images_to_pdf(images, output, linearize=False, compact=False):
+    """Maak één PDF van afbeeldingen, geeft het aantal pagina's terug
+
+    output is een pad of een file-like object. Lineariseren en compacte
+    output herschrijven het bestand en werken daarom alleen met een pad.
+    """
+    if (linearize or compact) and not isinstance(output, (str, os.PathLike)):
+        raise ValueError("Gelineariseerde of compacte output kan alleen naar een bestandspad")
+
+    converted = []
+    for source in images:
+        img = _open_image(source)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        converted.append(img)
+
+    # Sla op als PDF
+    if converted:
+        converted[0].save(output, "PDF", resolution=300.0, save_all=True, append_images=converted[1:])
+        if isinstance(output, (str, os.PathLike)):
+            finish_pdf(os.fspath(output), linearize, compact)
+    return len(converted)
+
+
+def merge(inputs, output, linearize=False, compact=False, skip_blank=False, blank_tolerance=None):
+    """Voeg PDF's (paden, bytes of file-like) samen, geeft het aantal pagina's terug
+
+    output is een pad of een file-like object; zie images_to_pdf voor
+    lineariseren en compacte output. Met skip_blank worden lege pagina's
+    (zie blank_pages.py) weggelaten.
+    """
+    if (linearize or compact) and not isinstance(output, (str, os.PathLike)):
+        raise ValueError("Gelineariseerde of compacte output kan alleen naar een bestandspad")
+
+    from PyPDF2 import PdfMerger
+
+    merger = PdfMerger()
+    for source in inputs:
+        path, data = load_source(source)
+        if skip_blank:
+            from blank_pages import DEFAULT_TOLERANCE, find_blank_pages
+            from PyPDF2 import PdfReader
+
+            blank = find_blank_pages(path or data, blank_tolerance or DEFAULT_TOLERANCE)
+            reader = PdfReader(path or BytesIO(data))
+            # Per aaneengesloten reeks: PdfMerger leest een lijst van 2 of 3 pagina's als (start, stop[, step])
+            start = None
+            for index in range(len(reader.pages) + 1):
+                keep = index < len(reader.pages) and index + 1 not in blank
+                if keep and start is None:
+                    start = index
+                elif not keep and start is not None:
+                    merger.append(reader, pages=(start, index))
+                    start = None
+        else:
+            merger.append(path or BytesIO(data))
+    pages = len(merger.pages)
+
+    merger.write(output)
+    merger.close()
+
+    if isinstance(output, (str, os.PathLike)):
+        finish_pdf(os.fspath(output), linearize, compact)
+    return pages
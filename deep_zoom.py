@@ -0,0 +1,119 @@
+"""
+MakkelijkPdf - Deep Zoom tegels voor web viewers
+
+Een grote tekening op hoge DPI als één PNG is voor een browser te zwaar.
+Hier wordt elke pagina een Deep Zoom piramide (zoals OpenSeadragon die
+leest): een .dzi manifest met daarnaast een map {naam}_files met per
+niveau tegels van bv. 256x256 pixels. De browser laadt alleen de tegels
+die in beeld zijn.
+
+Niveaus worden gemaakt door de pagina steeds te halveren (Image.reduce);
+alleen het huidige niveau staat in het geheugen. Tegels worden direct
+uitgesneden en in een pool van threads gecodeerd, met een maximum aan
+tegels dat tegelijk op coderen wacht.
+"""
+
+import math
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import core
+
+# Standaard tegelgrootte en overlap (pixels die tegels met hun buren delen)
+TILE_SIZE = 256
+TILE_OVERLAP = 1
+
+# Tegel formaten; andere output formaten worden PNG tegels
+TILE_FORMATS = ["png", "jpg", "jpeg", "webp"]
+
+# Maximaal aantal threads dat tegels codeert
+ENCODER_THREADS = min(4, os.cpu_count() or 1)
+
+# Zoveel tegels mogen tegelijk op coderen wachten (begrensd geheugen)
+MAX_PENDING = 64
+
+MANIFEST = """<?xml version="1.0" encoding="UTF-8"?>
+<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" TileSize="{tile_size}" Overlap="{overlap}" Format="{format}">
+  <Size Width="{width}" Height="{height}"/>
+</Image>
+"""
+
+
+def level_count(width, height):
+    """Aantal niveaus: van 1x1 pixel tot de volle grootte"""
+    return int(math.ceil(math.log2(max(width, height, 1)))) + 1
+
+
+def tile_boxes(width, height, tile_size=TILE_SIZE, overlap=TILE_OVERLAP):
+    """(kolom, rij, box) van elke tegel op een niveau van width x height"""
+    for column in range(int(math.ceil(width / tile_size))):
+        for row in range(int(math.ceil(height / tile_size))):
+            left = column * tile_size - (overlap if column else 0)
+            top = row * tile_size - (overlap if row else 0)
+            right = min(width, (column + 1) * tile_size + overlap)
+            bottom = min(height, (row + 1) * tile_size + overlap)
+            yield column, row, (left, top, right, bottom)
+
+
+class DeepZoomSink:
+    """Elke pagina als Deep Zoom piramide ({naam}_pagina_001.dzi + _files map)"""
+
+    def __init__(self, output_folder, filename_base, total_pages, output_format, quality=95,
+                 compression="none", tile_size=TILE_SIZE, threads=ENCODER_THREADS):
+        self.output_folder = output_folder
+        self.filename_base = filename_base
+        self.total_pages = total_pages
+        self.tile_format = output_format.lower() if output_format.lower() in TILE_FORMATS else "png"
+        self.quality = quality
+        self.compression = compression
+        self.tile_size = tile_size
+        self.executor = ThreadPoolExecutor(threads)
+        self.pending = deque()
+        self.outputs = []
+
+    def add(self, page_number, page):
+        """Snijd alle niveaus van een pagina in tegels en schrijf het manifest"""
+        name = os.path.splitext(core.page_filename(self.filename_base, page_number, self.total_pages, "dzi"))[0]
+        tiles_folder = os.path.join(self.output_folder, f"{name}_files")
+        extension = "jpg" if self.tile_format == "jpeg" else self.tile_format
+
+        if page.mode not in ["L", "RGB", "RGBA", "RGBX"]:
+            # Verkleinen middelt pixels; zwart-wit en palet worden grijs of kleur
+            page = page.convert("L" if page.mode == "1" else "RGB")
+        width, height = page.size
+        level = page
+        tiles = []
+        for number in reversed(range(level_count(width, height))):
+            folder = os.path.join(tiles_folder, str(number))
+            os.makedirs(folder, exist_ok=True)
+            for column, row, box in tile_boxes(level.width, level.height, self.tile_size):
+                # crop kopieert: de pagina mag daarna vrijgegeven worden (gedeeld geheugen)
+                tile_path = os.path.join(folder, f"{column}_{row}.{extension}")
+                self._submit(level.crop(box), tile_path)
+                tiles.append(tile_path)
+            if number:
+                # Het volgende niveau vervangt dit niveau; afronden naar boven zoals Deep Zoom
+                level = level.reduce(2)
+
+        manifest_path = os.path.join(self.output_folder, f"{name}.dzi")
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            f.write(MANIFEST.format(tile_size=self.tile_size, overlap=TILE_OVERLAP, format=extension,
+                                    width=width, height=height))
+        # Een viewer heeft het manifest én de tegels nodig
+        self.outputs.append(manifest_path)
+        self.outputs.extend(tiles)
+
+    def _submit(self, tile, path):
+        while len(self.pending) >= MAX_PENDING:
+            self.pending.popleft().result()
+        self.pending.append(self.executor.submit(core.save_page, tile, path, self.tile_format,
+                                                 self.quality, self.compression))
+
+    def close(self):
+        """Wacht op alle tegels; geeft de manifesten en tegels terug"""
+        try:
+            while self.pending:
+                self.pending.popleft().result()
+        finally:
+            self.executor.shutdown()
+        return self.outputs
@@ -0,0 +1,132 @@
+"""
+MakkelijkPdf - Meerdere formaten uit één rendering
+
+Voor een volledige afbeelding, een middelgrote versie en een thumbnail
+van elke pagina hoeft een PDF niet drie keer gerenderd te worden. Elke
+pagina wordt één keer op de hoofd DPI gerenderd; de kleinere formaten
+worden daar stap voor stap uit afgeleid (Image.reduce en een box filter,
+elk formaat uit het vorige) en in een eigen submap opgeslagen, met een
+eigen formaat en kwaliteit. Het coderen gebeurt in een pool van threads
+(Pillow geeft de GIL vrij tijdens het coderen).
+
+Formaten worden opgegeven als "naam:dpi[:formaat[:kwaliteit]]", met
+komma's gescheiden, bijvoorbeeld "medium:150:JPG:85, thumb:50:WEBP:75".
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from output_sinks import FileSink
+
+# Maximaal aantal threads dat afgeleide formaten codeert
+ENCODER_THREADS = min(4, os.cpu_count() or 1)
+
+# Zoveel pagina's mogen tegelijk op coderen wachten (begrensd geheugen)
+MAX_PENDING = 8
+
+
+def parse_sizes(text, output_format="PNG", quality=95):
+    """Lees "naam:dpi[:formaat[:kwaliteit]], ..." in; formaat en kwaliteit vallen terug op de hoofd output"""
+    sizes = []
+    for part in (text or "").split(","):
+        fields = [field.strip() for field in part.split(":")]
+        if not fields[0]:
+            continue
+        if len(fields) < 2 or len(fields) > 4:
+            raise ValueError(f"Ongeldig formaat: {part.strip()} (verwacht naam:dpi[:formaat[:kwaliteit]])")
+        name = fields[0]
+        if os.path.basename(name) != name or name in (".", ".."):
+            raise ValueError(f"Ongeldige naam voor een formaat: {name}")
+        sizes.append({
+            "name": name,
+            "dpi": int(fields[1]),
+            "format": (fields[2] if len(fields) > 2 and fields[2] else output_format).lower(),
+            "quality": int(fields[3]) if len(fields) > 3 and fields[3] else quality,
+        })
+    return sizes
+
+
+def plan_sizes(sizes, dpi):
+    """Van groot naar klein; formaten boven de render DPI worden op de render DPI gemaakt"""
+    planned = [dict(size, dpi=min(size["dpi"], dpi)) for size in sizes if size["dpi"] > 0]
+    return sorted(planned, key=lambda size: size["dpi"], reverse=True)
+
+
+def downscale(image, scale):
+    """Verklein met factor scale (0-1): eerst Image.reduce met het gehele deel, de rest met een box filter"""
+    from PIL import Image
+
+    if image.mode in ["1", "P"]:
+        # Verkleinen middelt pixels; zwart-wit en palet worden grijs of kleur
+        image = image.convert("L" if image.mode == "1" else "RGB")
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    factor = int(1 / scale) if scale > 0 else 1
+    if factor >= 2:
+        image = image.reduce(factor)
+    if image.size != size:
+        image = image.resize(size, Image.Resampling.BOX)
+    return image
+
+
+def derive(page, dpi, sizes):
+    """Geef (formaat, afbeelding) voor elk formaat, elk afgeleid uit het vorige (grotere)"""
+    current, current_dpi = page, dpi
+    for size in plan_sizes(sizes, dpi):
+        if size["dpi"] != current_dpi:
+            current = downscale(current, size["dpi"] / current_dpi)
+            current_dpi = size["dpi"]
+        elif current is page:
+            # Even groot als de render; kopiëren omdat de pagina in gedeeld geheugen kan staan
+            current = page.copy()
+        yield size, current
+
+
+class PyramidSink:
+    """Schrijft elke pagina naar de hoofd output en de afgeleide formaten naar hun submappen"""
+
+    def __init__(self, sink, sizes, dpi, output_folder, filename_base, total_pages,
+                 compression="none", threads=ENCODER_THREADS):
+        self.sink = sink
+        self.dpi = dpi
+        self.sizes = plan_sizes(sizes, dpi)
+        self.derived = []
+        self.sinks = {}
+        for size in self.sizes:
+            folder = os.path.join(output_folder, size["name"])
+            os.makedirs(folder, exist_ok=True)
+            self.sinks[size["name"]] = FileSink(folder, filename_base, total_pages, size["format"],
+                                                size["quality"], compression)
+        # Zonder threads (bv. in een worker proces) wordt er direct gecodeerd
+        self.executor = ThreadPoolExecutor(threads) if threads else None
+        self.pending = deque()
+
+    def path(self, page_number):
+        """Pad van een pagina in de hoofd output; None bij een TIFF, archief of tegels (geen bestand per pagina)"""
+        if isinstance(self.sink, FileSink):
+            return self.sink.path(page_number)
+        return None
+
+    def add(self, page_number, page):
+        """Schrijf de pagina en zijn afgeleide formaten; geeft het pad van de hoofd output terug"""
+        output_path = self.sink.add(page_number, page)
+        # Afleiden gebeurt hier: de pagina is alleen geldig tot de volgende binnenkomt
+        for size, image in derive(page, self.dpi, self.sizes):
+            file_sink = self.sinks[size["name"]]
+            if self.executor is None:
+                self.derived.append(file_sink.add(page_number, image))
+                continue
+            while len(self.pending) >= MAX_PENDING * len(self.sizes):
+                self.derived.append(self.pending.popleft().result())
+            self.pending.append(self.executor.submit(file_sink.add, page_number, image))
+        return output_path
+
+    def close(self):
+        """Wacht op het coderen; geeft de bestanden van de hoofd output terug (afgeleide in derived)"""
+        try:
+            while self.pending:
+                self.derived.append(self.pending.popleft().result())
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+            outputs = self.sink.close()
+        return outputs
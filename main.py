@@ -3,37 +3,74 @@
 MakkelijkPdf - Eenvoudige PDF naar afbeelding converter
 """
 
+import time
+
+# Start van de opstarttijd meting (zie --startup-timing)
+STARTUP_TIME = time.perf_counter()
+
 import os
 import sys
 from pathlib import Path
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from pdf2image import convert_from_path
 from PIL import Image
 import threading
-import time
 from datetime import datetime
 from version import get_version_string, get_version_info, check_for_updates
 from settings import SettingsManager
 from settings_window import SettingsWindow
 from languages import get_text, get_language_name
-import PyPDF2
+# pdf2image, PyPDF2 en de PDF modules worden pas bij gebruik geïmporteerd
+from core import output_formats
+from render_cache import RenderCache
+from renderer_pool import get_pool
+from thumbnail_grid import ThumbnailGrid
+from ui_registry import WidgetRegistry
 
-# Voeg poppler pad toe aan PATH (cross-platform)
+# Poppler pad (voegt poppler ook toe aan PATH)
 import platform
-if platform.system() == "Windows":
-    poppler_path = r"C:\poppler\poppler-23.08.0\Library\bin"
-elif platform.system() == "Darwin":  # macOS
-    poppler_path = "/opt/homebrew/bin"  # Homebrew ARM
-    if not os.path.exists(poppler_path):
-        poppler_path = "/usr/local/bin"  # Homebrew Intel
-elif platform.system() == "Linux":
-    poppler_path = "/usr/bin"  # System poppler
-else:
-    poppler_path = ""
+import poppler
+
+IMPORT_TIME = time.perf_counter()
 
-if poppler_path and poppler_path not in os.environ["PATH"]:
-    os.environ["PATH"] = poppler_path + os.pathsep + os.environ["PATH"]
+# Knop teksten per conversie mode en taal
+INPUT_BUTTON_TEXTS = {
+    "pdf_to_image": {"nl": "📄 Klik hier om PDF te selecteren\nof sleep PDF hierheen",
+                     "en": "📄 Click here to select PDF\nor drag PDF here"},
+    "image_to_pdf": {"nl": "🖼️ Klik hier om foto's te selecteren\nSelecteer meerdere afbeeldingen",
+                     "en": "🖼️ Click here to select photos\nSelect multiple images"},
+    "pdf_merge": {"nl": "📚 Klik hier om PDF's te selecteren\nSelecteer meerdere PDF bestanden",
+                  "en": "📚 Click here to select PDFs\nSelect multiple PDF files"},
+    "pdf_append": {"nl": "➕ Klik hier om PDF's te selecteren\nDeze pagina's worden toegevoegd",
+                   "en": "➕ Click here to select PDFs\nThese pages will be appended"},
+    "pdf_split": {"nl": "✂️ Klik hier om PDF te selecteren\nDeze PDF wordt gesplitst",
+                  "en": "✂️ Click here to select PDF\nThis PDF will be split"},
+    "pdf_optimize": {"nl": "🗜️ Klik hier om PDF te selecteren\nAfbeeldingen worden verkleind",
+                     "en": "🗜️ Click here to select PDF\nImages will be made smaller"},
+}
+
+OUTPUT_FOLDER_TEXTS = {"nl": "📁 Klik hier om output map te selecteren\nBestanden worden hier opgeslagen",
+                       "en": "📁 Click here to select output folder\nFiles will be saved here"}
+OUTPUT_PDF_TEXTS = {"nl": "📄 Klik hier om output PDF te selecteren\nWaar moet het bestand worden opgeslagen?",
+                    "en": "📄 Click here to select output PDF\nWhere should the file be saved?"}
+OUTPUT_BUTTON_TEXTS = {
+    "pdf_to_image": OUTPUT_FOLDER_TEXTS,
+    "image_to_pdf": OUTPUT_PDF_TEXTS,
+    "pdf_merge": OUTPUT_PDF_TEXTS,
+    "pdf_append": {"nl": "📄 Klik hier om bestaande PDF te selecteren\nPagina's worden achteraan toegevoegd",
+                   "en": "📄 Click here to select existing PDF\nPages will be added at the end"},
+    "pdf_split": OUTPUT_FOLDER_TEXTS,
+    "pdf_optimize": OUTPUT_PDF_TEXTS,
+}
+
+CONVERT_BUTTON_TEXTS = {
+    "pdf_to_image": {"nl": "🚀 START CONVERSIE\nConverteer PDF naar foto's!", "en": "🚀 START CONVERSION\nConvert PDF to photos!"},
+    "image_to_pdf": {"nl": "🚀 START CONVERSIE\nMaak PDF van foto's!", "en": "🚀 START CONVERSION\nMake PDF from photos!"},
+    "pdf_merge": {"nl": "🚀 START CONVERSIE\nVoeg PDF's samen!", "en": "🚀 START CONVERSION\nMerge PDFs together!"},
+    "pdf_append": {"nl": "🚀 START CONVERSIE\nVul PDF aan!", "en": "🚀 START CONVERSION\nAppend to PDF!"},
+    "pdf_split": {"nl": "🚀 START CONVERSIE\nSplits PDF!", "en": "🚀 START CONVERSION\nSplit PDF!"},
+    "pdf_optimize": {"nl": "🚀 START CONVERSIE\nOptimaliseer PDF!", "en": "🚀 START CONVERSION\nOptimise PDF!"},
+}
 
 class MakkelijkPdfApp:
     def __init__(self):
@@ -84,6 +121,12 @@ class MakkelijkPdfApp:
         # Instellingen venster
         self.settings_window = None
         
+        # Render backend (auto = per documentklasse gemeten)
+        get_pool(backend=self.settings.get("advanced", "render_backend", "auto"))
+        
+        # Widgets waarvan tekst of uiterlijk van taal/thema afhangt
+        self.ui = WidgetRegistry(self.current_language, theme)
+        
         self.setup_ui()
         
     def setup_menu(self):
@@ -224,7 +267,7 @@ class MakkelijkPdfApp:
         # Initialiseer conversie variabelen
         self.dpi_var = None
         self.format_var = None
-        self.conversion_mode = "pdf_to_image"  # pdf_to_image, image_to_pdf, pdf_merge
+        self.conversion_mode = "pdf_to_image"  # pdf_to_image, image_to_pdf, pdf_merge, pdf_append, pdf_split, pdf_optimize
         
         # Configureer venster resize callback
         self.root.bind('<Configure>', self.on_window_resize)
@@ -279,9 +322,54 @@ class MakkelijkPdfApp:
         )
         self.status_label.pack(expand=True)
         
+        # Teksten per taal en thema registreren
+        self.register_widgets()
+        
         # Set default conversion mode after all UI is created
         # self.set_conversion_mode("pdf_to_image")  # Disabled to prevent crashes
     
+    def register_widgets(self):
+        """Registreer alle vertaalbare en thema-afhankelijke widgets (één keer)"""
+        ui = self.ui
+        
+        # Header en menu
+        ui.translate(self.subtitle_label, {"nl": "Converteer PDF bestanden naar afbeeldingen", "en": "Convert PDF files to images"})
+        ui.translate(self.file_button, {"nl": "📁 Bestand", "en": "📁 File"})
+        ui.translate(self.settings_button, {"nl": "⚙️ Instellingen", "en": "⚙️ Settings"})
+        ui.translate(self.language_button, {"nl": "🇬🇧", "en": "🇳🇱"})
+        ui.theme_value(self.theme_button, {"light": "🌙", "dark": "☀️", "system": "🌙"})
+        
+        # Conversie mode knoppen
+        ui.translate(self.mode_label, {"nl": "🔄 Conversie Mode", "en": "🔄 Conversion Mode"})
+        ui.translate(self.pdf_to_image_btn, {"nl": "📄 PDF → Afbeelding\nConverteer PDF naar foto's", "en": "📄 PDF → Image\nConvert PDF to photos"})
+        ui.translate(self.image_to_pdf_btn, {"nl": "🖼️ Afbeelding → PDF\nMaak PDF van foto's", "en": "🖼️ Image → PDF\nMake PDF from photos"})
+        ui.translate(self.pdf_merge_btn, {"nl": "📚 PDF Samenvoegen\nVoeg PDF's samen", "en": "📚 PDF Merge\nMerge PDFs together"})
+        ui.translate(self.pdf_append_btn, {"nl": "➕ PDF Aanvullen\nVoeg pagina's toe aan PDF", "en": "➕ PDF Append\nAdd pages to a PDF"})
+        ui.translate(self.pdf_split_btn, {"nl": "✂️ PDF Splitsen\nSplits PDF in delen", "en": "✂️ PDF Split\nSplit PDF into parts"})
+        ui.translate(self.pdf_optimize_btn, {"nl": "🗜️ PDF Optimaliseren\nMaak afbeeldingen kleiner", "en": "🗜️ PDF Optimise\nMake images smaller"})
+        
+        # Sectie titels en opties
+        ui.translate(self.pdf_label, {"nl": "📄 PDF Bestand", "en": "📄 PDF File"})
+        ui.translate(self.output_label_title, {"nl": "📁 Output Map", "en": "📁 Output Folder"})
+        ui.translate(self.options_label, {"nl": "⚙️ Conversie Opties", "en": "⚙️ Conversion Options"})
+        ui.translate(self.dpi_label, {"nl": "DPI (Kwaliteit):", "en": "DPI (Quality):"})
+        ui.translate(self.format_label, {"nl": "Output Formaat:", "en": "Output Format:"})
+        ui.translate(self.stats_title, {"nl": "📊 Statistieken", "en": "📊 Statistics"})
+        stats_names = {
+            "pages": {"nl": "Pagina's:", "en": "Pages:"},
+            "time": {"nl": "Tijd:", "en": "Time:"},
+            "size": {"nl": "Bestandsgrootte:", "en": "File Size:"},
+            "files": {"nl": "Bestanden:", "en": "Files:"},
+            "cache": {"nl": "Cache:", "en": "Cache:"}
+        }
+        for key, label in self.stats_name_labels.items():
+            ui.translate(label, stats_names[key])
+        
+        # Knoppen die ook van de conversie mode afhangen
+        ui.translate(self.input_button, lambda language: INPUT_BUTTON_TEXTS[self.conversion_mode][language], group="mode")
+        ui.translate(self.output_button, lambda language: OUTPUT_BUTTON_TEXTS[self.conversion_mode][language], group="mode")
+        ui.translate(self.convert_button, lambda language: CONVERT_BUTTON_TEXTS[self.conversion_mode][language], group="mode")
+    
     def setup_conversion_mode(self, parent):
         """Conversie mode selectie"""
         mode_card = ctk.CTkFrame(parent, corner_radius=15, fg_color=("#ffffff", "#1a1f2e"))
@@ -352,11 +440,56 @@ class MakkelijkPdfApp:
         )
         self.pdf_merge_btn.grid(row=0, column=2, padx=8, pady=10, sticky="ew")
         
+        # PDF Aanvullen knop (incremental update van een bestaande PDF)
+        self.pdf_append_btn = ctk.CTkButton(
+            button_frame,
+            text="➕ PDF Aanvullen\nVoeg pagina's toe aan PDF",
+            command=lambda: self.set_conversion_mode("pdf_append"),
+            height=60,
+            corner_radius=12,
+            font=ctk.CTkFont(size=13, weight="bold"),
+            fg_color=("#ecf0f1", "#2a3441"),
+            hover_color=("#138d75", "#117a65"),
+            text_color=("#2c3e50", "#f0f0f0")
+        )
+        self.pdf_append_btn.grid(row=1, column=0, padx=8, pady=(0, 10), sticky="ew")
+        
+        # PDF Splitsen knop
+        self.pdf_split_btn = ctk.CTkButton(
+            button_frame,
+            text="✂️ PDF Splitsen\nSplits PDF in delen",
+            command=lambda: self.set_conversion_mode("pdf_split"),
+            height=60,
+            corner_radius=12,
+            font=ctk.CTkFont(size=13, weight="bold"),
+            fg_color=("#ecf0f1", "#2a3441"),
+            hover_color=("#ca6f1e", "#af601a"),
+            text_color=("#2c3e50", "#f0f0f0")
+        )
+        self.pdf_split_btn.grid(row=1, column=1, padx=8, pady=(0, 10), sticky="ew")
+        
+        # PDF Optimaliseren knop
+        self.pdf_optimize_btn = ctk.CTkButton(
+            button_frame,
+            text="🗜️ PDF Optimaliseren\nMaak afbeeldingen kleiner",
+            command=lambda: self.set_conversion_mode("pdf_optimize"),
+            height=60,
+            corner_radius=12,
+            font=ctk.CTkFont(size=13, weight="bold"),
+            fg_color=("#ecf0f1", "#2a3441"),
+            hover_color=("#229954", "#1e8449"),
+            text_color=("#2c3e50", "#f0f0f0")
+        )
+        self.pdf_optimize_btn.grid(row=1, column=2, padx=8, pady=(0, 10), sticky="ew")
+        
         # Store mode buttons for later reference
         self.mode_buttons = {
             "pdf_to_image": self.pdf_to_image_btn,
             "image_to_pdf": self.image_to_pdf_btn,
-            "pdf_merge": self.pdf_merge_btn
+            "pdf_merge": self.pdf_merge_btn,
+            "pdf_append": self.pdf_append_btn,
+            "pdf_split": self.pdf_split_btn,
+            "pdf_optimize": self.pdf_optimize_btn
         }
         
         # Set default mode (only colors, no button text updates yet)
@@ -371,6 +504,9 @@ class MakkelijkPdfApp:
         self.pdf_to_image_btn.configure(fg_color=("#ecf0f1", "#2a3441"), text_color=("#2c3e50", "#f0f0f0"))
         self.image_to_pdf_btn.configure(fg_color=("#ecf0f1", "#2a3441"), text_color=("#2c3e50", "#f0f0f0"))
         self.pdf_merge_btn.configure(fg_color=("#ecf0f1", "#2a3441"), text_color=("#2c3e50", "#f0f0f0"))
+        self.pdf_append_btn.configure(fg_color=("#ecf0f1", "#2a3441"), text_color=("#2c3e50", "#f0f0f0"))
+        self.pdf_split_btn.configure(fg_color=("#ecf0f1", "#2a3441"), text_color=("#2c3e50", "#f0f0f0"))
+        self.pdf_optimize_btn.configure(fg_color=("#ecf0f1", "#2a3441"), text_color=("#2c3e50", "#f0f0f0"))
         
         # Highlight selected mode
         if mode == "pdf_to_image":
@@ -379,53 +515,16 @@ class MakkelijkPdfApp:
             self.image_to_pdf_btn.configure(fg_color=("#9b59b6", "#8e44ad"), text_color=("#ffffff", "#ffffff"))
         elif mode == "pdf_merge":
             self.pdf_merge_btn.configure(fg_color=("#e74c3c", "#c0392b"), text_color=("#ffffff", "#ffffff"))
+        elif mode == "pdf_append":
+            self.pdf_append_btn.configure(fg_color=("#16a085", "#138d75"), text_color=("#ffffff", "#ffffff"))
+        elif mode == "pdf_split":
+            self.pdf_split_btn.configure(fg_color=("#e67e22", "#ca6f1e"), text_color=("#ffffff", "#ffffff"))
+        elif mode == "pdf_optimize":
+            self.pdf_optimize_btn.configure(fg_color=("#27ae60", "#229954"), text_color=("#ffffff", "#ffffff"))
         
-        # Update button texts if they exist - Gebruik huidige taal
-        if hasattr(self, 'input_button'):
-            if mode == "pdf_to_image":
-                if self.current_language == "nl":
-                    self.input_button.configure(text="📄 Klik hier om PDF te selecteren\nof sleep PDF hierheen")
-                else:
-                    self.input_button.configure(text="📄 Click here to select PDF\nor drag PDF here")
-            elif mode == "image_to_pdf":
-                if self.current_language == "nl":
-                    self.input_button.configure(text="🖼️ Klik hier om foto's te selecteren\nSelecteer meerdere afbeeldingen")
-                else:
-                    self.input_button.configure(text="🖼️ Click here to select photos\nSelect multiple images")
-            elif mode == "pdf_merge":
-                if self.current_language == "nl":
-                    self.input_button.configure(text="📚 Klik hier om PDF's te selecteren\nSelecteer meerdere PDF bestanden")
-                else:
-                    self.input_button.configure(text="📚 Click here to select PDFs\nSelect multiple PDF files")
-        
-        if hasattr(self, 'output_button'):
-            if mode == "pdf_to_image":
-                if self.current_language == "nl":
-                    self.output_button.configure(text="📁 Klik hier om output map te selecteren\nBestanden worden hier opgeslagen")
-                else:
-                    self.output_button.configure(text="📁 Click here to select output folder\nFiles will be saved here")
-            elif mode in ["image_to_pdf", "pdf_merge"]:
-                if self.current_language == "nl":
-                    self.output_button.configure(text="📄 Klik hier om output PDF te selecteren\nWaar moet het bestand worden opgeslagen?")
-                else:
-                    self.output_button.configure(text="📄 Click here to select output PDF\nWhere should the file be saved?")
-        
-        if hasattr(self, 'convert_button'):
-            if mode == "pdf_to_image":
-                if self.current_language == "nl":
-                    self.convert_button.configure(text="🚀 START CONVERSIE\nConverteer PDF naar foto's!")
-                else:
-                    self.convert_button.configure(text="🚀 START CONVERSION\nConvert PDF to photos!")
-            elif mode == "image_to_pdf":
-                if self.current_language == "nl":
-                    self.convert_button.configure(text="🚀 START CONVERSIE\nMaak PDF van foto's!")
-                else:
-                    self.convert_button.configure(text="🚀 START CONVERSION\nMake PDF from photos!")
-            elif mode == "pdf_merge":
-                if self.current_language == "nl":
-                    self.convert_button.configure(text="🚀 START CONVERSIE\nVoeg PDF's samen!")
-                else:
-                    self.convert_button.configure(text="🚀 START CONVERSION\nMerge PDFs together!")
+        # Knop teksten die van de mode afhangen
+        if hasattr(self, 'ui'):
+            self.ui.refresh("mode")
         
         # Update preview
         if hasattr(self, 'update_preview'):
@@ -585,7 +684,7 @@ class MakkelijkPdfApp:
         format_menu = ctk.CTkOptionMenu(
             format_frame,
             variable=self.format_var,
-            values=["PNG", "JPG", "JPEG", "TIFF", "BMP"],
+            values=output_formats(),
             width=200,
             height=35,
             corner_radius=8,
@@ -658,6 +757,9 @@ class MakkelijkPdfApp:
             wraplength=300
         )
         self.preview_info.pack(pady=30)
+        
+        # Thumbnails van alle pagina's (alleen zichtbare rijen worden gerenderd)
+        self.thumbnail_grid = ThumbnailGrid(self.preview_container)
     
     def update_preview(self):
         """Update preview met PDF informatie"""
@@ -667,13 +769,7 @@ class MakkelijkPdfApp:
         if self.input_file and os.path.exists(self.input_file):
             try:
                 # Probeer PDF informatie te lezen (alleen eerste pagina voor snelheid)
-                pages = convert_from_path(
-                    self.input_file, 
-                    dpi=50, 
-                    first_page=1, 
-                    last_page=1, 
-                    poppler_path=poppler_path
-                )
+                pages = get_pool().render(self.input_file, dpi=50, first_page=1, last_page=1)
                 
                 if pages and len(pages) > 0:
                     page = pages[0]
@@ -684,8 +780,7 @@ class MakkelijkPdfApp:
                     
                     # Probeer totaal aantal pagina's te krijgen
                     try:
-                        all_pages = convert_from_path(self.input_file, dpi=1, poppler_path=poppler_path)
-                        total_pages = len(all_pages) if all_pages else 1
+                        total_pages = get_pool().page_count(self.input_file)
                     except:
                         total_pages = 1
                     
@@ -701,6 +796,7 @@ Klik 'Start Conversie' om te beginnen."""
 
                     self.preview_info.configure(text=info_text)
                     self.preview_label.configure(text="👁️ Preview")
+                    self.thumbnail_grid.load(self.input_file, total_pages)
                 else:
                     self.preview_info.configure(text="❌ Kon PDF niet lezen\nControleer of het een geldig PDF bestand is")
                     self.preview_label.configure(text="👁️ Preview")
@@ -712,6 +808,7 @@ Klik 'Start Conversie' om te beginnen."""
         else:
             self.preview_info.configure(text="Selecteer een PDF voor preview")
             self.preview_label.configure(text="👁️ Preview")
+            self.thumbnail_grid.clear()
     
     def setup_stats(self, parent):
         """Moderne statistieken sectie"""
@@ -738,11 +835,13 @@ Klik 'Start Conversie' om te beginnen."""
         
         # Individual stat labels
         self.stats_labels = {}
+        self.stats_name_labels = {}
         stats_info = [
             ("pages", "Pages:", "0"),
             ("time", "Time:", "0s"),
             ("size", "File Size:", "0 MB"),
-            ("files", "Files:", "0")
+            ("files", "Files:", "0"),
+            ("cache", "Cache:", "0 hits / 0 misses")
         ]
         
         for key, label_text, default_value in stats_info:
@@ -766,6 +865,7 @@ Klik 'Start Conversie' om te beginnen."""
             value_label.pack(anchor="w", padx=15, pady=(0, 10))
             
             self.stats_labels[key] = value_label
+            self.stats_name_labels[key] = label
     
     def show_file_menu(self):
         """Toon bestand menu"""
@@ -799,12 +899,26 @@ Klik 'Start Conversie' om te beginnen."""
         """Toon instellingen venster"""
         try:
             if self.settings_window is None:
-                self.settings_window = SettingsWindow(self.root, self.settings)
+                self.settings_window = SettingsWindow(self.root, self.settings, on_close_callback=self.apply_settings)
             self.settings_window.show()
         except Exception as e:
             print(f"Fout bij openen instellingen: {e}")
             messagebox.showerror("Fout", f"Kon instellingen niet openen: {e}")
     
+    def apply_settings(self):
+        """Pas een gewijzigd thema, taal of render backend uit het instellingen venster direct toe"""
+        get_pool(backend=self.settings.get("advanced", "render_backend", "auto"))
+        
+        theme = self.settings.get("general", "theme", "system")
+        if theme != self.ui.theme:
+            ctk.set_appearance_mode(theme)
+            self.ui.set_theme(theme)
+        
+        language = self.settings.get("general", "language", "nl")
+        if language != self.current_language:
+            self.current_language = language
+            self.update_ui_language()
+    
     def toggle_theme(self):
         """Wissel tussen licht en donker thema"""
         # Haal huidige thema op uit instellingen (betrouwbaarder)
@@ -813,20 +927,17 @@ Klik 'Start Conversie' om te beginnen."""
         # Bepaal nieuw thema op basis van huidige instelling
         if current_theme == "light":
             new_theme = "dark"
-            new_icon = "☀️"
         elif current_theme == "dark":
             new_theme = "light"
-            new_icon = "🌙"
         else:  # system of onbekend
             new_theme = "dark"
-            new_icon = "☀️"
         
-        # Pas thema toe
+        # Pas thema toe (customtkinter tekent de kleuren zelf opnieuw)
         ctk.set_appearance_mode(new_theme)
         self.settings.set("general", "theme", new_theme)
         
-        # Update knop icoon
-        self.theme_button.configure(text=new_icon)
+        # Overige thema-afhankelijke eigenschappen (o.a. knop icoon)
+        self.ui.set_theme(new_theme)
         
         # Toon bevestiging
         if self.current_language == "nl":
@@ -834,9 +945,6 @@ Klik 'Start Conversie' om te beginnen."""
         else:
             self.status_label.configure(text=f"Theme changed to {new_theme}")
         
-        # Forceer volledige UI update
-        self.update_theme_colors()
-        
         # Toon bericht
         messagebox.showinfo(
             f"{get_text('theme', self.current_language)} Gewijzigd", 
@@ -849,19 +957,14 @@ Klik 'Start Conversie' om te beginnen."""
         # Bepaal nieuwe taal
         if self.current_language == "nl":
             new_language = "en"
-            new_icon = "🇬🇧"
         else:
             new_language = "nl"
-            new_icon = "🇳🇱"
         
         # Sla nieuwe taal op
         self.current_language = new_language
         self.settings.set("general", "language", new_language)
         
-        # Update knop icoon
-        self.language_button.configure(text=new_icon)
-        
-        # Update UI teksten direct
+        # Update UI teksten direct (inclusief knop icoon)
         self.update_ui_language()
         
         # Toon bevestiging
@@ -891,141 +994,8 @@ Klik 'Start Conversie' om te beginnen."""
             version_string = get_version_string()
             self.root.title(f"{get_text('app_title', self.current_language)} v{version_string}")
             
-            # Update titel en subtitle
-            if hasattr(self, 'title_label'):
-                self.title_label.configure(text="MakkelijkPdf")
-            if hasattr(self, 'subtitle_label'):
-                self.subtitle_label.configure(text="Converteer PDF bestanden naar afbeeldingen" if self.current_language == "nl" else "Convert PDF files to images")
-            
-            # Update sectie labels
-            if hasattr(self, 'pdf_label'):
-                if self.current_language == "nl":
-                    self.pdf_label.configure(text="📄 PDF Bestand")
-                else:
-                    self.pdf_label.configure(text="📄 PDF File")
-            if hasattr(self, 'output_label_title'):
-                if self.current_language == "nl":
-                    self.output_label_title.configure(text="📁 Output Map")
-                else:
-                    self.output_label_title.configure(text="📁 Output Folder")
-            if hasattr(self, 'options_label'):
-                if self.current_language == "nl":
-                    self.options_label.configure(text="⚙️ Conversie Opties")
-                else:
-                    self.options_label.configure(text="⚙️ Conversion Options")
-            if hasattr(self, 'dpi_label'):
-                if self.current_language == "nl":
-                    self.dpi_label.configure(text="DPI (Kwaliteit):")
-                else:
-                    self.dpi_label.configure(text="DPI (Quality):")
-            if hasattr(self, 'format_label'):
-                if self.current_language == "nl":
-                    self.format_label.configure(text="Output Formaat:")
-                else:
-                    self.format_label.configure(text="Output Format:")
-            
-            # Update knoppen en labels - Dynamisch op basis van conversie mode
-            if hasattr(self, 'input_button'):
-                if self.current_language == "nl":
-                    if self.conversion_mode == "pdf_to_image":
-                        self.input_button.configure(text="📄 Klik hier om PDF te selecteren\nof sleep PDF hierheen")
-                    elif self.conversion_mode == "image_to_pdf":
-                        self.input_button.configure(text="🖼️ Klik hier om foto's te selecteren\nSelecteer meerdere afbeeldingen")
-                    elif self.conversion_mode == "pdf_merge":
-                        self.input_button.configure(text="📚 Klik hier om PDF's te selecteren\nSelecteer meerdere PDF bestanden")
-                else:
-                    if self.conversion_mode == "pdf_to_image":
-                        self.input_button.configure(text="📄 Click here to select PDF\nor drag PDF here")
-                    elif self.conversion_mode == "image_to_pdf":
-                        self.input_button.configure(text="🖼️ Click here to select photos\nSelect multiple images")
-                    elif self.conversion_mode == "pdf_merge":
-                        self.input_button.configure(text="📚 Click here to select PDFs\nSelect multiple PDF files")
-            
-            if hasattr(self, 'output_button'):
-                if self.current_language == "nl":
-                    if self.conversion_mode == "pdf_to_image":
-                        self.output_button.configure(text="📁 Klik hier om output map te selecteren\nBestanden worden hier opgeslagen")
-                    else:
-                        self.output_button.configure(text="📄 Klik hier om output PDF te selecteren\nWaar moet het bestand worden opgeslagen?")
-                else:
-                    if self.conversion_mode == "pdf_to_image":
-                        self.output_button.configure(text="📁 Click here to select output folder\nFiles will be saved here")
-                    else:
-                        self.output_button.configure(text="📄 Click here to select output PDF\nWhere should the file be saved?")
-            
-            if hasattr(self, 'convert_button'):
-                if self.current_language == "nl":
-                    if self.conversion_mode == "pdf_to_image":
-                        self.convert_button.configure(text="🚀 START CONVERSIE\nConverteer PDF naar foto's!")
-                    elif self.conversion_mode == "image_to_pdf":
-                        self.convert_button.configure(text="🚀 START CONVERSIE\nMaak PDF van foto's!")
-                    elif self.conversion_mode == "pdf_merge":
-                        self.convert_button.configure(text="🚀 START CONVERSIE\nVoeg PDF's samen!")
-                else:
-                    if self.conversion_mode == "pdf_to_image":
-                        self.convert_button.configure(text="🚀 START CONVERSION\nConvert PDF to photos!")
-                    elif self.conversion_mode == "image_to_pdf":
-                        self.convert_button.configure(text="🚀 START CONVERSION\nMake PDF from photos!")
-                    elif self.conversion_mode == "pdf_merge":
-                        self.convert_button.configure(text="🚀 START CONVERSION\nMerge PDFs together!")
-            
-            # Update conversie mode knoppen
-            if hasattr(self, 'pdf_to_image_btn'):
-                if self.current_language == "nl":
-                    self.pdf_to_image_btn.configure(text="📄 PDF → Afbeelding\nConverteer PDF naar foto's")
-                    self.image_to_pdf_btn.configure(text="🖼️ Afbeelding → PDF\nMaak PDF van foto's")
-                    self.pdf_merge_btn.configure(text="📚 PDF Samenvoegen\nVoeg PDF's samen")
-                else:
-                    self.pdf_to_image_btn.configure(text="📄 PDF → Image\nConvert PDF to photos")
-                    self.image_to_pdf_btn.configure(text="🖼️ Image → PDF\nMake PDF from photos")
-                    self.pdf_merge_btn.configure(text="📚 PDF Merge\nMerge PDFs together")
-            
-            # Update andere knoppen
-            if hasattr(self, 'new_conversion_button'):
-                self.new_conversion_button.configure(text=get_text('new_conversion', self.current_language))
-            
-            # Update menu knoppen
-            if hasattr(self, 'file_button'):
-                if self.current_language == "nl":
-                    self.file_button.configure(text="📁 Bestand")
-                else:
-                    self.file_button.configure(text="📁 File")
-            if hasattr(self, 'settings_button'):
-                if self.current_language == "nl":
-                    self.settings_button.configure(text="⚙️ Instellingen")
-                else:
-                    self.settings_button.configure(text="⚙️ Settings")
-            if hasattr(self, 'help_button'):
-                self.help_button.configure(text="❓ Help")
-            
-            # Update preview en stats labels
-            if hasattr(self, 'preview_label'):
-                if self.current_language == "nl":
-                    self.preview_label.configure(text="👁️ Preview")
-                else:
-                    self.preview_label.configure(text="👁️ Preview")
-            if hasattr(self, 'stats_title'):
-                if self.current_language == "nl":
-                    self.stats_title.configure(text="📊 Statistieken")
-                else:
-                    self.stats_title.configure(text="📊 Statistics")
-            
-            # Update statistieken titel en labels
-            if hasattr(self, 'stats_title'):
-                self.stats_title.configure(text="Statistieken" if self.current_language == "nl" else "Statistics")
-            
-            # Update statistieken labels
-            if hasattr(self, 'stats_labels'):
-                stats_translations = {
-                    "pages": "Pagina's:" if self.current_language == "nl" else "Pages:",
-                    "time": "Tijd:" if self.current_language == "nl" else "Time:",
-                    "size": "Bestandsgrootte:" if self.current_language == "nl" else "File Size:",
-                    "files": "Bestanden:" if self.current_language == "nl" else "Files:"
-                }
-                
-                for key, translation in stats_translations.items():
-                    if key in self.stats_labels:
-                        self.stats_labels[key].configure(text=translation)
+            # Alle geregistreerde widgets in één keer (alleen gewijzigde teksten)
+            self.ui.set_language(self.current_language)
             
             # Update input label
             if hasattr(self, 'input_label'):
@@ -1037,11 +1007,6 @@ Klik 'Start Conversie' om te beginnen."""
                     else:
                         self.input_label.configure(text="No file selected")
             
-            # Update output label
-            if hasattr(self, 'output_label'):
-                downloads_path = os.path.join(os.path.expanduser("~"), "Downloads")
-                self.output_label.configure(text=f"📁 {downloads_path}")
-            
             # Update status
             if self.current_language == "nl":
                 self.status_label.configure(text="Klaar voor conversie")
@@ -1057,6 +1022,9 @@ Klik 'Start Conversie' om te beginnen."""
         import os
         import subprocess
         
+        # Openstaande instellingen eerst wegschrijven (de nieuwe instantie leest ze)
+        self.settings.flush()
+        
         # Sluit huidige venster
         self.root.destroy()
         
@@ -1069,38 +1037,6 @@ Klik 'Start Conversie' om te beginnen."""
             # Fallback: probeer os.execl
             os.execl(python, python, *sys.argv)
     
-    def update_theme_colors(self):
-        """Update alle UI kleuren voor het nieuwe thema"""
-        try:
-            # Forceer volledige UI refresh
-            self.root.update()
-            self.root.update_idletasks()
-            
-            # Update venster titel
-            version_string = get_version_string()
-            self.root.title(f"{get_text('app_title', self.current_language)} v{version_string}")
-            
-            # Update alle widgets recursief
-            self.update_widget_colors(self.root)
-                        
-        except Exception as e:
-            print(f"Thema update fout: {e}")
-            # Als er een fout is, gewoon doorgaan
-    
-    def update_widget_colors(self, widget):
-        """Update kleuren van widget en alle kinderen"""
-        try:
-            # Update huidige widget
-            if hasattr(widget, 'configure'):
-                widget.update()
-            
-            # Update alle kinderen
-            for child in widget.winfo_children():
-                self.update_widget_colors(child)
-                
-        except Exception:
-            pass
-    
     def new_conversion(self):
         """Start nieuwe conversie"""
         self.input_file = None
@@ -1116,6 +1052,8 @@ Klik 'Start Conversie' om te beginnen."""
         # Reset preview
         if hasattr(self, 'preview_info'):
             self.preview_info.configure(text="Selecteer een PDF voor preview")
+        if hasattr(self, 'thumbnail_grid'):
+            self.thumbnail_grid.clear()
         if hasattr(self, 'preview_label'):
             self.preview_label.configure(text="👁️ Preview")
         
@@ -1177,10 +1115,16 @@ Klik 'Start Conversie' om te beginnen."""
             # Update files
             if "files" in self.stats_labels:
                 self.stats_labels["files"].configure(text=str(len(self.conversion_stats["files_created"])))
+            
+            # Update cache
+            if "cache" in self.stats_labels:
+                hits = self.conversion_stats.get("cache_hits", 0)
+                misses = self.conversion_stats.get("cache_misses", 0)
+                self.stats_labels["cache"].configure(text=f"{hits} hits / {misses} misses")
         
     def select_input_file(self):
         """Selecteer input bestand op basis van conversie mode"""
-        if self.conversion_mode == "pdf_to_image":
+        if self.conversion_mode in ["pdf_to_image", "pdf_split", "pdf_optimize"]:
             file_path = filedialog.askopenfilename(
                 title="Selecteer PDF bestand",
                 filetypes=[("PDF bestanden", "*.pdf"), ("Alle bestanden", "*.*")]
@@ -1206,7 +1150,7 @@ Klik 'Start Conversie' om te beginnen."""
             file_paths = filedialog.askopenfilenames(
                 title="Selecteer afbeeldingen",
                 filetypes=[
-                    ("Afbeeldingen", "*.jpg *.jpeg *.png *.bmp *.tiff *.tif"),
+                    ("Afbeeldingen", "*.jpg *.jpeg *.png *.bmp *.tiff *.tif *.webp *.avif"),
                     ("JPEG bestanden", "*.jpg *.jpeg"),
                     ("PNG bestanden", "*.png"),
                     ("Alle bestanden", "*.*")
@@ -1223,7 +1167,7 @@ Klik 'Start Conversie' om te beginnen."""
                     else:
                         self.status_label.configure(text=f"Images selected: {filename}")
         
-        elif self.conversion_mode == "pdf_merge":
+        elif self.conversion_mode in ["pdf_merge", "pdf_append"]:
             file_paths = filedialog.askopenfilenames(
                 title="Selecteer PDF's",
                 filetypes=[("PDF bestanden", "*.pdf"), ("Alle bestanden", "*.*")]
@@ -1241,7 +1185,7 @@ Klik 'Start Conversie' om te beginnen."""
             
     def select_output_folder(self):
         """Selecteer output map of bestand op basis van conversie mode"""
-        if self.conversion_mode == "pdf_to_image":
+        if self.conversion_mode in ["pdf_to_image", "pdf_split"]:
             # Start in Downloads map als standaard
             initial_dir = os.path.join(os.path.expanduser("~"), "Downloads")
             folder_path = filedialog.askdirectory(
@@ -1261,8 +1205,28 @@ Klik 'Start Conversie' om te beginnen."""
                     else:
                         self.status_label.configure(text="Output folder selected")
         
-        elif self.conversion_mode in ["image_to_pdf", "pdf_merge"]:
-            # Voor image_to_pdf en pdf_merge: selecteer output bestand
+        elif self.conversion_mode == "pdf_append":
+            # Voor pdf_append: selecteer de bestaande PDF die aangevuld wordt
+            initial_dir = os.path.join(os.path.expanduser("~"), "Downloads")
+            file_path = filedialog.askopenfilename(
+                title="Selecteer bestaande PDF",
+                filetypes=[("PDF bestanden", "*.pdf"), ("Alle bestanden", "*.*")],
+                initialdir=initial_dir
+            )
+            
+            if file_path:
+                self.output_file = file_path
+                filename = os.path.basename(file_path)
+                if hasattr(self, 'output_label'):
+                    self.output_label.configure(text=f"📄 {filename}")
+                if hasattr(self, 'status_label'):
+                    if self.current_language == "nl":
+                        self.status_label.configure(text=f"Bestaande PDF geselecteerd: {filename}")
+                    else:
+                        self.status_label.configure(text=f"Existing PDF selected: {filename}")
+        
+        elif self.conversion_mode in ["image_to_pdf", "pdf_merge", "pdf_optimize"]:
+            # Voor image_to_pdf, pdf_merge en pdf_optimize: selecteer output bestand
             initial_dir = os.path.join(os.path.expanduser("~"), "Downloads")
             file_path = filedialog.asksaveasfilename(
                 title="Selecteer output PDF",
@@ -1285,7 +1249,7 @@ Klik 'Start Conversie' om te beginnen."""
     def start_conversion(self):
         """Start de conversie in een aparte thread op basis van mode"""
         # Check input based on mode
-        if self.conversion_mode == "pdf_to_image":
+        if self.conversion_mode in ["pdf_to_image", "pdf_split"]:
             if not hasattr(self, 'input_file') or not self.input_file:
                 if self.current_language == "nl":
                     messagebox.showerror("Fout", "Selecteer eerst een PDF bestand!")
@@ -1300,8 +1264,15 @@ Klik 'Start Conversie' om te beginnen."""
                     messagebox.showerror("Error", "Please select an output folder first!")
                 return
                 
+            if self.conversion_mode == "pdf_split":
+                # Start PDF split
+                thread = threading.Thread(target=self.split_pdf_mode)
+                thread.daemon = True
+                thread.start()
+                return
+                
             # Start PDF to image conversion
-            thread = threading.Thread(target=self.convert_pdf_to_images_mode, args=(self.dpi_var.get() if self.dpi_var else "300", self.format_var.get() if self.format_var else "PNG"))
+            thread = threading.Thread(target=self.convert_pdf, args=(self.dpi_var.get() if self.dpi_var else "300", self.format_var.get() if self.format_var else "PNG"))
             thread.daemon = True
             thread.start()
             
@@ -1344,34 +1315,72 @@ Klik 'Start Conversie' om te beginnen."""
             thread = threading.Thread(target=self.merge_pdfs_mode)
             thread.daemon = True
             thread.start()
+            
+        elif self.conversion_mode == "pdf_append":
+            if not hasattr(self, 'input_files') or not self.input_files:
+                if self.current_language == "nl":
+                    messagebox.showerror("Fout", "Selecteer eerst PDF's!")
+                else:
+                    messagebox.showerror("Error", "Please select PDFs first!")
+                return
+                
+            if not hasattr(self, 'output_file') or not self.output_file or not os.path.exists(self.output_file):
+                if self.current_language == "nl":
+                    messagebox.showerror("Fout", "Selecteer eerst een bestaande PDF om aan te vullen!")
+                else:
+                    messagebox.showerror("Error", "Please select an existing PDF to append to first!")
+                return
+                
+            # Start PDF append
+            thread = threading.Thread(target=self.append_pdfs_mode)
+            thread.daemon = True
+            thread.start()
+            
+        elif self.conversion_mode == "pdf_optimize":
+            if not hasattr(self, 'input_file') or not self.input_file:
+                if self.current_language == "nl":
+                    messagebox.showerror("Fout", "Selecteer eerst een PDF bestand!")
+                else:
+                    messagebox.showerror("Error", "Please select a PDF file first!")
+                return
+                
+            if not hasattr(self, 'output_file') or not self.output_file:
+                if self.current_language == "nl":
+                    messagebox.showerror("Fout", "Selecteer eerst een output PDF!")
+                else:
+                    messagebox.showerror("Error", "Please select an output PDF first!")
+                return
+                
+            # Start PDF optimalisatie
+            thread = threading.Thread(target=self.optimize_pdf_mode)
+            thread.daemon = True
+            thread.start()
     
     def convert_images_to_pdf_mode(self):
         """Converteer afbeeldingen naar PDF"""
         try:
+            from core import images_to_pdf
+            
             self.convert_button.configure(state="disabled")
             if self.current_language == "nl":
                 self.status_label.configure(text="Afbeeldingen worden geconverteerd naar PDF...")
             else:
                 self.status_label.configure(text="Converting images to PDF...")
             
-            images = []
-            for path in self.input_files:
-                img = Image.open(path)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                images.append(img)
-            
-            # Sla op als PDF
-            if images:
-                images[0].save(self.output_file, "PDF", resolution=300.0, save_all=True, append_images=images[1:])
+            image_count = images_to_pdf(
+                self.input_files,
+                self.output_file,
+                linearize=self.settings.get("conversion", "linearize_pdf", False),
+                compact=self.settings.get("conversion", "compact_pdf", False)
+            )
             
             self.convert_button.configure(state="normal")
             if self.current_language == "nl":
                 self.status_label.configure(text="✅ Conversie voltooid!")
-                messagebox.showinfo("Succes", f"{len(images)} afbeeldingen succesvol geconverteerd naar PDF!")
+                messagebox.showinfo("Succes", f"{image_count} afbeeldingen succesvol geconverteerd naar PDF!")
             else:
                 self.status_label.configure(text="✅ Conversion complete!")
-                messagebox.showinfo("Success", f"{len(images)} images successfully converted to PDF!")
+                messagebox.showinfo("Success", f"{image_count} images successfully converted to PDF!")
             
         except Exception as e:
             self.convert_button.configure(state="normal")
@@ -1386,18 +1395,22 @@ Klik 'Start Conversie' om te beginnen."""
     def merge_pdfs_mode(self):
         """Voeg meerdere PDF's samen"""
         try:
+            from core import merge
+            
             self.convert_button.configure(state="disabled")
             if self.current_language == "nl":
                 self.status_label.configure(text="PDF's worden samengevoegd...")
             else:
                 self.status_label.configure(text="Merging PDFs...")
             
-            merger = PyPDF2.PdfMerger()
-            for path in self.input_files:
-                merger.append(path)
-            
-            merger.write(self.output_file)
-            merger.close()
+            merge(
+                self.input_files,
+                self.output_file,
+                linearize=self.settings.get("conversion", "linearize_pdf", False),
+                compact=self.settings.get("conversion", "compact_pdf", False),
+                skip_blank=self.settings.get("conversion", "merge_skip_blank", False),
+                blank_tolerance=self.settings.get("conversion", "blank_tolerance", 0.002)
+            )
             
             self.convert_button.configure(state="normal")
             if self.current_language == "nl":
@@ -1417,6 +1430,186 @@ Klik 'Start Conversie' om te beginnen."""
                 self.status_label.configure(text="❌ Conversion failed")
                 messagebox.showerror("Error", f"Conversion failed: {error_msg}")
         
+    def append_pdfs_mode(self):
+        """Vul een bestaande PDF aan via een incremental update"""
+        try:
+            from pdf_output import append_pages_incremental
+            
+            self.convert_button.configure(state="disabled")
+            if self.current_language == "nl":
+                self.status_label.configure(text="Pagina's worden toegevoegd...")
+            else:
+                self.status_label.configure(text="Appending pages...")
+            
+            start_time = time.time()
+            result = append_pages_incremental(self.output_file, self.input_files)
+            
+            # Update statistieken
+            self.conversion_stats = {
+                "start_time": start_time,
+                "end_time": time.time(),
+                "pages_converted": result["pages_added"],
+                "total_size": result["bytes_written"],
+                "files_created": [self.output_file]
+            }
+            self.update_stats()
+            
+            self.convert_button.configure(state="normal")
+            if self.current_language == "nl":
+                self.status_label.configure(text="✅ Conversie voltooid!")
+                messagebox.showinfo("Succes", f"{result['pages_added']} pagina('s) toegevoegd aan {os.path.basename(self.output_file)}!")
+            else:
+                self.status_label.configure(text="✅ Conversion complete!")
+                messagebox.showinfo("Success", f"{result['pages_added']} page(s) appended to {os.path.basename(self.output_file)}!")
+            
+        except Exception as e:
+            self.convert_button.configure(state="normal")
+            error_msg = str(e)
+            if self.current_language == "nl":
+                self.status_label.configure(text="❌ Conversie gefaald")
+                messagebox.showerror("Fout", f"Conversie gefaald: {error_msg}")
+            else:
+                self.status_label.configure(text="❌ Conversion failed")
+                messagebox.showerror("Error", f"Conversion failed: {error_msg}")
+        
+    def optimize_pdf_mode(self):
+        """Verklein en hercomprimeer de afbeeldingen in een PDF"""
+        try:
+            from pdf_optimize import optimize_pdf
+            
+            self.convert_button.configure(state="disabled")
+            self.progress_bar.set(0)
+            if self.current_language == "nl":
+                self.status_label.configure(text="PDF wordt geoptimaliseerd...")
+            else:
+                self.status_label.configure(text="Optimising PDF...")
+            
+            def on_progress(done, total):
+                self.progress_bar.set(done / total)
+            
+            start_time = time.time()
+            result = optimize_pdf(
+                self.input_file,
+                self.output_file,
+                target_dpi=self.settings.get("conversion", "optimize_dpi", 150),
+                quality=self.settings.get("conversion", "optimize_quality", 75),
+                compression=self.settings.get("conversion", "optimize_compression", "jpeg"),
+                workers=self.settings.get("advanced", "thread_count", 0),
+                progress_callback=on_progress
+            )
+            
+            # Update statistieken
+            self.conversion_stats = {
+                "start_time": start_time,
+                "end_time": time.time(),
+                "pages_converted": result["images_optimized"],
+                "total_size": result["size_after"],
+                "files_created": [self.output_file]
+            }
+            self.update_stats()
+            
+            # Rapport met de grootste besparingen per afbeelding
+            saved = (result["size_before"] - result["size_after"]) / 1024 / 1024
+            lines = []
+            for image in result["images"][:5]:
+                lines.append(
+                    f"p{image['page']} {image['name']}: "
+                    f"{image['pixels_before'][0]}x{image['pixels_before'][1]} → {image['pixels_after'][0]}x{image['pixels_after'][1]}, "
+                    f"{image['size_before'] // 1024} → {image['size_after'] // 1024} KB ({image['seconds']:.2f}s)"
+                )
+            for image in result["images_failed"]:
+                if self.current_language == "nl":
+                    lines.append(f"p{image['page']} {image['name']}: overgeslagen ({image['error']})")
+                else:
+                    lines.append(f"p{image['page']} {image['name']}: skipped ({image['error']})")
+            details = "\n".join(lines)
+            
+            self.convert_button.configure(state="normal")
+            if self.current_language == "nl":
+                self.status_label.configure(text="✅ Conversie voltooid!")
+                messagebox.showinfo("Succes", f"{result['images_optimized']} van {result['images_found']} afbeeldingen geoptimaliseerd, "
+                                              f"{saved:.1f} MB bespaard in {result['seconds']:.1f}s\n\n{details}")
+            else:
+                self.status_label.configure(text="✅ Conversion complete!")
+                messagebox.showinfo("Success", f"{result['images_optimized']} of {result['images_found']} images optimised, "
+                                               f"{saved:.1f} MB saved in {result['seconds']:.1f}s\n\n{details}")
+            
+        except Exception as e:
+            self.convert_button.configure(state="normal")
+            error_msg = str(e)
+            if self.current_language == "nl":
+                self.status_label.configure(text="❌ Conversie gefaald")
+                messagebox.showerror("Fout", f"Conversie gefaald: {error_msg}")
+            else:
+                self.status_label.configure(text="❌ Conversion failed")
+                messagebox.showerror("Error", f"Conversion failed: {error_msg}")
+        
+    def split_pdf_mode(self):
+        """Splits een PDF in meerdere delen"""
+        try:
+            from pdf_split import split_pdf
+            
+            self.convert_button.configure(state="disabled")
+            self.progress_bar.set(0)
+            if self.current_language == "nl":
+                self.status_label.configure(text="PDF wordt gesplitst...")
+            else:
+                self.status_label.configure(text="Splitting PDF...")
+            
+            def on_progress(done, total):
+                self.progress_bar.set(done / total)
+            
+            start_time = time.time()
+            results = split_pdf(
+                self.input_file,
+                self.output_folder,
+                method=self.settings.get("conversion", "split_method", "pages"),
+                pages_per_part=self.settings.get("conversion", "split_pages", 100),
+                max_bytes=int(float(self.settings.get("conversion", "split_size_mb", 10)) * 1024 * 1024),
+                workers=self.settings.get("advanced", "thread_count", 0),
+                progress_callback=on_progress
+            )
+            
+            # Update statistieken
+            self.conversion_stats = {
+                "start_time": start_time,
+                "end_time": time.time(),
+                "pages_converted": sum(pages for _, pages, _ in results),
+                "total_size": sum(size for _, _, size in results),
+                "files_created": [path for path, _, _ in results]
+            }
+            self.update_stats()
+            
+            self.convert_button.configure(state="normal")
+            if self.current_language == "nl":
+                self.status_label.configure(text="✅ Conversie voltooid!")
+                messagebox.showinfo("Succes", f"PDF gesplitst in {len(results)} delen in {self.output_folder}")
+            else:
+                self.status_label.configure(text="✅ Conversion complete!")
+                messagebox.showinfo("Success", f"PDF split into {len(results)} parts in {self.output_folder}")
+            
+        except Exception as e:
+            self.convert_button.configure(state="normal")
+            error_msg = str(e)
+            if self.current_language == "nl":
+                self.status_label.configure(text="❌ Conversie gefaald")
+                messagebox.showerror("Fout", f"Conversie gefaald: {error_msg}")
+            else:
+                self.status_label.configure(text="❌ Conversion failed")
+                messagebox.showerror("Error", f"Conversion failed: {error_msg}")
+        
+    def get_render_cache(self):
+        """Haal de render cache op (of None als die uit staat)"""
+        if not self.settings.get("advanced", "render_cache", True):
+            return None
+        if getattr(self, 'render_cache', None) is None:
+            self.render_cache = RenderCache(
+                self.settings.get("advanced", "cache_folder", "") or None,
+                max_bytes=int(self.settings.get("advanced", "cache_size_mb", 1024)) * 1024 * 1024,
+                hardlinks=self.settings.get("advanced", "cache_hardlinks", False)
+            )
+        return self.render_cache
+    
     def convert_pdf(self, dpi_value="300", format_value="PNG"):
         """Converteer PDF naar afbeeldingen"""
         try:
@@ -1426,7 +1619,10 @@ Klik 'Start Conversie' om te beginnen."""
                 "end_time": None,
                 "pages_converted": 0,
                 "total_size": 0,
-                "files_created": []
+                "files_created": [],
+                "cache_hits": 0,
+                "cache_misses": 0,
+                "blank_pages": 0
             }
             
             self.convert_button.configure(state="disabled")
@@ -1441,65 +1637,193 @@ Klik 'Start Conversie' om te beginnen."""
                 self.status_label.configure(text="PDF wordt gelezen...")
             else:
                 self.status_label.configure(text="Reading PDF...")
-            pages = convert_from_path(
-                self.input_file, 
-                dpi=int(dpi_value),
-                first_page=None,
-                last_page=None,
-                poppler_path=poppler_path
-            )
             
-            total_pages = len(pages)
             filename_base = Path(self.input_file).stem
             output_format = format_value.lower()
             quality = self.settings.get("conversion", "quality", 95)
+            compression = self.settings.get("conversion", "compression", "none")
+            from collections import deque
+            from concurrent.futures import ThreadPoolExecutor
+            from image_pyramid import parse_sizes
+            from output_sinks import ENCODER_THREADS, open_sink
             
-            # Converteer elke pagina
-            for i, page in enumerate(pages):
-                if self.current_language == "nl":
-                    self.status_label.configure(text=f"Pagina {i+1} van {total_pages} wordt geconverteerd...")
-                else:
-                    self.status_label.configure(text=f"Converting page {i+1} of {total_pages}...")
+            cache = self.get_render_cache()
+            container = self.settings.get("conversion", "output_container", "files")
+            if container != "files":
+                # De cache werkt met losse pagina bestanden
+                cache = None
+            
+            # Extra formaten (medium, thumbnail, ...) uit dezelfde rendering
+            sizes = parse_sizes(self.settings.get("conversion", "output_sizes", ""), output_format, quality)
+            if sizes:
+                # Een pagina uit de cache wordt niet gerenderd, dus er valt niets af te leiden
+                cache = None
+            
+            backend = self.settings.get("advanced", "render_backend", "auto")
+            total_pages = get_pool().page_count(self.input_file)
+            if cache:
+                # Pagina's uit de cache hoeven niet gerenderd te worden
+                file_hash = cache.file_hash(self.input_file)
+            
+            # Lege pagina's vooraf op lage DPI zoeken (niet renderen, of alleen een placeholder)
+            blank_mode = self.settings.get("conversion", "blank_pages", "keep")
+            blank = {}
+            if blank_mode in ["skip", "placeholder"]:
+                from blank_pages import find_blank_pages
                 
-                # Bepaal output bestandsnaam
-                if total_pages == 1:
-                    output_filename = f"{filename_base}.{output_format}"
+                if self.current_language == "nl":
+                    self.status_label.configure(text="Lege pagina's zoeken...")
                 else:
-                    output_filename = f"{filename_base}_pagina_{i+1:03d}.{output_format}"
-                
-                output_path = os.path.join(self.output_folder, output_filename)
+                    self.status_label.configure(text="Detecting blank pages...")
+                blank = find_blank_pages(
+                    self.input_file,
+                    self.settings.get("conversion", "blank_tolerance", 0.002),
+                    backend=backend
+                )
+            
+            # Per pagina kleur, grijs of zwart-wit bepalen (lage DPI analyse)
+            modes = {}
+            if self.settings.get("conversion", "adaptive_color", False):
+                from page_modes import apply_mode, classify_pages
                 
-                # Sla afbeelding op
-                if output_format in ['jpg', 'jpeg']:
-                    # Converteer naar RGB voor JPG
-                    if page.mode == 'RGBA':
-                        page = page.convert('RGB')
-                    page.save(output_path, 'JPEG', quality=quality)
+                if self.current_language == "nl":
+                    self.status_label.configure(text="Pagina's analyseren...")
                 else:
-                    page.save(output_path, output_format.upper())
-                
+                    self.status_label.configure(text="Analysing pages...")
+                modes = classify_pages(self.input_file, backend=backend)
+            
+            def page_mode(i):
+                return modes.get(i + 1, "color")
+            
+            # Eén bestand per pagina, alles in één TIFF/archief, of Deep Zoom tegels per pagina
+            sink = open_sink(container, self.output_folder, filename_base, total_pages, output_format, quality,
+                             compression, self.settings.get("conversion", "tiff_compression", "auto"),
+                             sizes, int(dpi_value), self.settings.get("conversion", "tile_size", 256))
+            
+            def page_done(output_path=None):
                 # Update statistieken
                 self.conversion_stats["pages_converted"] += 1
-                if os.path.exists(output_path):
+                if output_path and os.path.exists(output_path):
                     file_size = os.path.getsize(output_path)
                     self.conversion_stats["total_size"] += file_size
                     self.conversion_stats["files_created"].append(output_path)
                 
                 # Update progress
-                progress = (i + 1) / total_pages
+                progress = self.conversion_stats["pages_converted"] / total_pages
                 self.progress_bar.set(progress)
                 
                 # Update statistieken weergave
                 self.update_stats()
             
+            # Eerst alles wat al in de cache zit, en lege pagina's die wegvallen
+            missing = []
+            for i in range(total_pages):
+                if i + 1 in blank and blank_mode == "skip":
+                    self.conversion_stats["blank_pages"] += 1
+                    page_done()
+                elif i + 1 in blank:
+                    # Placeholder: op zijn plek toevoegen (volgorde telt in een TIFF of archief)
+                    missing.append(i)
+                elif cache and cache.get(cache.key(file_hash, i, int(dpi_value), output_format, quality, compression, page_mode(i), backend),
+                                         sink.path(i + 1)):
+                    self.conversion_stats["cache_hits"] += 1
+                    page_done(sink.path(i + 1))
+                else:
+                    missing.append(i)
+            
+            def run_kind(i):
+                return "blank" if i + 1 in blank else page_mode(i)
+            
+            def page_stored(i, output_path):
+                if cache:
+                    self.conversion_stats["cache_misses"] += 1
+                    cache.put(cache.key(file_hash, i, int(dpi_value), output_format, quality, compression, page_mode(i), backend), output_path)
+                page_done(output_path)
+            
+            # Losse bestanden kunnen parallel gecodeerd worden; een TIFF, archief of
+            # extra formaten verwachten de pagina's op volgorde
+            encoder = ThreadPoolExecutor(ENCODER_THREADS) if container == "files" and not sizes else None
+            encoding = deque()
+            
+            # Ontbrekende pagina's per aaneengesloten reeks van dezelfde soort renderen
+            runs = []
+            for i in missing:
+                if runs and runs[-1][-1] == i - 1 and run_kind(runs[-1][-1]) == run_kind(i):
+                    runs[-1].append(i)
+                else:
+                    runs.append([i])
+            
+            try:
+                for run in runs:
+                    if run_kind(run[0]) == "blank":
+                        # De pre-scan afbeelding is klein en houdt de nummering intact
+                        rendered = [(i + 1, blank[i + 1]) for i in run]
+                    else:
+                        # Workers renderen vooruit; pagina's komen via gedeeld geheugen binnen
+                        rendered = get_pool().render_shared(
+                            self.input_file,
+                            dpi=int(dpi_value),
+                            first_page=run[0] + 1,
+                            last_page=run[-1] + 1,
+                            gray=page_mode(run[0]) != "color"
+                        )
+                    
+                    # Converteer elke pagina
+                    for page_number, page in rendered:
+                        i = page_number - 1
+                        if i + 1 in blank:
+                            self.conversion_stats["blank_pages"] += 1
+                            page_done(sink.add(page_number, page))
+                            continue
+                        if modes:
+                            page = apply_mode(page, page_mode(i))
+                        if self.current_language == "nl":
+                            self.status_label.configure(text=f"Pagina {i+1} van {total_pages} wordt geconverteerd...")
+                        else:
+                            self.status_label.configure(text=f"Converting page {i+1} of {total_pages}...")
+                        
+                        if cache and os.path.exists(sink.path(page_number)):
+                            # Kan een hard link naar een cache entry zijn
+                            os.remove(sink.path(page_number))
+                        
+                        # Sla afbeelding op (eigen bestand, of erbij in de TIFF/het archief)
+                        if encoder:
+                            # Coderen (en palet kwantisatie) in een thread, zodat de volgende pagina
+                            # direct binnen kan komen; kopie omdat het gedeelde blok hergebruikt wordt
+                            encoding.append((i, encoder.submit(sink.add, page_number, page.copy())))
+                            while encoding and (encoding[0][1].done() or len(encoding) > 2 * ENCODER_THREADS):
+                                stored_index, future = encoding.popleft()
+                                page_stored(stored_index, future.result())
+                        else:
+                            page_stored(i, sink.add(page_number, page))
+                
+                while encoding:
+                    stored_index, future = encoding.popleft()
+                    page_stored(stored_index, future.result())
+            finally:
+                if encoder:
+                    encoder.shutdown()
+                outputs = sink.close()
+            
+            # Losse pagina bestanden zijn al per pagina geteld
+            created = outputs if container != "files" else []
+            if sizes:
+                created = created + sink.derived
+            for output_path in created:
+                self.conversion_stats["total_size"] += os.path.getsize(output_path)
+                self.conversion_stats["files_created"].append(output_path)
+            
             # Voltooi statistieken
             self.conversion_stats["end_time"] = time.time()
             self.update_stats()
             
+            blank_count = self.conversion_stats["blank_pages"]
             if self.current_language == "nl":
-                self.status_label.configure(text=f"Conversie voltooid! {total_pages} pagina('s) geconverteerd.")
+                blank_text = f" ({blank_count} leeg)" if blank_count else ""
+                self.status_label.configure(text=f"Conversie voltooid! {total_pages} pagina('s) geconverteerd{blank_text}.")
             else:
-                self.status_label.configure(text=f"Conversion complete! {total_pages} page(s) converted.")
+                blank_text = f" ({blank_count} blank)" if blank_count else ""
+                self.status_label.configure(text=f"Conversion complete! {total_pages} page(s) converted{blank_text}.")
             
             # Auto-open output folder als ingesteld
             if self.settings.get("conversion", "auto_open_output", False):
@@ -1549,14 +1873,30 @@ Licentie: MIT
         
         messagebox.showinfo("Over MakkelijkPdf", about_text)
             
-    def run(self):
+    def report_startup_time(self, init_done):
+        """Print hoe lang importeren en opstarten tot het eerste venster duurde"""
+        window_time = time.perf_counter()
+        print("⏱️ Opstarttijd:")
+        print(f"   Imports:        {(IMPORT_TIME - STARTUP_TIME) * 1000:7.1f} ms")
+        print(f"   Venster opbouw: {(init_done - IMPORT_TIME) * 1000:7.1f} ms")
+        print(f"   Eerste venster: {(window_time - STARTUP_TIME) * 1000:7.1f} ms")
+        lazy_modules = ["pdf2image", "PyPDF2", "pdf_output", "pdf_optimize", "pdf_split"]
+        loaded = [name for name in lazy_modules if name in sys.modules]
+        print(f"   Al geladen:     {', '.join(loaded) if loaded else 'geen zware modules'}")
+            
+    def run(self, startup_timing=False):
         """Start de applicatie"""
+        if startup_timing:
+            # after_idle draait pas als het venster getekend is
+            init_done = time.perf_counter()
+            self.root.after_idle(self.report_startup_time, init_done)
         self.root.mainloop()
 
 def main():
     """Hoofdfunctie"""
+    startup_timing = "--startup-timing" in sys.argv or bool(os.environ.get("MAKKELIJKPDF_STARTUP_TIMING"))
     app = MakkelijkPdfApp()
-    app.run()
+    app.run(startup_timing)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,148 @@
+"""
+MakkelijkPdf - Output voor geconverteerde pagina's
+
+Standaard wordt elke pagina een eigen bestand. Voor archivering kan een
+document ook één bestand worden: een multi-page TIFF of een archief
+(ZIP, CBZ, tar). Voor web viewers kan elke pagina een Deep Zoom
+piramide van tegels worden (deep_zoom.py). Pagina's worden toegevoegd zodra ze gerenderd zijn,
+zonder tussenbestanden en zonder alle pagina's in het geheugen te houden.
+"""
+
+import os
+import tarfile
+import time
+import zipfile
+from io import BytesIO
+import core
+
+# Container -> extensie van het output bestand
+CONTAINERS = {"files": None, "tiff": "tif", "zip": "zip", "cbz": "cbz", "tar": "tar", "dzi": "dzi"}
+
+# Threads die losse pagina bestanden tegelijk mogen coderen
+ENCODER_THREADS = min(4, os.cpu_count() or 1)
+
+# TIFF compressie instelling -> Pillow compressie voor pagina's die niet zwart-wit zijn
+TIFF_COMPRESSION = {"auto": "tiff_adobe_deflate", "deflate": "tiff_adobe_deflate", "lzw": "tiff_lzw",
+                    "group4": "tiff_adobe_deflate", "none": None}
+
+
+def tiff_codec(page, setting="auto"):
+    """Compressie per pagina: CCITT Group 4 voor zwart-wit, anders volgens de instelling"""
+    if page.mode == "1" and setting in ["auto", "group4"]:
+        return "group4"
+    return TIFF_COMPRESSION.get(setting, "tiff_adobe_deflate")
+
+
+class FileSink:
+    """Eén bestand per pagina ({naam}_pagina_001.png, ...)"""
+
+    def __init__(self, output_folder, filename_base, total_pages, output_format, quality=95, compression="none"):
+        self.output_folder = output_folder
+        self.filename_base = filename_base
+        self.total_pages = total_pages
+        self.output_format = output_format
+        self.quality = quality
+        self.compression = compression
+        self.outputs = []
+
+    def path(self, page_number):
+        """Output pad van een pagina"""
+        return os.path.join(self.output_folder,
+                            core.page_filename(self.filename_base, page_number, self.total_pages, self.output_format))
+
+    def add(self, page_number, page):
+        """Schrijf een pagina; geeft het pad van het nieuwe bestand terug"""
+        output_path = self.path(page_number)
+        core.save_page(page, output_path, self.output_format, self.quality, self.compression)
+        self.outputs.append(output_path)
+        return output_path
+
+    def close(self):
+        """Geeft de geschreven bestanden terug"""
+        return self.outputs
+
+
+class TiffSink:
+    """Alle pagina's als frames in één multi-page TIFF"""
+
+    def __init__(self, path, tiff_compression="auto"):
+        from PIL import TiffImagePlugin
+
+        self.path = path
+        self.tiff_compression = tiff_compression
+        self.writer = TiffImagePlugin.AppendingTiffWriter(path, new=True)
+
+    def add(self, page_number, page):
+        """Voeg de volgende pagina toe als frame (pagina's in volgorde aanbieden)"""
+        if page.mode not in ["1", "L", "RGB", "RGBA", "CMYK"]:
+            page = page.convert("RGB")
+        page.save(self.writer, "TIFF", compression=tiff_codec(page, self.tiff_compression))
+        self.writer.newFrame()
+
+    def close(self):
+        """Sluit de TIFF af; geeft het output pad terug"""
+        self.writer.close()
+        return [self.path]
+
+
+class ArchiveSink:
+    """Gecodeerde pagina's in één ZIP, CBZ of tar archief"""
+
+    def __init__(self, path, kind, filename_base, total_pages, output_format, quality=95, compression="none"):
+        self.path = path
+        self.kind = kind
+        self.filename_base = filename_base
+        self.total_pages = total_pages
+        self.output_format = output_format
+        self.quality = quality
+        self.compression = compression
+        if kind == "tar":
+            self.archive = tarfile.open(path, "w")
+        else:
+            # Afbeeldingen zijn al gecomprimeerd; nog eens deflaten kost alleen tijd
+            self.archive = zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True)
+
+    def add(self, page_number, page):
+        """Codeer een pagina in het geheugen en schrijf hem direct in het archief"""
+        name = core.page_filename(self.filename_base, page_number, self.total_pages, self.output_format)
+        data = core.encode_page(page, self.output_format, self.quality, self.compression)
+        if self.kind == "tar":
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self.archive.addfile(info, BytesIO(data))
+        else:
+            self.archive.writestr(name, data)
+
+    def close(self):
+        """Sluit het archief af; geeft het output pad terug"""
+        self.archive.close()
+        return [self.path]
+
+
+def open_sink(container, output_folder, filename_base, total_pages, output_format, quality=95,
+              compression="none", tiff_compression="auto", sizes=None, dpi=300, tile_size=256):
+    """Open de output voor één document (files, tiff, zip, cbz, tar of dzi)
+
+    Met sizes (zie image_pyramid.parse_sizes) komen er per pagina ook
+    kleinere formaten bij, afgeleid uit dezelfde rendering op dpi.
+    """
+    if container not in CONTAINERS:
+        raise ValueError(f"Onbekende output container: {container}")
+    if sizes:
+        from image_pyramid import PyramidSink
+
+        sink = open_sink(container, output_folder, filename_base, total_pages, output_format, quality,
+                         compression, tiff_compression, tile_size=tile_size)
+        return PyramidSink(sink, sizes, dpi, output_folder, filename_base, total_pages, compression)
+    if container == "files":
+        return FileSink(output_folder, filename_base, total_pages, output_format, quality, compression)
+    if container == "dzi":
+        from deep_zoom import DeepZoomSink
+
+        return DeepZoomSink(output_folder, filename_base, total_pages, output_format, quality, compression, tile_size)
+
+    path = os.path.join(output_folder, f"{filename_base}.{CONTAINERS[container]}")
+    if container == "tiff":
+        return TiffSink(path, tiff_compression)
+    return ArchiveSink(path, container, filename_base, total_pages, output_format, quality, compression)
@@ -0,0 +1,69 @@
+"""
+MakkelijkPdf - Kleur, grijs of zwart-wit per pagina
+
+De meeste pagina's in gescande of tekst documenten hebben geen kleur
+nodig. Een snelle analyse op lage DPI deelt elke pagina in als "color",
+"gray" of "mono"; de pagina wordt daarna in de goedkoopste getrouwe vorm
+gerenderd en gecodeerd (RGB, 8-bit grijs of 1-bit zwart-wit).
+"""
+
+import core
+
+# DPI van de analyse
+CLASSIFY_DPI = 50
+
+# Verschil tussen het hoogste en laagste kanaal waarboven een pixel gekleurd is
+CHROMA_LEVEL = 24
+
+# Vanaf dit deel gekleurde pixels is een pagina kleur
+COLOR_FRACTION = 0.002
+
+# Grijswaarden tussen deze grenzen zijn geen papier en geen inkt (ook lichte tinten)
+MIDTONE_RANGE = (32, 224)
+
+# Vanaf dit deel vlakken in middentonen (foto's, verlopen, gekleurde balken) is een pagina grijs
+GRAY_FRACTION = 0.002
+
+# Drempel voor zwart-wit
+MONO_THRESHOLD = 128
+
+MODES = ["color", "gray", "mono"]
+
+
+def classify(image):
+    """Deel een (lage resolutie) pagina in: color, gray of mono"""
+    import numpy as np
+
+    pixels = np.asarray(image.convert("RGB"), dtype=np.int16)
+    chroma = pixels.max(axis=2) - pixels.min(axis=2)
+    if np.count_nonzero(chroma > CHROMA_LEVEL) > COLOR_FRACTION * chroma.size:
+        return "color"
+
+    gray = pixels.sum(axis=2) // 3
+    midtone = (gray > MIDTONE_RANGE[0]) & (gray < MIDTONE_RANGE[1])
+    # Randen van tekst zijn op lage DPI ook grijs; alleen middentonen met
+    # middentoon buren (vlakken) tellen mee
+    solid = (midtone[1:-1, 1:-1] & midtone[:-2, 1:-1] & midtone[2:, 1:-1]
+             & midtone[1:-1, :-2] & midtone[1:-1, 2:])
+    if solid.size and np.count_nonzero(solid) > GRAY_FRACTION * solid.size:
+        return "gray"
+    return "mono"
+
+
+def classify_pages(source, dpi=CLASSIFY_DPI, backend="auto"):
+    """Analyseer alle pagina's: dict pagina nummer -> color, gray of mono"""
+    return {page_number: classify(page) for page_number, page in core.render_images(source, dpi, backend=backend)}
+
+
+def to_mono(image):
+    """1-bit zwart-wit met een vaste drempel (geen dithering, tekst blijft scherp)"""
+    return image.convert("L").point(lambda value: 255 if value >= MONO_THRESHOLD else 0, "1")
+
+
+def apply_mode(image, mode):
+    """Zet een gerenderde pagina om naar de gekozen mode"""
+    if mode == "mono":
+        return to_mono(image)
+    if mode == "gray" and image.mode != "L":
+        return image.convert("L")
+    return image
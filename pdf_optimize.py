@@ -0,0 +1,374 @@
+"""
+MakkelijkPdf - PDF Optimaliseren (afbeeldingen hercomprimeren)
+"""
+
+import math
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from PIL import Image
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (
+    ArrayObject,
+    BooleanObject,
+    ContentStream,
+    DictionaryObject,
+    EncodedStreamObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+)
+from pdf_output import ObjectCopier, inherited_attributes, write_xref_table
+
+# Filters die we zelf kunnen decoderen (DCT en JPX alleen als laatste filter)
+DECODABLE_FILTERS = ["/FlateDecode", "/LZWDecode", "/ASCIIHexDecode", "/ASCII85Decode", "/RunLengthDecode"]
+IMAGE_FILTERS = ["/DCTDecode", "/JPXDecode"]
+
+# Aantal kleurcomponenten per kleurruimte
+COLORSPACE_COMPONENTS = {"/DeviceGray": 1, "/DeviceRGB": 3, "/DeviceCMYK": 4}
+MODE_COLORSPACES = {"1": "/DeviceGray", "L": "/DeviceGray", "RGB": "/DeviceRGB", "CMYK": "/DeviceCMYK"}
+
+# Image dictionary sleutels die bij hercompressie opnieuw worden ingevuld
+REWRITTEN_KEYS = ["/Filter", "/DecodeParms", "/Width", "/Height", "/BitsPerComponent", "/Length"]
+
+
+def _multiply(m1, m2):
+    """Vermenigvuldig twee PDF matrices [a b c d e f]"""
+    return [
+        m1[0] * m2[0] + m1[1] * m2[2],
+        m1[0] * m2[1] + m1[1] * m2[3],
+        m1[2] * m2[0] + m1[3] * m2[2],
+        m1[2] * m2[1] + m1[3] * m2[3],
+        m1[4] * m2[0] + m1[5] * m2[2] + m2[4],
+        m1[4] * m2[1] + m1[5] * m2[3] + m2[5],
+    ]
+
+
+def _walk_content(reader, content, resources, ctm, page_number, usage, forms):
+    """Zoek afbeeldingen in een content stream en hun grootste weergavegrootte"""
+    if content is None or resources is None:
+        return
+    resources = resources.get_object()
+    xobjects = resources.get("/XObject")
+    if not xobjects:
+        return
+    xobjects = xobjects.get_object()
+    if not isinstance(content, ContentStream):
+        content = ContentStream(content, reader)
+
+    stack = []
+    for operands, operator in content.operations:
+        if operator == b"q":
+            stack.append(ctm)
+        elif operator == b"Q":
+            ctm = stack.pop() if stack else ctm
+        elif operator == b"cm":
+            ctm = _multiply([float(value) for value in operands], ctm)
+        elif operator == b"Do" and operands and operands[0] in xobjects:
+            reference = xobjects.raw_get(operands[0])
+            if not isinstance(reference, IndirectObject):
+                continue
+            key = (reference.idnum, reference.generation)
+            target = reference.get_object()
+            if target.get("/Subtype") == "/Image":
+                entry = usage.setdefault(key, {
+                    "reference": reference,
+                    "page": page_number,
+                    "name": str(operands[0]),
+                    "width_in": 0.0,
+                    "height_in": 0.0,
+                })
+                entry["width_in"] = max(entry["width_in"], math.hypot(ctm[0], ctm[1]) / 72)
+                entry["height_in"] = max(entry["height_in"], math.hypot(ctm[2], ctm[3]) / 72)
+            elif target.get("/Subtype") == "/Form" and key not in forms:
+                matrix = [float(value) for value in target.get("/Matrix", [1, 0, 0, 1, 0, 0])]
+                _walk_content(reader, target, target.get("/Resources") or resources,
+                              _multiply(matrix, ctm), page_number, usage, forms | {key})
+
+
+def find_images(reader):
+    """Verzamel alle geplaatste afbeeldingen met hun weergavegrootte in inches"""
+    usage = {}
+    for index, page in enumerate(reader.pages):
+        resources = page.get("/Resources") or inherited_attributes(page).get("/Resources")
+        _walk_content(reader, page.get_contents(), resources, [1, 0, 0, 1, 0, 0], index + 1, usage, frozenset())
+    return usage
+
+
+def _image_job(image, entry, target_dpi, quality, compression):
+    """Maak een picklebare job voor een afbeelding, of None als we hem overslaan"""
+    if image.get("/ImageMask") or "/Decode" in image or "/SMaskInData" in image:
+        return None
+    if isinstance(image.get("/Mask"), ArrayObject):
+        # Color key masking hangt af van exacte pixelwaarden
+        return None
+
+    colorspace = image.get("/ColorSpace")
+    if isinstance(colorspace, ArrayObject) and colorspace[0] == "/ICCBased":
+        components = colorspace[1].get_object().get("/N")
+    else:
+        components = COLORSPACE_COMPONENTS.get(colorspace)
+    if components not in (1, 3, 4):
+        return None
+
+    filters = image.get("/Filter", ArrayObject())
+    parms = image.get("/DecodeParms", ArrayObject())
+    if not isinstance(filters, ArrayObject):
+        filters, parms = [filters], [parms]
+    elif not isinstance(parms, ArrayObject):
+        parms = [parms]
+    filters = [str(name) for name in filters]
+    parms = [value.get_object() for value in parms]
+    parms = [{key: item.get_object() for key, item in value.items()} if isinstance(value, DictionaryObject) else {}
+             for value in parms]
+    parms += [{}] * (len(filters) - len(parms))
+    for index, name in enumerate(filters):
+        if name not in DECODABLE_FILTERS and not (name in IMAGE_FILTERS and index == len(filters) - 1):
+            return None
+
+    bits = image.get("/BitsPerComponent", 8)
+    if filters[-1:] != ["/DCTDecode"] and filters[-1:] != ["/JPXDecode"] and bits not in (1, 8):
+        return None
+    if bits == 1 and components != 1:
+        return None
+
+    width, height = image["/Width"], image["/Height"]
+    scale = 1.0
+    if target_dpi and entry["width_in"] > 0 and entry["height_in"] > 0:
+        dpi = min(width / entry["width_in"], height / entry["height_in"])
+        if dpi > target_dpi:
+            scale = target_dpi / dpi
+
+    return {
+        "data": image._data,
+        "filters": filters,
+        "parms": parms,
+        "width": width,
+        "height": height,
+        "bits": bits,
+        "components": components,
+        "scale": scale,
+        "quality": quality,
+        "compression": compression,
+    }
+
+
+def _decode(job):
+    """Decodeer de stream data van een job naar een PIL afbeelding"""
+    filters, parms = job["filters"], job["parms"]
+    image_filter = filters[-1] if filters and filters[-1] in IMAGE_FILTERS else None
+    if image_filter:
+        filters, parms = filters[:-1], parms[:-1]
+
+    data = job["data"]
+    if filters:
+        stream = EncodedStreamObject()
+        stream._data = data
+        stream[NameObject("/Filter")] = ArrayObject(NameObject(name) for name in filters)
+        stream[NameObject("/DecodeParms")] = ArrayObject(
+            DictionaryObject({NameObject(key): value for key, value in parm.items()}) for parm in parms
+        )
+        stream[NameObject("/Width")] = NumberObject(job["width"])
+        data = stream.get_data()
+
+    if image_filter:
+        image = Image.open(BytesIO(data))
+        image.load()
+        return image
+    if job["bits"] == 1:
+        return Image.frombytes("1", (job["width"], job["height"]), data)
+    mode = {1: "L", 3: "RGB", 4: "CMYK"}[job["components"]]
+    return Image.frombytes(mode, (job["width"], job["height"]), data)
+
+
+def _encode_g4(image):
+    """CCITT Group 4 compressie via libtiff, of None als dat niet beschikbaar is"""
+    buffer = BytesIO()
+    try:
+        image.save(buffer, "TIFF", compression="group4", strip_size=2 ** 31)
+    except (OSError, ValueError):
+        return None
+    tiff = Image.open(buffer)
+    offsets, counts = tiff.tag_v2[273], tiff.tag_v2[279]
+    if len(offsets) != 1:
+        return None
+    data = buffer.getvalue()[offsets[0]:offsets[0] + counts[0]]
+    parms = {"/K": -1, "/Columns": image.width, "/Rows": image.height}
+    # libtiff codeert 0 bits als wit; bij BlackIsZero zijn de 0 bits zwart
+    if tiff.tag_v2.get(262) == 1:
+        parms["/BlackIs1"] = True
+    return data, parms
+
+
+def optimize_image(job):
+    """Downsample en hercomprimeer één afbeelding (draait in een worker proces)"""
+    start = time.time()
+    image = _decode(job)
+    source_is_image = job["filters"][-1:] in (["/DCTDecode"], ["/JPXDecode"])
+    if source_is_image and job["scale"] >= 1:
+        # Al gecomprimeerd en niet te groot: hercompressie kost alleen kwaliteit
+        return None
+
+    if image.mode not in MODE_COLORSPACES:
+        image = image.convert("RGB")
+    if job["scale"] < 1:
+        size = (max(1, round(image.width * job["scale"])), max(1, round(image.height * job["scale"])))
+        if image.mode == "1":
+            image = image.convert("L").resize(size, Image.LANCZOS).point(lambda value: 255 if value >= 128 else 0, "1")
+        else:
+            image = image.resize(size, Image.LANCZOS)
+
+    parms = None
+    if image.mode == "1":
+        encoded = _encode_g4(image)
+        if encoded:
+            data, parms = encoded
+            image_filter, bits = "/CCITTFaxDecode", 1
+        else:
+            data, image_filter, bits = zlib.compress(image.tobytes(), 9), "/FlateDecode", 1
+    elif job["compression"] == "jpeg" and image.mode in ("L", "RGB"):
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", quality=job["quality"], optimize=True)
+        data, image_filter, bits = buffer.getvalue(), "/DCTDecode", 8
+    else:
+        data, image_filter, bits = zlib.compress(image.tobytes(), 9), "/FlateDecode", 8
+
+    if len(data) >= len(job["data"]):
+        return None
+    return {
+        "data": data,
+        "filter": image_filter,
+        "parms": parms,
+        "width": image.width,
+        "height": image.height,
+        "bits": bits,
+        "colorspace": MODE_COLORSPACES[image.mode],
+        "components": len(image.getbands()),
+        "seconds": time.time() - start,
+    }
+
+
+def _replacement(image, result):
+    """Bouw een nieuw image XObject met de hergecomprimeerde data"""
+    stream = EncodedStreamObject()
+    stream._data = result["data"]
+    for key, value in image.items():
+        if key not in REWRITTEN_KEYS:
+            stream[NameObject(key)] = value
+    stream[NameObject("/Filter")] = NameObject(result["filter"])
+    if result["parms"]:
+        parms = DictionaryObject()
+        for key, value in result["parms"].items():
+            parms[NameObject(key)] = BooleanObject(value) if isinstance(value, bool) else NumberObject(value)
+        stream[NameObject("/DecodeParms")] = parms
+    stream[NameObject("/Width")] = NumberObject(result["width"])
+    stream[NameObject("/Height")] = NumberObject(result["height"])
+    stream[NameObject("/BitsPerComponent")] = NumberObject(result["bits"])
+    colorspace = image.get("/ColorSpace")
+    if isinstance(colorspace, ArrayObject) and colorspace[0] == "/ICCBased":
+        components = colorspace[1].get_object().get("/N")
+    else:
+        components = COLORSPACE_COMPONENTS.get(colorspace)
+    if components != result["components"]:
+        stream[NameObject("/ColorSpace")] = NameObject(result["colorspace"])
+    return stream
+
+
+def optimize_pdf(input_path, output_path, target_dpi=150, quality=75, compression="jpeg",
+                 workers=0, progress_callback=None):
+    """Downsample en hercomprimeer de afbeeldingen in een PDF
+
+    Afbeeldingen boven target_dpi (bepaald uit hun grootste weergave op de
+    pagina) worden verkleind; kleur en grijs worden JPEG (compression "jpeg")
+    of Flate, zwart-wit wordt CCITT Group 4. Het werk gebeurt in een pool van
+    worker processen en het document wordt daarna object voor object
+    weggeschreven. progress_callback(klaar, totaal) volgt de afbeeldingen.
+    Afbeeldingen die niet gedecodeerd kunnen worden blijven ongewijzigd en
+    staan in images_failed van het rapport.
+    """
+    start_time = time.time()
+    size_before = os.path.getsize(input_path)
+    temp_path = output_path + ".tmp"
+
+    with open(input_path, "rb") as source:
+        reader = PdfReader(source)
+        if reader.is_encrypted:
+            raise ValueError("Versleutelde PDF's kunnen niet worden geoptimaliseerd")
+
+        jobs = {}
+        usage = find_images(reader)
+        for key, entry in usage.items():
+            job = _image_job(entry["reference"].get_object(), entry, target_dpi, quality, compression)
+            if job:
+                jobs[key] = job
+
+        copier = ObjectCopier(1, keep_page_tree=True)
+        report = []
+        failed = []
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(jobs) or 1))) as executor:
+            futures = {executor.submit(optimize_image, job): key for key, job in jobs.items()}
+            for done, future in enumerate(as_completed(futures), 1):
+                key = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Niet te decoderen (corrupte data, JPX zonder openjpeg, ...): origineel laten staan
+                    result = None
+                    failed.append({
+                        "page": usage[key]["page"],
+                        "name": usage[key]["name"],
+                        "error": f"{type(e).__name__}: {e}",
+                    })
+                if result:
+                    image = usage[key]["reference"].get_object()
+                    copier.replacements[key] = _replacement(image, result)
+                    report.append({
+                        "page": usage[key]["page"],
+                        "name": usage[key]["name"],
+                        "size_before": len(jobs[key]["data"]),
+                        "size_after": len(result["data"]),
+                        "pixels_before": (jobs[key]["width"], jobs[key]["height"]),
+                        "pixels_after": (result["width"], result["height"]),
+                        "filter": result["filter"],
+                        "seconds": result["seconds"],
+                    })
+                # Alleen de nieuwe (kleinere) data vasthouden
+                jobs[key]["data"] = b""
+                if progress_callback:
+                    progress_callback(done, len(futures))
+
+        trailer = DictionaryObject()
+        trailer[NameObject("/Root")] = copier.reference(reader.trailer.raw_get("/Root"))
+        if "/Info" in reader.trailer:
+            trailer[NameObject("/Info")] = copier.reference(reader.trailer.raw_get("/Info"))
+        if "/ID" in reader.trailer:
+            trailer[NameObject("/ID")] = reader.trailer["/ID"]
+
+        try:
+            with open(temp_path, "wb") as handle:
+                handle.write(f"%PDF-{reader.pdf_header[5:8]}\n%\xe2\xe3\xcf\xd3\n".encode("latin-1"))
+                offsets = {}
+                copier.write_pending(handle, offsets)
+                trailer[NameObject("/Size")] = NumberObject(copier.next_number)
+                entries = {number: (offset, 0) for number, offset in offsets.items()}
+                entries[0] = (0, 65535)
+                write_xref_table(handle, entries, trailer)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    os.replace(temp_path, output_path)
+    report.sort(key=lambda item: item["size_before"] - item["size_after"], reverse=True)
+    return {
+        "images_found": len(usage),
+        "images_optimized": len(report),
+        "images": report,
+        "images_failed": failed,
+        "size_before": size_before,
+        "size_after": os.path.getsize(output_path),
+        "seconds": time.time() - start_time,
+    }
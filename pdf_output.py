@@ -0,0 +1,884 @@
+"""
+MakkelijkPdf - PDF Output Hulpmiddelen
+"""
+
+import hashlib
+import os
+import time
+import zlib
+from collections import deque
+from io import BytesIO
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (
+    ArrayObject,
+    ByteStringObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    EncodedStreamObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    NumberObject,
+    StreamObject,
+)
+
+# Pagina attributen die via de page tree overgeërfd kunnen worden
+INHERITABLE_PAGE_KEYS = ["/Resources", "/MediaBox", "/CropBox", "/Rotate"]
+
+# Maximaal aantal objecten per object stream
+OBJECT_STREAM_SIZE = 100
+
+
+def find_startxref(handle):
+    """Zoek de offset van de laatste xref sectie aan het einde van een PDF"""
+    handle.seek(0, os.SEEK_END)
+    size = handle.tell()
+    handle.seek(max(0, size - 2048))
+    tail = handle.read()
+    position = tail.rfind(b"startxref")
+    if position == -1:
+        raise ValueError("Geen startxref gevonden, is dit een geldige PDF?")
+    return int(tail[position + 9:].split()[0])
+
+
+def uses_xref_stream(handle, offset):
+    """Controleer of de xref sectie op offset een cross-reference stream is"""
+    handle.seek(offset)
+    return not handle.read(32).lstrip().startswith(b"xref")
+
+
+def next_object_number(reader):
+    """Eerste vrije object nummer van een geopende PDF"""
+    highest = 0
+    for entries in reader.xref.values():
+        if entries:
+            highest = max(highest, max(entries))
+    if reader.xref_objStm:
+        highest = max(highest, max(reader.xref_objStm))
+    size = reader.trailer.get("/Size", 0)
+    return max(int(size), highest + 1)
+
+
+def write_object(handle, number, obj, generation=0):
+    """Schrijf één indirect object en geef de offset terug"""
+    offset = handle.tell()
+    handle.write(f"{number} {generation} obj\n".encode("ascii"))
+    obj.write_to_stream(handle, None)
+    handle.write(b"\nendobj\n")
+    return offset
+
+
+def _xref_subsections(entries):
+    """Groepeer xref entries in aaneengesloten subsecties"""
+    numbers = sorted(entries)
+    sections = []
+    for number in numbers:
+        if sections and sections[-1][0] + len(sections[-1][1]) == number:
+            sections[-1][1].append(number)
+        else:
+            sections.append((number, [number]))
+    return sections
+
+
+def write_xref_table(handle, entries, trailer):
+    """Schrijf een klassieke xref tabel met trailer
+
+    entries: {object nummer: (offset, generatie)}, object 0 wordt als vrij
+    (head van de free list) geschreven
+    """
+    xref_offset = handle.tell()
+    handle.write(b"xref\n")
+    for first, numbers in _xref_subsections(entries):
+        handle.write(f"{first} {len(numbers)}\n".encode("ascii"))
+        for number in numbers:
+            offset, generation = entries[number]
+            kind = "f" if number == 0 else "n"
+            handle.write(f"{offset:010d} {generation:05d} {kind}\r\n".encode("ascii"))
+    handle.write(b"trailer\n")
+    trailer.write_to_stream(handle, None)
+    handle.write(f"\nstartxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+    return xref_offset
+
+
+def write_xref_stream(handle, entries, trailer, number):
+    """Schrijf een (gecomprimeerde) cross-reference stream met trailer gegevens
+
+    entries: {object nummer: (type, veld2, veld3)} volgens PDF 1.5 tabel 18
+    """
+    xref_offset = handle.tell()
+    entries = dict(entries)
+    entries[number] = (1, xref_offset, 0)
+
+    widest = max(value[1] for value in entries.values())
+    field_width = max(1, (widest.bit_length() + 7) // 8)
+    index = ArrayObject()
+    rows = bytearray()
+    for first, numbers in _xref_subsections(entries):
+        index.extend([NumberObject(first), NumberObject(len(numbers))])
+        for object_number in numbers:
+            kind, second, third = entries[object_number]
+            rows += bytes([kind])
+            rows += second.to_bytes(field_width, "big")
+            rows += third.to_bytes(2, "big")
+
+    stream = EncodedStreamObject()
+    for key, value in trailer.items():
+        stream[NameObject(key)] = value
+    stream[NameObject("/Type")] = NameObject("/XRef")
+    stream[NameObject("/W")] = ArrayObject([NumberObject(1), NumberObject(field_width), NumberObject(2)])
+    stream[NameObject("/Index")] = index
+    stream[NameObject("/Filter")] = NameObject("/FlateDecode")
+    stream._data = zlib.compress(bytes(rows))
+    write_object(handle, number, stream)
+    handle.write(f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+    return xref_offset
+
+
+def inherited_attributes(page):
+    """Attributen die een pagina via de page tree erft maar zelf niet heeft"""
+    inherited = {}
+    for key in INHERITABLE_PAGE_KEYS:
+        if key in page:
+            continue
+        node = page.get("/Parent")
+        while node is not None:
+            node = node.get_object()
+            if key in node:
+                inherited[key] = node.raw_get(key)
+                break
+            node = node.get("/Parent")
+    return inherited
+
+
+class ObjectCopier:
+    """Kopieer objecten uit bron PDF's naar nieuwe object nummers"""
+
+    def __init__(self, first_number, keep_page_tree=False):
+        self.next_number = first_number
+        self.keep_page_tree = keep_page_tree
+        self.mapping = {}
+        self.pending = deque()
+        self.pages = {}
+        # Vervangende objecten per (idnum, generatie) van de bron
+        self.replacements = {}
+
+    def allocate(self):
+        """Reserveer een nieuw object nummer"""
+        number = self.next_number
+        self.next_number += 1
+        return number
+
+    def add_page(self, page, parent):
+        """Registreer een pagina die onder parent gehangen moet worden"""
+        reference = page.indirect_reference
+        key = (id(reference.pdf), reference.idnum, reference.generation)
+        number = self.allocate()
+        self.mapping[key] = number
+        self.pages[key] = parent
+        self.pending.append((number, reference))
+        return IndirectObject(number, 0, None)
+
+    def reference(self, reference):
+        """Vertaal een bron referentie naar een nieuw object nummer"""
+        key = (id(reference.pdf), reference.idnum, reference.generation)
+        if key not in self.mapping:
+            # Verwijzingen naar de oude page tree en niet meegekopieerde pagina's niet meenemen
+            if not self.keep_page_tree:
+                target = reference.get_object()
+                if isinstance(target, DictionaryObject) and target.get("/Type") in ("/Pages", "/Page"):
+                    return NullObject()
+            self.mapping[key] = self.allocate()
+            self.pending.append((self.mapping[key], reference))
+        return IndirectObject(self.mapping[key], 0, None)
+
+    def clone(self, obj):
+        """Kopieer een direct object met vertaalde referenties"""
+        if isinstance(obj, IndirectObject):
+            return self.reference(obj)
+        if isinstance(obj, StreamObject):
+            copy = obj.__class__()
+            copy._data = obj._data
+            for key, value in obj.items():
+                if key != "/Length":
+                    copy[NameObject(key)] = self.clone(value)
+            return copy
+        if isinstance(obj, DictionaryObject):
+            copy = DictionaryObject()
+            for key, value in obj.items():
+                copy[NameObject(key)] = self.clone(value)
+            return copy
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self.clone(value) for value in obj)
+        return obj
+
+    def clone_page(self, page, parent):
+        """Kopieer een pagina inclusief overgeërfde attributen"""
+        copy = DictionaryObject()
+        for key, value in page.items():
+            if key != "/Parent":
+                copy[NameObject(key)] = self.clone(value)
+        for key, value in inherited_attributes(page).items():
+            copy[NameObject(key)] = self.clone(value)
+        copy[NameObject("/Parent")] = parent
+        return copy
+
+    def next_pending(self):
+        """Haal het volgende openstaande object op als (nummer, kopie)"""
+        number, reference = self.pending.popleft()
+        key = (id(reference.pdf), reference.idnum, reference.generation)
+        source = self.replacements.get(key[1:]) or reference.get_object()
+        if key in self.pages:
+            return number, self.clone_page(source, self.pages[key])
+        return number, self.clone(source)
+
+    def write_pending(self, handle, offsets):
+        """Schrijf alle openstaande objecten (streaming, één voor één)"""
+        while self.pending:
+            number, obj = self.next_pending()
+            offsets[number] = write_object(handle, number, obj)
+
+
+class ObjectStreamPacker:
+    """Verzamel niet-stream objecten en schrijf ze als gecomprimeerde object streams"""
+
+    def __init__(self, handle, copier, entries, size=OBJECT_STREAM_SIZE):
+        self.handle = handle
+        self.copier = copier
+        self.entries = entries
+        self.size = size
+        self.batch = []
+        self.streams_written = 0
+
+    def add(self, number, obj):
+        """Voeg een object toe aan de huidige object stream"""
+        self.batch.append((number, obj))
+        if len(self.batch) >= self.size:
+            self.flush()
+
+    def flush(self):
+        """Schrijf de huidige batch als één object stream"""
+        if not self.batch:
+            return
+        stream_number = self.copier.allocate()
+        header = []
+        body = BytesIO()
+        for index, (number, obj) in enumerate(self.batch):
+            header.append(f"{number} {body.tell()}")
+            obj.write_to_stream(body, None)
+            body.write(b"\n")
+            self.entries[number] = (2, stream_number, index)
+        header_bytes = " ".join(header).encode("ascii") + b"\n"
+
+        stream = EncodedStreamObject()
+        stream[NameObject("/Type")] = NameObject("/ObjStm")
+        stream[NameObject("/N")] = NumberObject(len(self.batch))
+        stream[NameObject("/First")] = NumberObject(len(header_bytes))
+        stream[NameObject("/Filter")] = NameObject("/FlateDecode")
+        stream._data = zlib.compress(header_bytes + body.getvalue())
+        self.entries[stream_number] = (1, write_object(self.handle, stream_number, stream), 0)
+        self.streams_written += 1
+        self.batch = []
+
+
+def compress_stream(stream):
+    """Flate-comprimeer een stream zonder filter als dat kleiner uitvalt"""
+    if "/Filter" in stream or not stream._data:
+        return False
+    compressed = zlib.compress(stream._data, 9)
+    if len(compressed) >= len(stream._data):
+        return False
+    stream._data = compressed
+    stream[NameObject("/Filter")] = NameObject("/FlateDecode")
+    return True
+
+
+def compact_pdf(input_path, output_path=None):
+    """Herschrijf een PDF met object streams, een xref stream en Flate compressie
+
+    Niet-stream objecten worden in gecomprimeerde object streams gebundeld,
+    ongecomprimeerde streams krijgen een FlateDecode filter en de klassieke
+    xref tabel wordt vervangen door een cross-reference stream (PDF 1.5).
+    Zonder output_path wordt het bestand ter plekke vervangen.
+    """
+    target = output_path or input_path
+    temp_path = target + ".tmp"
+    size_before = os.path.getsize(input_path)
+
+    with open(input_path, "rb") as source:
+        reader = PdfReader(source)
+        if reader.is_encrypted:
+            raise ValueError("Versleutelde PDF's kunnen niet worden gecomprimeerd")
+
+        copier = ObjectCopier(1, keep_page_tree=True)
+        trailer = DictionaryObject()
+        trailer[NameObject("/Root")] = copier.reference(reader.trailer.raw_get("/Root"))
+        if "/Info" in reader.trailer:
+            trailer[NameObject("/Info")] = copier.reference(reader.trailer.raw_get("/Info"))
+        if "/ID" in reader.trailer:
+            trailer[NameObject("/ID")] = reader.trailer["/ID"]
+
+        version = max(reader.pdf_header[5:8], "1.5")
+        try:
+            with open(temp_path, "wb") as handle:
+                handle.write(f"%PDF-{version}\n%\xe2\xe3\xcf\xd3\n".encode("latin-1"))
+                entries = {}
+                packer = ObjectStreamPacker(handle, copier, entries)
+                streams_compressed = 0
+                while copier.pending:
+                    number, obj = copier.next_pending()
+                    if isinstance(obj, StreamObject):
+                        if compress_stream(obj):
+                            streams_compressed += 1
+                        entries[number] = (1, write_object(handle, number, obj), 0)
+                    else:
+                        packer.add(number, obj)
+                packer.flush()
+
+                xref_number = copier.allocate()
+                trailer[NameObject("/Size")] = NumberObject(copier.next_number)
+                write_xref_stream(handle, entries, trailer, xref_number)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    os.replace(temp_path, target)
+    return {
+        "objects_written": len(entries),
+        "object_streams": packer.streams_written,
+        "streams_compressed": streams_compressed,
+        "size_before": size_before,
+        "size_after": os.path.getsize(target),
+    }
+
+
+def append_pages_incremental(master_path, input_paths):
+    """Voeg pagina's toe aan een bestaande PDF via een incremental update
+
+    Alleen de nieuwe objecten, de aangepaste page tree root, een nieuwe xref
+    sectie en trailer worden achteraan het bestand geschreven. De bestaande
+    inhoud wordt niet herschreven. Bladwijzers en formulieren van de
+    toegevoegde PDF's worden niet overgenomen.
+    """
+    with open(master_path, "rb+") as handle:
+        master = PdfReader(handle)
+        if master.is_encrypted:
+            raise ValueError("Versleutelde PDF's kunnen niet incrementeel worden aangevuld")
+
+        prev_xref = find_startxref(handle)
+        xref_stream = uses_xref_stream(handle, prev_xref)
+
+        root = master.trailer["/Root"].get_object()
+        pages_ref = root.raw_get("/Pages")
+        pages_root = pages_ref.get_object()
+
+        # Lees alles wat van de master nodig is voordat er geschreven wordt
+        kids = list(pages_root["/Kids"])
+        count = int(pages_root["/Count"])
+
+        copier = ObjectCopier(next_object_number(master))
+        parent = IndirectObject(pages_ref.idnum, pages_ref.generation, None)
+        new_kids = []
+        sources = []
+        try:
+            for path in input_paths:
+                source = open(path, "rb")
+                sources.append(source)
+                reader = PdfReader(source)
+                if reader.is_encrypted:
+                    raise ValueError(f"Versleutelde PDF kan niet worden toegevoegd: {os.path.basename(path)}")
+                for page in reader.pages:
+                    new_kids.append(copier.add_page(page, parent))
+
+            handle.seek(-1, os.SEEK_END)
+            if handle.read(1) not in b"\r\n":
+                handle.seek(0, os.SEEK_END)
+                handle.write(b"\n")
+            handle.seek(0, os.SEEK_END)
+            start = handle.tell()
+
+            offsets = {}
+            copier.write_pending(handle, offsets)
+
+            # Herschrijf de page tree root met de nieuwe pagina's erbij
+            updated_root = DictionaryObject(pages_root)
+            updated_root[NameObject("/Kids")] = ArrayObject(kids + new_kids)
+            updated_root[NameObject("/Count")] = NumberObject(count + len(new_kids))
+            pages_offset = write_object(handle, pages_ref.idnum, updated_root, pages_ref.generation)
+
+            trailer = DictionaryObject()
+            trailer[NameObject("/Root")] = master.trailer.raw_get("/Root")
+            for key in ("/Info", "/ID"):
+                if key in master.trailer:
+                    trailer[NameObject(key)] = master.trailer.raw_get(key)
+            trailer[NameObject("/Prev")] = NumberObject(prev_xref)
+
+            if xref_stream:
+                xref_number = copier.allocate()
+                trailer[NameObject("/Size")] = NumberObject(copier.next_number)
+                entries = {number: (1, offset, 0) for number, offset in offsets.items()}
+                entries[pages_ref.idnum] = (1, pages_offset, pages_ref.generation)
+                write_xref_stream(handle, entries, trailer, xref_number)
+            else:
+                trailer[NameObject("/Size")] = NumberObject(copier.next_number)
+                entries = {number: (offset, 0) for number, offset in offsets.items()}
+                entries[pages_ref.idnum] = (pages_offset, pages_ref.generation)
+                write_xref_table(handle, entries, trailer)
+
+            bytes_written = handle.tell() - start
+        finally:
+            for source in sources:
+                source.close()
+
+    return {
+        "pages_added": len(new_kids),
+        "objects_written": len(offsets) + 1,
+        "bytes_written": bytes_written,
+    }
+
+
+class BitWriter:
+    """Schrijf getallen met een vast aantal bits (voor hint tabellen)"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.buffer = 0
+        self.buffered_bits = 0
+
+    def write(self, value, bits):
+        """Schrijf value in precies bits bits (big-endian)"""
+        if bits == 0:
+            return
+        self.buffer = (self.buffer << bits) | value
+        self.buffered_bits += bits
+        while self.buffered_bits >= 8:
+            self.buffered_bits -= 8
+            self.data.append((self.buffer >> self.buffered_bits) & 0xFF)
+        self.buffer &= (1 << self.buffered_bits) - 1
+
+    def write_items(self, values, bits):
+        """Schrijf een reeks waarden en lijn daarna uit op een byte grens"""
+        for value in values:
+            self.write(value, bits)
+        self.flush()
+
+    def flush(self):
+        """Vul aan tot een volledige byte"""
+        if self.buffered_bits:
+            self.write(0, 8 - self.buffered_bits)
+
+    def getvalue(self):
+        """Geef de geschreven bytes terug"""
+        self.flush()
+        return bytes(self.data)
+
+
+def _references(obj):
+    """Alle indirecte verwijzingen in een direct object (zelfde regels als ObjectCopier)"""
+    found = []
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, IndirectObject):
+            found.append(item)
+        elif isinstance(item, DictionaryObject):
+            for key, value in reversed(list(item.items())):
+                if key == "/Length" and isinstance(item, StreamObject):
+                    continue
+                stack.append(value)
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+    return found
+
+
+def _reference_key(reference):
+    return (id(reference.pdf), reference.idnum, reference.generation)
+
+
+def page_references(page):
+    """Directe verwijzingen van een pagina, inclusief overgeërfde attributen"""
+    roots = [value for key, value in page.items() if key != "/Parent"]
+    roots += list(inherited_attributes(page).values())
+    return _references(roots)
+
+
+def reachable_objects(roots, page_keys, seen=None):
+    """Alle objecten bereikbaar vanaf roots, zonder pagina's en page tree
+
+    Geeft de verwijzingen terug in de volgorde waarin ze gevonden worden.
+    page_keys bevat de sleutels van pagina's waar niet in afgedaald wordt.
+    """
+    order = []
+    seen = set() if seen is None else seen
+    stack = list(reversed(roots))
+    while stack:
+        reference = stack.pop()
+        key = _reference_key(reference)
+        if key in seen or key in page_keys:
+            continue
+        obj = reference.get_object()
+        if isinstance(obj, DictionaryObject) and obj.get("/Type") in ("/Pages", "/Page"):
+            continue
+        seen.add(key)
+        order.append(reference)
+        stack.extend(reversed(_references(obj)))
+    return order
+
+
+def _copy_range(source, target, start, length):
+    """Kopieer een deel van een bestand in blokken"""
+    source.seek(start)
+    while length > 0:
+        chunk = source.read(min(length, 1024 * 1024))
+        if not chunk:
+            break
+        target.write(chunk)
+        length -= len(chunk)
+
+
+def _serialize(obj):
+    buffer = BytesIO()
+    obj.write_to_stream(buffer, None)
+    return buffer.getvalue()
+
+
+def _reserve(text, size):
+    """Vul tekst aan met spaties zodat gereserveerde ruimte exact gevuld wordt"""
+    if len(text) > size:
+        raise ValueError("Gereserveerde ruimte voor linearisatie gegevens te klein")
+    return text + b" " * (size - len(text))
+
+
+def linearize_pdf(input_path, output_path=None):
+    """Schrijf een gelineariseerde ("fast web view") versie van een PDF
+
+    De eerste pagina met alle objecten die ze nodig heeft staat vooraan in
+    het bestand, gevolgd door een hint stream (page offset en shared object
+    hint tabellen), zodat viewers pagina 1 kunnen tonen na het ophalen van
+    alleen het begin van het bestand. Overgeërfde pagina attributen worden
+    naar de pagina's zelf gekopieerd en de page tree wordt plat opgebouwd.
+    Zonder output_path wordt het bestand ter plekke vervangen.
+    """
+    target = output_path or input_path
+    temp_path = target + ".tmp"
+    body_path = target + ".body"
+    size_before = os.path.getsize(input_path)
+    shared = -1
+
+    with open(input_path, "rb") as source:
+        reader = PdfReader(source)
+        if reader.is_encrypted:
+            raise ValueError("Versleutelde PDF's kunnen niet worden gelineariseerd")
+        pages = reader.pages
+        if len(pages) == 0:
+            raise ValueError("PDF bevat geen pagina's")
+
+        page_refs = [page.indirect_reference for page in pages]
+        page_index = {_reference_key(ref): index for index, ref in enumerate(page_refs)}
+
+        # Bepaal per object welke pagina('s) het gebruiken
+        closures = []
+        owners = {}
+        for index, page in enumerate(pages):
+            references = reachable_objects(page_references(page), page_index)
+            closures.append(references)
+            for reference in references:
+                key = _reference_key(reference)
+                owners[key] = index if owners.get(key, index) == index else shared
+
+        first_page = [page_refs[0]] + closures[0]
+        first_page_keys = {_reference_key(ref) for ref in first_page}
+        page_sections = [first_page]
+        for index in range(1, len(pages)):
+            page_sections.append([page_refs[index]] + [
+                ref for ref in closures[index] if owners[_reference_key(ref)] == index
+            ])
+        shared_section = []
+        shared_seen = set()
+        for references in closures[1:]:
+            for reference in references:
+                key = _reference_key(reference)
+                if owners[key] == shared and key not in first_page_keys and key not in shared_seen:
+                    shared_seen.add(key)
+                    shared_section.append(reference)
+
+        catalog_ref = reader.trailer.raw_get("/Root")
+        catalog = catalog_ref.get_object()
+        other_roots = _references([value for key, value in catalog.items() if key != "/Pages"])
+        if "/Info" in reader.trailer:
+            other_roots.insert(0, reader.trailer.raw_get("/Info"))
+        assigned = set(owners) | {_reference_key(catalog_ref)}
+        other_section = reachable_objects(other_roots, page_index, seen=set(assigned))
+
+        # Nummering: hoofdsectie eerst (1..N-1), daarna de eerste-pagina sectie
+        copier = ObjectCopier(1)
+        numbers = {}
+
+        def assign(reference):
+            numbers[_reference_key(reference)] = copier.allocate()
+
+        for section in page_sections[1:]:
+            for reference in section:
+                assign(reference)
+        for reference in shared_section + other_section:
+            assign(reference)
+        pages_root_number = copier.allocate()
+        main_size = copier.next_number
+
+        linearization_number = copier.allocate()
+        numbers[_reference_key(catalog_ref)] = copier.allocate()
+        hint_number = copier.allocate()
+        for reference in first_page:
+            assign(reference)
+        total_size = copier.next_number
+
+        pages_root_ref = IndirectObject(pages_root_number, 0, None)
+        copier.mapping.update(numbers)
+        for reference in page_refs:
+            copier.pages[_reference_key(reference)] = pages_root_ref
+
+        def number_of(reference):
+            return numbers[_reference_key(reference)]
+
+        def clone(reference):
+            key = _reference_key(reference)
+            obj = reference.get_object()
+            if key in copier.pages:
+                return copier.clone_page(obj, copier.pages[key])
+            obj = copier.clone(obj)
+            if isinstance(obj, StreamObject):
+                compress_stream(obj)
+            return obj
+
+        offsets = {}
+        ends = {}
+        try:
+            with open(body_path, "wb+") as body:
+                def emit(number, obj):
+                    offsets[number] = write_object(body, number, obj)
+                    ends[number] = body.tell()
+
+                catalog_copy = copier.clone(catalog)
+                catalog_copy[NameObject("/Pages")] = pages_root_ref
+                emit(number_of(catalog_ref), catalog_copy)
+                catalog_end = body.tell()
+
+                for section in page_sections:
+                    for reference in section:
+                        emit(number_of(reference), clone(reference))
+                first_page_end = ends[number_of(first_page[-1])]
+
+                for reference in shared_section + other_section:
+                    emit(number_of(reference), clone(reference))
+
+                pages_root = DictionaryObject()
+                pages_root[NameObject("/Type")] = NameObject("/Pages")
+                pages_root[NameObject("/Kids")] = ArrayObject(
+                    IndirectObject(number_of(ref), 0, None) for ref in page_refs
+                )
+                pages_root[NameObject("/Count")] = NumberObject(len(page_refs))
+                emit(pages_root_number, pages_root)
+                body_length = body.tell()
+
+                if copier.pending:
+                    raise ValueError("Niet alle objecten konden worden ingedeeld voor linearisatie")
+
+                # Vaste delen vooraan: header, linearisatie dictionary en eerste-pagina xref
+                version = reader.pdf_header[5:8]
+                header = f"%PDF-{version}\n%\xe2\xe3\xcf\xd3\n".encode("latin-1")
+                first_page_number = number_of(page_refs[0])
+                linearization_size = len(
+                    f"{linearization_number} 0 obj\n<< /Linearized 1 /L {10 ** 12} /H [ {10 ** 12} {10 ** 12} ] "
+                    f"/O {first_page_number} /E {10 ** 12} /N {len(pages)} /T {10 ** 12} >>\nendobj\n"
+                )
+
+                trailer = DictionaryObject()
+                trailer[NameObject("/Size")] = NumberObject(total_size)
+                trailer[NameObject("/Root")] = IndirectObject(number_of(catalog_ref), 0, None)
+                if "/Info" in reader.trailer:
+                    trailer[NameObject("/Info")] = IndirectObject(
+                        number_of(reader.trailer.raw_get("/Info")), 0, None
+                    )
+                if "/ID" in reader.trailer:
+                    trailer[NameObject("/ID")] = reader.trailer["/ID"]
+                else:
+                    identifier = hashlib.md5(f"{input_path}{size_before}{time.time()}".encode("utf-8")).digest()
+                    trailer[NameObject("/ID")] = ArrayObject([ByteStringObject(identifier)] * 2)
+                trailer_text = _serialize(trailer)[:-2]
+                trailer_size = len(trailer_text) + len(f" /Prev {10 ** 12} >>")
+
+                first_count = total_size - linearization_number
+                first_xref_size = (
+                    len(f"xref\n{linearization_number} {first_count}\n") + 20 * first_count
+                    + len("trailer\n") + trailer_size + len("\nstartxref\n0\n%%EOF\n")
+                )
+                base = len(header) + linearization_size + first_xref_size
+
+                # Hint tabellen (offsets alsof de hint stream er niet staat)
+                page_lengths = []
+                page_objects = []
+                for index, section in enumerate(page_sections):
+                    start = catalog_end if index == 0 else offsets[number_of(section[0])]
+                    page_lengths.append(ends[number_of(section[-1])] - start)
+                    page_objects.append(len(section))
+
+                shared_ids = {_reference_key(ref): index for index, ref in enumerate(first_page)}
+                for index, reference in enumerate(shared_section):
+                    shared_ids[_reference_key(reference)] = len(first_page) + index
+                page_shared = [[]]
+                for references in closures[1:]:
+                    page_shared.append([
+                        shared_ids[_reference_key(ref)] for ref in references
+                        if owners[_reference_key(ref)] == shared
+                    ])
+
+                min_objects = min(page_objects)
+                min_length = min(page_lengths)
+                object_bits = (max(page_objects) - min_objects).bit_length()
+                length_bits = (max(page_lengths) - min_length).bit_length()
+                shared_count_bits = max(len(ids) for ids in page_shared).bit_length()
+                shared_id_bits = max([0] + [max(ids) for ids in page_shared if ids]).bit_length()
+
+                hints = BitWriter()
+                hints.write(min_objects, 32)
+                hints.write(base + catalog_end, 32)
+                hints.write(object_bits, 16)
+                hints.write(min_length, 32)
+                hints.write(length_bits, 16)
+                hints.write(0, 32)
+                hints.write(0, 16)
+                hints.write(min_length, 32)
+                hints.write(length_bits, 16)
+                hints.write(shared_count_bits, 16)
+                hints.write(shared_id_bits, 16)
+                hints.write(0, 16)
+                hints.write(4, 16)
+                hints.write_items([count - min_objects for count in page_objects], object_bits)
+                hints.write_items([length - min_length for length in page_lengths], length_bits)
+                hints.write_items([len(ids) for ids in page_shared], shared_count_bits)
+                hints.write_items([shared_id for ids in page_shared for shared_id in ids], shared_id_bits)
+                hints.write_items([0] * len(pages), 0)
+                hints.write_items([length - min_length for length in page_lengths], length_bits)
+                page_table = hints.getvalue()
+
+                groups = [ends[number_of(ref)] - offsets[number_of(ref)] for ref in first_page + shared_section]
+                min_group = min(groups)
+                group_bits = (max(groups) - min_group).bit_length()
+                hints = BitWriter()
+                if shared_section:
+                    hints.write(number_of(shared_section[0]), 32)
+                    hints.write(base + offsets[number_of(shared_section[0])], 32)
+                else:
+                    hints.write(first_page_number, 32)
+                    hints.write(base + catalog_end, 32)
+                hints.write(len(first_page), 32)
+                hints.write(len(groups), 32)
+                hints.write(0, 16)
+                hints.write(min_group, 32)
+                hints.write(group_bits, 16)
+                hints.write_items([length - min_group for length in groups], group_bits)
+                hints.write_items([0] * len(groups), 1)
+                shared_table = hints.getvalue()
+
+                hint_stream = DecodedStreamObject()
+                hint_stream[NameObject("/S")] = NumberObject(len(page_table))
+                hint_stream._data = page_table + shared_table
+                hint_buffer = BytesIO()
+                write_object(hint_buffer, hint_number, hint_stream)
+                hint_bytes = hint_buffer.getvalue()
+
+                def position(number):
+                    """Absolute positie van een object in het uiteindelijke bestand"""
+                    offset = base + offsets[number]
+                    return offset if offsets[number] < catalog_end else offset + len(hint_bytes)
+
+                main_xref_offset = base + len(hint_bytes) + body_length
+                main_xref = BytesIO()
+                main_xref.write(f"xref\n0 {main_size}\n".encode("ascii"))
+                main_xref.write(b"0000000000 65535 f\r\n")
+                for number in range(1, main_size):
+                    main_xref.write(f"{position(number):010d} 00000 n\r\n".encode("ascii"))
+                main_xref.write(f"trailer\n<< /Size {main_size} >>\n".encode("ascii"))
+                main_xref.write(f"startxref\n{len(header) + linearization_size}\n%%EOF\n".encode("ascii"))
+                main_xref_bytes = main_xref.getvalue()
+
+                file_length = main_xref_offset + len(main_xref_bytes)
+                linearization = _reserve(
+                    f"{linearization_number} 0 obj\n<< /Linearized 1 /L {file_length} "
+                    f"/H [ {base + catalog_end} {len(hint_bytes)} ] /O {first_page_number} "
+                    f"/E {base + len(hint_bytes) + first_page_end} /N {len(pages)} "
+                    f"/T {main_xref_offset + len(f'xref{chr(10)}0 {main_size}')} >>\nendobj\n".encode("ascii"),
+                    linearization_size,
+                )
+
+                first_xref = BytesIO()
+                first_xref.write(f"xref\n{linearization_number} {first_count}\n".encode("ascii"))
+                first_xref.write(f"{len(header):010d} 00000 n\r\n".encode("ascii"))
+                first_xref.write(f"{base:010d} 00000 n\r\n".encode("ascii"))
+                first_xref.write(f"{base + catalog_end:010d} 00000 n\r\n".encode("ascii"))
+                for number in range(hint_number + 1, total_size):
+                    first_xref.write(f"{position(number):010d} 00000 n\r\n".encode("ascii"))
+                first_xref.write(b"trailer\n")
+                first_xref.write(_reserve(trailer_text + f" /Prev {main_xref_offset} >>".encode("ascii"), trailer_size))
+                first_xref.write(b"\nstartxref\n0\n%%EOF\n")
+
+                with open(temp_path, "wb") as handle:
+                    handle.write(header)
+                    handle.write(linearization)
+                    handle.write(first_xref.getvalue())
+                    _copy_range(body, handle, 0, catalog_end)
+                    handle.write(hint_bytes)
+                    _copy_range(body, handle, catalog_end, body_length - catalog_end)
+                    handle.write(main_xref_bytes)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        finally:
+            if os.path.exists(body_path):
+                os.remove(body_path)
+
+    os.replace(temp_path, target)
+    return {
+        "pages": len(pages),
+        "first_page_bytes": base + len(hint_bytes) + first_page_end,
+        "size_before": size_before,
+        "size_after": os.path.getsize(target),
+    }
+
+
+def write_pages(pages, output_path):
+    """Schrijf pagina's uit een bron PDF als nieuwe, zelfstandige PDF
+
+    Objecten worden één voor één gekopieerd en direct weggeschreven, zodat
+    het geheugengebruik niet meegroeit met de grootte van de output.
+    """
+    copier = ObjectCopier(1)
+    pages_root_number = copier.allocate()
+    catalog_number = copier.allocate()
+    parent = IndirectObject(pages_root_number, 0, None)
+    kids = [copier.add_page(page, parent) for page in pages]
+
+    with open(output_path, "wb") as handle:
+        handle.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = {}
+        copier.write_pending(handle, offsets)
+
+        pages_root = DictionaryObject()
+        pages_root[NameObject("/Type")] = NameObject("/Pages")
+        pages_root[NameObject("/Kids")] = ArrayObject(kids)
+        pages_root[NameObject("/Count")] = NumberObject(len(kids))
+        offsets[pages_root_number] = write_object(handle, pages_root_number, pages_root)
+
+        catalog = DictionaryObject()
+        catalog[NameObject("/Type")] = NameObject("/Catalog")
+        catalog[NameObject("/Pages")] = parent
+        offsets[catalog_number] = write_object(handle, catalog_number, catalog)
+
+        trailer = DictionaryObject()
+        trailer[NameObject("/Size")] = NumberObject(copier.next_number)
+        trailer[NameObject("/Root")] = IndirectObject(catalog_number, 0, None)
+        entries = {number: (offset, 0) for number, offset in offsets.items()}
+        entries[0] = (0, 65535)
+        write_xref_table(handle, entries, trailer)
+        return handle.tell()
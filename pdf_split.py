@@ -0,0 +1,174 @@
+"""
+MakkelijkPdf - PDF Splitsen
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from PyPDF2 import PdfReader
+from PyPDF2.generic import StreamObject
+from pdf_output import page_references, reachable_objects, write_pages
+
+# Geparste reader per worker proces (bij fork overgeërfd van het hoofdproces)
+_reader = None
+_reader_path = None
+
+# Geschatte overhead per object bovenop de stream data (bytes)
+OBJECT_OVERHEAD = 64
+
+# Geschatte grootte van een pagina object met xref entry (bytes)
+PAGE_OVERHEAD = 192
+
+
+def _open_reader(path):
+    """Open de bron PDF één keer per proces"""
+    global _reader, _reader_path
+    if _reader is not None and _reader_path == path:
+        # Overgeërfd via fork: eigen file handle zodat processen elkaars
+        # leespositie niet verstoren, de geparste xref blijft gedeeld
+        _reader.stream = open(path, "rb")
+        return _reader
+    _reader = PdfReader(open(path, "rb"))
+    _reader_path = path
+    return _reader
+
+
+def _write_part(start, end, output_path):
+    """Schrijf pagina's start..end-1 van de gedeelde reader naar output_path"""
+    pages = _reader.pages[start:end]
+    size = write_pages(pages, output_path)
+    # Cache leegmaken zodat het geheugen per worker begrensd blijft
+    _reader.resolved_objects.clear()
+    return output_path, end - start, size
+
+
+def _safe_name(title):
+    """Maak een bladwijzer titel geschikt als bestandsnaam"""
+    name = re.sub(r'[\\/:*?"<>|\s]+', "_", str(title)).strip("_")
+    return name[:60] or "deel"
+
+
+def _estimate_page_sizes(reader):
+    """Schat per pagina welke objecten nodig zijn en hoe groot die zijn"""
+    page_keys = {}
+    for index, page in enumerate(reader.pages):
+        reference = page.indirect_reference
+        page_keys[(id(reference.pdf), reference.idnum, reference.generation)] = index
+
+    sizes = {}
+    for page in reader.pages:
+        objects = {}
+        for reference in reachable_objects(page_references(page), page_keys):
+            obj = reference.get_object()
+            length = OBJECT_OVERHEAD
+            if isinstance(obj, StreamObject) and obj._data:
+                length += len(obj._data)
+            objects[(reference.idnum, reference.generation)] = length
+        sizes[len(sizes)] = objects
+        reader.resolved_objects.clear()
+    return sizes
+
+
+def plan_split(reader, method="pages", pages_per_part=100, max_bytes=10 * 1024 * 1024):
+    """Bepaal de delen als lijst van (start, einde, naam)
+
+    method: "pages" (vast aantal pagina's), "size" (maximale grootte per deel,
+    gedeelde objecten tellen één keer per deel) of "bookmarks" (een deel per
+    bladwijzer op het hoogste niveau).
+    """
+    total = len(reader.pages)
+    parts = []
+
+    if method == "bookmarks":
+        starts = []
+        for item in reader.outline:
+            if isinstance(item, list):
+                continue
+            try:
+                starts.append((reader.get_destination_page_number(item), item.title))
+            except Exception:
+                continue
+        starts = sorted(set(starts))
+        if not starts or starts[0][0] != 0:
+            starts.insert(0, (0, "begin"))
+        for index, (start, title) in enumerate(starts):
+            end = starts[index + 1][0] if index + 1 < len(starts) else total
+            if end > start:
+                parts.append((start, end, _safe_name(title)))
+
+    elif method == "size":
+        sizes = _estimate_page_sizes(reader)
+        start = 0
+        seen = {}
+        current = 0
+        for index in range(total):
+            # Het pagina object zelf plus de objecten die nog niet in dit deel zitten
+            extra = PAGE_OVERHEAD + sum(length for key, length in sizes[index].items() if key not in seen)
+            if index > start and current + extra > max_bytes:
+                parts.append((start, index, None))
+                start, seen, current = index, {}, 0
+                extra = PAGE_OVERHEAD + sum(sizes[index].values())
+            seen.update(sizes[index])
+            current += extra
+        if start < total:
+            parts.append((start, total, None))
+
+    else:
+        pages_per_part = max(1, int(pages_per_part))
+        for start in range(0, total, pages_per_part):
+            parts.append((start, min(start + pages_per_part, total), None))
+
+    return parts
+
+
+def split_pdf(input_path, output_folder, method="pages", pages_per_part=100,
+              max_bytes=10 * 1024 * 1024, workers=0, progress_callback=None):
+    """Splits een PDF in delen, geschreven door parallelle worker processen
+
+    De bron wordt één keer geopend en geparst; worker processen delen die
+    reader (via fork) of openen hem één keer per proces. Elk deel wordt
+    streaming weggeschreven. progress_callback(klaar, totaal) wordt na elk
+    deel aangeroepen. Geeft een lijst van (pad, pagina's, bytes) terug.
+    """
+    global _reader, _reader_path
+    reader = _open_reader(os.path.abspath(input_path))
+    if reader.is_encrypted:
+        raise ValueError("Versleutelde PDF's kunnen niet worden gesplitst")
+
+    parts = plan_split(reader, method, pages_per_part, max_bytes)
+    stem = Path(input_path).stem
+    os.makedirs(output_folder, exist_ok=True)
+
+    jobs = []
+    for index, (start, end, name) in enumerate(parts):
+        if name:
+            filename = f"{stem}_{index + 1:03d}_{name}.pdf"
+        else:
+            filename = f"{stem}_deel_{index + 1:03d}.pdf"
+        jobs.append((start, end, os.path.join(output_folder, filename)))
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    results = []
+    try:
+        if workers == 1:
+            for job in jobs:
+                results.append(_write_part(*job))
+                if progress_callback:
+                    progress_callback(len(results), len(jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_open_reader,
+                                     initargs=(_reader_path,)) as executor:
+                futures = [executor.submit(_write_part, *job) for job in jobs]
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    if progress_callback:
+                        progress_callback(len(results), len(jobs))
+    finally:
+        reader.stream.close()
+        _reader = None
+        _reader_path = None
+
+    results.sort()
+    return results
@@ -0,0 +1,30 @@
+"""
+MakkelijkPdf - Poppler Locatie
+"""
+
+import os
+import platform
+
+# Voeg poppler pad toe aan PATH (cross-platform)
+if platform.system() == "Windows":
+    poppler_path = r"C:\poppler\poppler-23.08.0\Library\bin"
+elif platform.system() == "Darwin":  # macOS
+    poppler_path = "/opt/homebrew/bin"  # Homebrew ARM
+    if not os.path.exists(poppler_path):
+        poppler_path = "/usr/local/bin"  # Homebrew Intel
+elif platform.system() == "Linux":
+    poppler_path = "/usr/bin"  # System poppler
+else:
+    poppler_path = ""
+
+if poppler_path and poppler_path not in os.environ["PATH"]:
+    os.environ["PATH"] = poppler_path + os.pathsep + os.environ["PATH"]
+
+
+def poppler_command(command):
+    """Volledig pad naar een poppler programma (pdftoppm, pdftocairo, ...)"""
+    if platform.system() == "Windows":
+        command += ".exe"
+    if poppler_path and os.path.exists(os.path.join(poppler_path, command)):
+        return os.path.join(poppler_path, command)
+    return command
@@ -0,0 +1,283 @@
+"""
+MakkelijkPdf - Render Backends (pdftoppm, pdftocairo, PyMuPDF)
+
+Elke backend rendert pagina's naar PIL afbeeldingen. Welke backend het
+snelst is hangt af van het soort document (scans, tekst, vector tekeningen),
+dus bij "auto" wordt per documentklasse en DPI bereik één keer gemeten
+welke beschikbare backend de eerste pagina op de gevraagde DPI het snelst
+rendert.
+"""
+
+import hashlib
+import importlib.util
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from io import BytesIO
+import core
+from poppler import poppler_command
+
+# DPI voor de meting als de gevraagde DPI niet bekend is
+MEASURE_DPI = 72
+
+# Gemeten rondes per backend, na een opwarm ronde die niet telt
+MEASURE_ROUNDS = 2
+
+# DPI grenzen: boven elke grens wordt apart gemeten (thumbnails en pre-scans vs volle resolutie)
+DPI_BUCKETS = [100, 250]
+
+# Maximaal aantal onthouden documentklassen
+MAX_CLASSES = 1024
+
+
+class RenderBackend:
+    """Basis voor een render backend"""
+
+    name = ""
+
+    def available(self):
+        """Kan deze backend op deze machine gebruikt worden?"""
+        return False
+
+    def render(self, path, data, dpi, first_page, last_page, chunk_size, gray=False):
+        """Iterator van (pagina nummer, PIL afbeelding); path of data is gezet
+
+        Met gray is de afbeelding grijs (mode L) in plaats van RGB.
+        """
+        raise NotImplementedError
+
+
+class PdftoppmBackend(RenderBackend):
+    """pdftoppm: PPM via stdout, geen tijdelijke bestanden"""
+
+    name = "pdftoppm"
+
+    def available(self):
+        return shutil.which(poppler_command("pdftoppm")) is not None
+
+    def render(self, path, data, dpi, first_page, last_page, chunk_size, gray=False):
+        from pdf2image.parsers import parse_buffer_to_pgm, parse_buffer_to_ppm
+
+        # Met -gray schrijft pdftoppm PGM in plaats van PPM
+        parse = parse_buffer_to_pgm if gray else parse_buffer_to_ppm
+        for first in range(first_page, last_page + 1, chunk_size):
+            last = min(first + chunk_size - 1, last_page)
+            process = subprocess.run(
+                core.pdftoppm_args(path, dpi, first, last, gray),
+                input=data,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            if process.returncode != 0:
+                raise RuntimeError(f"pdftoppm gefaald: {process.stderr.decode('utf-8', 'ignore').strip()}")
+            for page_number, page in enumerate(parse(process.stdout), first):
+                yield page_number, page
+
+
+class PdftocairoBackend(RenderBackend):
+    """pdftocairo: rendert via cairo (vaak sneller bij vector tekeningen)
+
+    pdftocairo kan geen reeks pagina's naar stdout schrijven, dus er wordt
+    ongecomprimeerde TIFF naar een tijdelijke map geschreven.
+    """
+
+    name = "pdftocairo"
+
+    def available(self):
+        return shutil.which(poppler_command("pdftocairo")) is not None
+
+    def render(self, path, data, dpi, first_page, last_page, chunk_size, gray=False):
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as temp_folder:
+            if path is None:
+                path = os.path.join(temp_folder, "input.pdf")
+                with open(path, "wb") as f:
+                    f.write(data)
+            for first in range(first_page, last_page + 1, chunk_size):
+                last = min(first + chunk_size - 1, last_page)
+                prefix = os.path.join(temp_folder, f"chunk{first}")
+                process = subprocess.run(
+                    [poppler_command("pdftocairo"), "-tiff", "-tiffcompression", "none"]
+                    + (["-gray"] if gray else [])
+                    + ["-r", str(int(dpi)), "-f", str(first), "-l", str(last), path, prefix],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+                if process.returncode != 0:
+                    raise RuntimeError(f"pdftocairo gefaald: {process.stderr.decode('utf-8', 'ignore').strip()}")
+                # Bestanden heten chunkN-01.tif, chunkN-02.tif, ... (nummer = pagina)
+                outputs = sorted(
+                    (name for name in os.listdir(temp_folder) if name.startswith(f"chunk{first}-")),
+                    key=lambda name: int(name.rsplit("-", 1)[1].split(".")[0])
+                )
+                for page_number, name in zip(range(first, last + 1), outputs):
+                    output_path = os.path.join(temp_folder, name)
+                    with Image.open(output_path) as image:
+                        page = image.convert("L" if gray else "RGB")
+                    os.remove(output_path)
+                    yield page_number, page
+
+
+class PymupdfBackend(RenderBackend):
+    """PyMuPDF: rendert in het eigen proces (geen processen starten)"""
+
+    name = "pymupdf"
+
+    def available(self):
+        return importlib.util.find_spec("fitz") is not None
+
+    def render(self, path, data, dpi, first_page, last_page, chunk_size, gray=False):
+        import fitz
+        from PIL import Image
+
+        document = fitz.open(path) if path else fitz.open(stream=data, filetype="pdf")
+        try:
+            for page_number in range(first_page, last_page + 1):
+                colorspace = fitz.csGRAY if gray else fitz.csRGB
+                pixmap = document[page_number - 1].get_pixmap(dpi=int(dpi), colorspace=colorspace, alpha=False)
+                yield page_number, Image.frombytes("L" if gray else "RGB", (pixmap.width, pixmap.height), pixmap.samples)
+        finally:
+            document.close()
+
+
+BACKENDS = {backend.name: backend for backend in [PdftoppmBackend(), PdftocairoBackend(), PymupdfBackend()]}
+
+# Gemeten keuze per (documentklasse, DPI bereik) (per proces)
+_choices = {}
+_choices_lock = threading.Lock()
+
+# Documentklasse per bestand (pad, grootte, mtime) of per inhoud, zodat er niet elke render geparsed wordt
+_classes = {}
+
+# Keuzes die op dit moment gemeten worden
+_measuring = set()
+
+
+def available_backends():
+    """Namen van de backends die op deze machine werken"""
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+def document_class(path, data):
+    """Grove indeling van een PDF op basis van de eerste pagina
+
+    "scan" (vooral afbeeldingen), "vector" (veel tekenopdrachten, weinig
+    tekst), "text" of "mixed".
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(path or BytesIO(data))
+    page = reader.pages[0]
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else {}
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else {}
+    images = sum(1 for value in xobjects.values() if value.get_object().get("/Subtype") == "/Image")
+    fonts = resources.get("/Font")
+    has_fonts = bool(fonts.get_object()) if fonts is not None else False
+    try:
+        content_size = len(page.get_contents().get_data()) if page.get_contents() else 0
+    except Exception:
+        content_size = 0
+
+    if images and content_size < 1024:
+        return "scan"
+    if content_size > 64 * 1024 and not images:
+        return "text" if has_fonts and content_size < 256 * 1024 else "vector"
+    if images:
+        return "mixed"
+    return "text" if has_fonts else "vector"
+
+
+def cached_document_class(path, data):
+    """document_class, onthouden zolang het bestand (of de inhoud) niet verandert"""
+    if path:
+        stat = os.stat(path)
+        marker = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    else:
+        marker = ("data", len(data), hashlib.sha1(data).hexdigest())
+    with _choices_lock:
+        if marker in _classes:
+            return _classes[marker]
+    try:
+        document = document_class(path, data)
+    except Exception:
+        document = "unknown"
+    with _choices_lock:
+        if len(_classes) >= MAX_CLASSES:
+            _classes.clear()
+        _classes[marker] = document
+    return document
+
+
+def dpi_bucket(dpi):
+    """Index van het DPI bereik (0 = thumbnails en pre-scans)"""
+    return sum(1 for limit in DPI_BUCKETS if dpi >= limit)
+
+
+def measure(path, data, names=None, dpi=MEASURE_DPI, rounds=MEASURE_ROUNDS):
+    """Render de eerste pagina met elke backend; geeft naam -> snelste tijd in seconden
+
+    De eerste ronde warmt op (bestand in de cache, modules geladen) en telt
+    niet mee; elke ronde begint met een andere backend.
+    """
+    names = list(names or available_backends())
+    timings = {}
+    failed = set()
+    for round_number in range(rounds + 1):
+        shift = round_number % len(names) if names else 0
+        for name in names[shift:] + names[:shift]:
+            if name in failed:
+                continue
+            start = time.perf_counter()
+            try:
+                list(BACKENDS[name].render(path, data, dpi, 1, 1, 1))
+            except Exception:
+                failed.add(name)
+                timings.pop(name, None)
+                continue
+            if round_number:
+                timings[name] = min(timings.get(name, float("inf")), time.perf_counter() - start)
+    return timings
+
+
+def choose_backend(path, data, preferred="auto", dpi=MEASURE_DPI):
+    """Kies de backend: geforceerd via de instelling, anders gemeten per documentklasse en DPI bereik
+
+    Er wordt buiten de lock gemeten; andere threads met dezelfde
+    documentklasse wachten niet maar gebruiken zolang de standaard backend.
+    """
+    if preferred in BACKENDS and BACKENDS[preferred].available():
+        return BACKENDS[preferred]
+
+    names = available_backends()
+    if len(names) < 2:
+        return BACKENDS[names[0] if names else "pdftoppm"]
+
+    key = (cached_document_class(path, data), dpi_bucket(dpi))
+    with _choices_lock:
+        if key in _choices:
+            return BACKENDS[_choices[key]]
+        if key in _measuring:
+            return BACKENDS[names[0]]
+        _measuring.add(key)
+
+    try:
+        timings = measure(path, data, names, dpi)
+    finally:
+        with _choices_lock:
+            _measuring.discard(key)
+    with _choices_lock:
+        _choices[key] = min(timings, key=timings.get) if timings else names[0]
+        return BACKENDS[_choices[key]]
+
+
+def get_backend(backend, path=None, data=None, dpi=MEASURE_DPI):
+    """Backend uit een naam ("auto" = meten op dpi) of een backend object"""
+    if isinstance(backend, RenderBackend):
+        return backend
+    return choose_backend(path, data, backend or "auto", dpi)
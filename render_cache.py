@@ -0,0 +1,141 @@
+"""
+MakkelijkPdf - Render Cache (content-addressed)
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# Standaard locatie en maximale grootte van de cache
+DEFAULT_CACHE_FOLDER = Path.home() / ".makkelijkpdf" / "render_cache"
+DEFAULT_CACHE_SIZE_MB = 1024
+
+# Blokgrootte voor het hashen van bestanden
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class RenderCache:
+    """Cache van gerenderde pagina's, op inhoud van de PDF en render parameters"""
+
+    def __init__(self, folder=None, max_bytes=DEFAULT_CACHE_SIZE_MB * 1024 * 1024, hardlinks=False):
+        self.folder = Path(folder or DEFAULT_CACHE_FOLDER)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hardlinks = hardlinks
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.file_hashes = {}
+
+        # Index van naam -> grootte, oudste gebruik eerst
+        self.entries = OrderedDict()
+        self.size = 0
+        files = [path for path in self.folder.glob("*/*") if path.is_file() and path.suffix != ".tmp"]
+        for path in sorted(files, key=lambda path: path.stat().st_mtime):
+            size = path.stat().st_size
+            self.entries[path.name] = size
+            self.size += size
+
+    def file_hash(self, path):
+        """SHA-256 van de inhoud van een bestand (onthouden per grootte en mtime)"""
+        stat = os.stat(path)
+        marker = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if marker not in self.file_hashes:
+            digest = hashlib.sha256()
+            with open(path, "rb") as handle:
+                for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            self.file_hashes[marker] = digest.hexdigest()
+        return self.file_hashes[marker]
+
+    def key(self, file_hash, page_index, dpi, output_format, quality, compression, color_mode="color",
+            backend="auto"):
+        """Cache sleutel voor één gerenderde en gecodeerde pagina"""
+        parts = [file_hash, page_index, dpi, output_format.lower(), quality, compression]
+        if color_mode != "color":
+            # Alleen toevoegen als het afwijkt, zodat bestaande sleutels geldig blijven
+            parts.append(color_mode)
+        if backend not in ["auto", "pdftoppm"]:
+            # Een andere backend rendert anders (de oplossing bij een render fout)
+            parts.append(backend)
+        name = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+        return f"{name}.{output_format.lower()}"
+
+    def _path(self, key):
+        return self.folder / key[:2] / key
+
+    def _place(self, source, target):
+        """Zet een bestand op een nieuwe plek via een hard link of een kopie"""
+        if os.path.exists(target):
+            os.remove(target)
+        if self.hardlinks:
+            try:
+                os.link(source, target)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(source, target)
+
+    def get(self, key, output_path):
+        """Zet een gecachte pagina op output_path; False bij een miss"""
+        path = self._path(key)
+        with self.lock:
+            if key not in self.entries or not path.exists():
+                self.entries.pop(key, None)
+                self.misses += 1
+                return False
+            self.entries.move_to_end(key)
+            self.hits += 1
+        os.utime(path)
+        self._place(path, output_path)
+        return True
+
+    def put(self, key, source_path):
+        """Bewaar een net gecodeerde pagina in de cache"""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        self._place(source_path, temp_path)
+        os.replace(temp_path, path)
+
+        size = path.stat().st_size
+        with self.lock:
+            self.size += size - self.entries.pop(key, 0)
+            self.entries[key] = size
+            self._evict()
+
+    def _evict(self):
+        """Verwijder de langst niet gebruikte entries tot de cache onder de limiet zit"""
+        while self.size > self.max_bytes and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Leeg de hele cache"""
+        with self.lock:
+            while self.entries:
+                key, _ = self.entries.popitem()
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self.size = 0
+
+    def get_stats(self):
+        """Hit/miss tellers en grootte van de cache"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "size": self.size,
+        }
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+MakkelijkPdf - Renderer Pool (warme workers, minder poppler processen)
+
+convert_from_path start per aanroep pdfinfo én pdftoppm. Bij duizenden
+kleine PDF's kost het opstarten van die processen meer tijd dan het
+renderen zelf. Deze pool houdt Python workers warm (imports al gedaan),
+voegt kleine PDF's in het geheugen samen zodat één pdftoppm aanroep een
+hele batch rendert, en onthoudt pagina aantallen zodat pdfinfo niet
+nodig is.
+
+Voor het renderen van één groot document (render_shared) renderen de
+workers pagina's direct in gedeeld geheugen (shared_pages.py), zodat
+het hoofdproces ze kan coderen zonder de pixels over een pipe te kopiëren.
+"""
+
+import argparse
+import atexit
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from io import BytesIO
+from pathlib import Path
+import core
+import shared_pages
+
+# Kleine PDF's worden samengevoegd tot een batch van maximaal zoveel pagina's / bytes
+BATCH_PAGES = 50
+BATCH_BYTES = 8 * 1024 * 1024
+
+# Pagina's per pdftoppm aanroep binnen een batch
+BATCH_RENDER_CHUNK = 50
+
+# Maximaal aantal pagina's per worker opdracht bij render_shared
+SHARED_CHUNK = 4
+
+# Geheugen dat render_shared maximaal tegelijk in gedeelde blokken mag hebben
+SHARED_BUDGET = 512 * 1024 * 1024
+
+
+def _warm_worker():
+    """Initializer: laad de zware modules één keer per worker"""
+    import PyPDF2
+    import pdf2image.parsers
+    from PIL import Image
+    Image.init()
+
+
+def _write_pages(pages, output_folder, filename_base, total_pages, output_format, quality, compression,
+                 sizes=None, dpi=300):
+    """Codeer en schrijf de pagina's van één bestand, geeft de output paden terug
+
+    Met sizes worden ook de kleinere formaten uit dezelfde pagina's
+    afgeleid (image_pyramid.py); de worker codeert ze zelf, zonder threads.
+    """
+    from output_sinks import FileSink
+
+    sink = FileSink(output_folder, filename_base, total_pages, output_format, quality, compression)
+    if sizes:
+        from image_pyramid import PyramidSink
+
+        sink = PyramidSink(sink, sizes, dpi, output_folder, filename_base, total_pages, compression, threads=0)
+    for page_number, page in pages:
+        sink.add(page_number, page)
+    outputs = sink.close()
+    return outputs + sink.derived if sizes else outputs
+
+
+def _convert_single(path, output_folder, dpi, output_format, quality, compression, backend, sizes=None):
+    """Converteer één PDF (één render aanroep per chunk, geen pdfinfo)"""
+    total_pages = core.page_count(path)
+    return _write_pages(
+        core.render_images(path, dpi, chunk_size=BATCH_RENDER_CHUNK, backend=backend, total_pages=total_pages),
+        output_folder, Path(path).stem, total_pages, output_format, quality, compression, sizes, dpi
+    )
+
+
+def _convert_batch(paths, output_folder, dpi, output_format, quality, compression, backend="auto", sizes=None):
+    """Worker: voeg PDF's samen, render ze in één keer en verdeel de pagina's weer
+
+    Geeft per bestand (pad, output paden, foutmelding) terug. Als de batch
+    niet samengevoegd kan worden (bv. een versleutelde PDF) wordt elk
+    bestand apart geconverteerd.
+    """
+    from PyPDF2 import PdfReader, PdfWriter
+
+    results = []
+    try:
+        writer = PdfWriter()
+        spans = []
+        for path in paths:
+            reader = PdfReader(path)
+            if reader.is_encrypted:
+                raise ValueError("versleutelde PDF in batch")
+            for page in reader.pages:
+                writer.add_page(page)
+            spans.append((path, len(reader.pages)))
+        buffer = BytesIO()
+        writer.write(buffer)
+
+        # Eén stroom pagina's; per bestand de juiste aantallen eruit halen
+        pages = core.render_images(buffer.getvalue(), dpi, chunk_size=BATCH_RENDER_CHUNK, backend=backend,
+                                   total_pages=sum(page_total for _, page_total in spans))
+        for path, page_total in spans:
+            own_pages = [(page_number, next(pages)[1]) for page_number in range(1, page_total + 1)]
+            output_paths = _write_pages(own_pages, output_folder, Path(path).stem, page_total,
+                                        output_format, quality, compression, sizes, dpi)
+            results.append((path, output_paths, None))
+        return results
+    except Exception:
+        # Terugvallen op losse conversies voor wat nog niet klaar is
+        done = {path for path, _, _ in results}
+        for path in paths:
+            if path in done:
+                continue
+            try:
+                output_paths = _convert_single(path, output_folder, dpi, output_format, quality, compression,
+                                               backend, sizes)
+                results.append((path, output_paths, None))
+            except Exception as e:
+                results.append((path, None, f"{type(e).__name__}: {e}"))
+        return results
+
+
+def _page_sizes(path, dpi, first_page, last_page, mode="RGB"):
+    """Geschatte blokgrootte per pagina (cropbox op de gevraagde DPI, zoals pdftoppm)"""
+    from PyPDF2 import PdfReader
+
+    sizes = []
+    for page in PdfReader(path).pages[first_page - 1:last_page]:
+        box = page.cropbox
+        width = int(float(box.width) * dpi / 72) + 2
+        height = int(float(box.height) * dpi / 72) + 2
+        sizes.append(shared_pages.page_bytes(width, height, mode))
+    return sizes
+
+
+def _render_shared(path, dpi, first_page, last_page, names, backend, gray=False):
+    """Worker: render pagina's in gedeelde blokken; geeft per pagina (nummer, beschrijving)
+
+    Zonder blokken (names is None), of als een pagina groter is dan geschat,
+    gaat de afbeelding zelf terug via pickle.
+    """
+    results = []
+    pages = core.render_images(path, dpi, first_page, last_page,
+                               chunk_size=last_page - first_page + 1, backend=backend, gray=gray)
+    for index, (page_number, page) in enumerate(pages):
+        descriptor = shared_pages.write_page(names[index], page) if names else None
+        results.append((page_number, descriptor or page))
+    return results
+
+
+class RendererPool:
+    """Langlevende pool van warme render workers"""
+
+    def __init__(self, workers=0, batch_pages=BATCH_PAGES, batch_bytes=BATCH_BYTES, backend="auto"):
+        self.workers = workers or os.cpu_count() or 1
+        # Render backend: "auto" of een vaste naam (zie render_backends.py)
+        self.backend = backend
+        self.batch_pages = batch_pages
+        self.batch_bytes = batch_bytes
+        self.executor = None
+        self.shared = None
+        self.lock = threading.Lock()
+        # Pagina aantallen per (pad, grootte, mtime), in plaats van pdfinfo
+        self.page_counts = {}
+
+    def get_executor(self):
+        """Start de workers bij het eerste gebruik en houd ze daarna warm"""
+        with self.lock:
+            if self.executor is None:
+                if os.name == "posix":
+                    # Eén resource tracker voor alle processen; anders ruimen trackers
+                    # van de workers gedeelde blokken op die nog in gebruik zijn
+                    from multiprocessing import resource_tracker
+                    resource_tracker.ensure_running()
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+            return self.executor
+
+    def get_shared(self):
+        """De pool van gedeelde geheugen blokken (bij het eerste gebruik aangemaakt)"""
+        with self.lock:
+            if self.shared is None:
+                self.shared = shared_pages.SharedPagePool()
+            return self.shared
+
+    def page_count(self, path):
+        """Aantal pagina's van een PDF, onthouden zolang het bestand niet verandert"""
+        stat = os.stat(path)
+        marker = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if marker not in self.page_counts:
+            self.page_counts[marker] = core.page_count(path)
+        return self.page_counts[marker]
+
+    def render(self, path, dpi=300, first_page=None, last_page=None):
+        """Render pagina's als PIL afbeeldingen in dit proces (één render aanroep, geen pdfinfo)"""
+        total_pages = self.page_count(path)
+        first_page = first_page or 1
+        last_page = min(last_page or total_pages, total_pages)
+        return [page for _, page in core.render_images(path, dpi, first_page, last_page,
+                                                       chunk_size=last_page - first_page + 1,
+                                                       backend=self.backend)]
+
+    def render_shared(self, path, dpi=300, first_page=None, last_page=None, gray=False):
+        """Render pagina's in de workers; iterator van (pagina nummer, PIL afbeelding)
+
+        De pixels komen via gedeeld geheugen binnen, zonder kopie. Een
+        afbeelding is alleen geldig tot de volgende pagina opgevraagd wordt,
+        daarna wordt het blok hergebruikt (page.copy() om hem te bewaren).
+        Met gray komen de pagina's als grijs (mode L) binnen.
+        """
+        total_pages = self.page_count(path)
+        first_page = first_page or 1
+        last_page = min(last_page or total_pages, total_pages)
+        sizes = _page_sizes(path, dpi, first_page, last_page, "L" if gray else "RGB")
+        chunk_size = max(1, min(SHARED_CHUNK, SHARED_BUDGET // (self.workers * max(sizes, default=1))))
+        executor = self.get_executor()
+        shared = self.get_shared()
+        starts = iter(range(first_page, last_page + 1, chunk_size))
+        pending = deque()
+
+        def submit_next():
+            first = next(starts, None)
+            if first is None:
+                return
+            last = min(first + chunk_size - 1, last_page)
+            names = [shared.acquire(sizes[page - first_page]) for page in range(first, last + 1)]
+            future = executor.submit(_render_shared, path, dpi, first, last, names, self.backend, gray)
+            pending.append((future, names))
+
+        in_use = []
+        try:
+            for _ in range(self.workers):
+                submit_next()
+            while pending:
+                future, in_use = pending.popleft()
+                for page_number, result in future.result():
+                    page = shared.image(result) if isinstance(result, tuple) else result
+                    yield page_number, page
+                    del page
+                for name in in_use:
+                    shared.release(name)
+                in_use = []
+                submit_next()
+        finally:
+            # Afgebroken: blokken pas teruggeven als geen worker er meer in schrijft
+            running = [future for future, _ in pending if not future.cancel()]
+            wait(running)
+            for names in [in_use] + [names for _, names in pending]:
+                for name in names:
+                    shared.release(name)
+            # De pool leeft zo lang als het proces; vrije blokken niet vasthouden tot het einde
+            shared.trim()
+
+    def batches(self, paths):
+        """Verdeel PDF's in batches op basis van bestandsgrootte (en pagina's als bekend)"""
+        batch, batch_bytes, batch_pages = [], 0, 0
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Inmiddels verdwenen: niet in een batch opnemen
+                continue
+            size = stat.st_size
+            pages = self.page_counts.get((os.path.abspath(path), size, stat.st_mtime_ns), 1)
+            if batch and (batch_bytes + size > self.batch_bytes or batch_pages + pages > self.batch_pages):
+                yield batch
+                batch, batch_bytes, batch_pages = [], 0, 0
+            batch.append(path)
+            batch_bytes += size
+            batch_pages += pages
+        if batch:
+            yield batch
+
+    def submit(self, paths, output_folder, dpi=300, output_format="PNG", quality=95, compression="none",
+               sizes=None):
+        """Start conversies in batches; geeft een lijst (future, paden) terug
+
+        Het resultaat van elke future is een lijst (pad, output paden, fout).
+        sizes: extra formaten per pagina uit dezelfde rendering (image_pyramid.py).
+        """
+        executor = self.get_executor()
+        return [
+            (executor.submit(_convert_batch, batch, output_folder, dpi, output_format, quality, compression,
+                             self.backend, sizes), batch)
+            for batch in self.batches(paths)
+        ]
+
+    def convert(self, paths, output_folder, dpi=300, output_format="PNG", quality=95, compression="none",
+                sizes=None):
+        """Converteer PDF's en wacht op het resultaat: dict pad -> (output paden, fout)"""
+        results = {}
+        for future, _ in self.submit(paths, output_folder, dpi, output_format, quality, compression, sizes):
+            for path, output_paths, error in future.result():
+                results[path] = (output_paths, error)
+        return results
+
+    def shutdown(self):
+        """Stop de workers"""
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+            if self.shared is not None:
+                self.shared.close()
+                self.shared = None
+
+
+_pool = None
+
+
+def get_pool(workers=0, backend=None):
+    """De gedeelde renderer pool van dit proces (backend: optioneel wijzigen)"""
+    global _pool
+    if _pool is None:
+        _pool = RendererPool(workers)
+        atexit.register(_pool.shutdown)
+    if backend:
+        _pool.backend = backend
+    return _pool
+
+
+def benchmark(count=200, dpi=72, workers=0):
+    """Vergelijk de overhead per bestand: convert_from_path, één pdftoppm, en de pool"""
+    from pdf2image import convert_from_path
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as temp_folder:
+        paths = []
+        for index in range(count):
+            path = os.path.join(temp_folder, f"bestand_{index:04d}.pdf")
+            Image.new("RGB", (595, 842), (255, 255, 255 - index % 255)).save(path, "PDF")
+            paths.append(path)
+        output_folder = os.path.join(temp_folder, "output")
+        os.makedirs(output_folder)
+
+        timings = {}
+        start = time.perf_counter()
+        for path in paths:
+            convert_from_path(path, dpi=dpi)
+        timings["convert_from_path (pdfinfo + pdftoppm)"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in paths:
+            list(core.render_images(path, dpi))
+        timings["core.render_images (alleen pdftoppm)"] = time.perf_counter() - start
+
+        pool = RendererPool(workers)
+        pool.get_executor().submit(_warm_worker).result()
+        start = time.perf_counter()
+        pool.convert(paths, output_folder, dpi)
+        timings[f"renderer pool ({pool.workers} warme workers, batches)"] = time.perf_counter() - start
+        pool.shutdown()
+
+    print(f"⏱️ {count} PDF's van één pagina op {dpi} DPI:")
+    for name, seconds in timings.items():
+        print(f"   {name}: {seconds * 1000 / count:.1f} ms per bestand")
+    return timings
+
+
+def benchmark_transfer(pages=16, dpi=300, workers=0):
+    """Vergelijk pagina's terugsturen via pickle met gedeeld geheugen (render + overdracht)"""
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as temp_folder:
+        path = os.path.join(temp_folder, "groot.pdf")
+        core.images_to_pdf([Image.new("RGB", (595, 842), "white") for _ in range(pages)], path)
+
+        pool = RendererPool(workers)
+        pool.get_executor().submit(_warm_worker).result()
+        timings = {}
+
+        start = time.perf_counter()
+        futures = [pool.get_executor().submit(_render_shared, path, dpi, first, min(first + SHARED_CHUNK - 1, pages),
+                                              None, pool.backend)
+                   for first in range(1, pages + 1, SHARED_CHUNK)]
+        for future in futures:
+            for _, page in future.result():
+                page.getpixel((0, 0))
+        timings["pickle"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _, page in pool.render_shared(path, dpi):
+            page.getpixel((0, 0))
+        del page
+        timings["gedeeld geheugen"] = time.perf_counter() - start
+        pool.shutdown()
+
+    print(f"⏱️ {pages} pagina's op {dpi} DPI met {pool.workers} workers:")
+    for name, seconds in timings.items():
+        print(f"   {name}: {seconds * 1000 / pages:.1f} ms per pagina")
+    return timings
+
+
+def main():
+    """Benchmark vanaf de command line"""
+    parser = argparse.ArgumentParser(description="MakkelijkPdf renderer pool benchmark")
+    parser.add_argument("--count", type=int, default=200, help="Aantal test PDF's")
+    parser.add_argument("--dpi", type=int, default=72, help="Render DPI")
+    parser.add_argument("--workers", type=int, default=0, help="Aantal workers (0 = auto)")
+    parser.add_argument("--transfer", action="store_true",
+                        help="Meet de overdracht van grote pagina's (pickle tegen gedeeld geheugen)")
+    args = parser.parse_args()
+    if args.transfer:
+        benchmark_transfer(dpi=args.dpi, workers=args.workers)
+    else:
+        benchmark(args.count, args.dpi, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+MakkelijkPdf - HTTP Conversie Service
+"""
+
+import argparse
+import json
+import mimetypes
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from core import convert_pdf_to_images, images_to_pdf, merge
+from settings import SettingsManager
+
+# Standaard limieten van de service
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_MAX_MB = 100
+
+# Afgeronde jobs worden zo lang bewaard (seconden)
+JOB_TTL = 3600
+
+# Ondersteunde conversie modes
+SERVICE_MODES = ["pdf_to_image", "image_to_pdf", "pdf_merge"]
+
+# Blokgrootte bij het terugsturen van resultaten
+STREAM_CHUNK = 64 * 1024
+
+
+class Job:
+    """Eén conversie opdracht met zijn bestanden en timing"""
+
+    def __init__(self, mode, options, folder):
+        self.id = uuid.uuid4().hex
+        self.mode = mode
+        self.options = options
+        self.folder = folder
+        self.inputs = []
+        self.outputs = []
+        self.status = "queued"
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    def to_dict(self):
+        """Status en timing als JSON-baar dict"""
+        now = time.time()
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "status": self.status,
+            "error": self.error,
+            "options": self.options,
+            "results": [os.path.basename(path) for path in self.outputs],
+            "queued_seconds": round((self.started or now) - self.created, 3),
+            "run_seconds": round((self.finished or now) - self.started, 3) if self.started else None,
+            "total_seconds": round((self.finished or now) - self.created, 3),
+        }
+
+
+class ConversionService:
+    """Job queue met een vaste pool van worker threads rond de conversie kern"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE,
+                 max_bytes=DEFAULT_MAX_MB * 1024 * 1024, job_ttl=JOB_TTL, settings=None, work_folder=None):
+        self.settings = settings or SettingsManager()
+        self.max_bytes = max_bytes
+        self.job_ttl = job_ttl
+        self.work_folder = work_folder or tempfile.mkdtemp(prefix="makkelijkpdf_service_")
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+        for _ in range(workers):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def default_options(self, mode):
+        """Standaard opties uit de instellingen"""
+        if mode == "pdf_to_image":
+            return {
+                "dpi": self.settings.get("conversion", "default_dpi", 300),
+                "format": self.settings.get("conversion", "default_format", "PNG"),
+                "quality": self.settings.get("conversion", "quality", 95),
+                "container": self.settings.get("conversion", "output_container", "files"),
+                "sizes": self.settings.get("conversion", "output_sizes", ""),
+            }
+        return {
+            "linearize": self.settings.get("conversion", "linearize_pdf", False),
+            "compact": self.settings.get("conversion", "compact_pdf", False),
+        }
+
+    def submit(self, mode, options, files):
+        """Maak een job van (naam, bytes) bestanden; queue.Full als de queue vol zit"""
+        self.purge()
+        job = Job(mode, options, tempfile.mkdtemp(dir=self.work_folder))
+        for index, (name, data) in enumerate(files):
+            # Eigen submap per input zodat namen en volgorde behouden blijven
+            folder = os.path.join(job.folder, "input", f"{index:03d}")
+            os.makedirs(folder)
+            path = os.path.join(folder, os.path.basename(name) or "input")
+            with open(path, "wb") as f:
+                f.write(data)
+            job.inputs.append(path)
+
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            shutil.rmtree(job.folder, ignore_errors=True)
+            with self.lock:
+                self.stats["rejected"] += 1
+            raise
+        with self.lock:
+            self.jobs[job.id] = job
+            self.stats["submitted"] += 1
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def delete(self, job_id):
+        """Verwijder een afgeronde job en zijn bestanden"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in ("queued", "running"):
+                return False
+            del self.jobs[job_id]
+        shutil.rmtree(job.folder, ignore_errors=True)
+        return True
+
+    def purge(self):
+        """Ruim afgeronde jobs op die ouder zijn dan job_ttl"""
+        limit = time.time() - self.job_ttl
+        with self.lock:
+            expired = [job_id for job_id, job in self.jobs.items() if job.finished and job.finished < limit]
+        for job_id in expired:
+            self.delete(job_id)
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats["jobs"] = len(self.jobs)
+        stats["queued"] = self.queue.qsize()
+        return stats
+
+    def _worker(self):
+        """Verwerk jobs uit de queue, één tegelijk per thread"""
+        while True:
+            job = self.queue.get()
+            job.status = "running"
+            job.started = time.time()
+            try:
+                job.outputs = self._run(job)
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+            job.finished = time.time()
+            with self.lock:
+                self.stats["completed" if job.status == "done" else "failed"] += 1
+            self.queue.task_done()
+
+    def _run(self, job):
+        """Voer de conversie van een job uit via de gedeelde kern"""
+        output_folder = os.path.join(job.folder, "output")
+        os.makedirs(output_folder)
+        options = job.options
+        if job.mode == "pdf_to_image":
+            return convert_pdf_to_images(
+                job.inputs[0],
+                output_folder,
+                dpi=options["dpi"],
+                output_format=options["format"],
+                quality=options["quality"],
+                container=options["container"],
+                sizes=options["sizes"]
+            )
+
+        output_path = os.path.join(output_folder, "result.pdf")
+        if job.mode == "image_to_pdf":
+            images_to_pdf(job.inputs, output_path, options["linearize"], options["compact"])
+        else:
+            merge(job.inputs, output_path, options["linearize"], options["compact"])
+        return [output_path]
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """HTTP endpoints: POST /jobs, GET /jobs/<id>[/result[/<n>]], DELETE /jobs/<id>, GET /stats"""
+
+    service = None
+    timeout = 60
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message, headers=None):
+        self.send_json(status, {"error": message}, headers)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            return self.send_error_json(404, "Onbekend endpoint")
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        mode = query.pop("mode", "pdf_to_image")
+        if mode not in SERVICE_MODES:
+            return self.send_error_json(400, f"Onbekende mode: {mode}")
+
+        # Grootte controleren voordat er iets gelezen wordt
+        if "Content-Length" not in self.headers:
+            return self.send_error_json(411, "Content-Length is verplicht")
+        try:
+            length = int(self.headers["Content-Length"])
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Body niet te lezen; de verbinding niet hergebruiken
+            self.close_connection = True
+            return self.send_error_json(400, "Ongeldige Content-Length")
+        if length > self.service.max_bytes:
+            self.close_connection = True
+            return self.send_error_json(413, f"Request groter dan {self.service.max_bytes} bytes")
+        body = self.rfile.read(length)
+
+        try:
+            files = self.parse_files(body)
+            options = self.parse_options(mode, query)
+        except ValueError as e:
+            return self.send_error_json(400, str(e))
+        if not files:
+            return self.send_error_json(400, "Geen bestanden ontvangen")
+        if mode == "pdf_to_image" and len(files) != 1:
+            return self.send_error_json(400, "pdf_to_image verwacht precies één PDF")
+
+        try:
+            job = self.service.submit(mode, options, files)
+        except queue.Full:
+            return self.send_error_json(429, "Queue is vol, probeer het later opnieuw", {"Retry-After": "1"})
+        self.send_json(202, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+    def parse_files(self, body):
+        """Lees bestanden uit een multipart/form-data body of een ruwe body"""
+        content_type = self.headers.get("Content-Type", "application/octet-stream")
+        if content_type.startswith("multipart/form-data"):
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+            )
+            if not message.is_multipart():
+                raise ValueError("Ongeldige multipart body")
+            return [(part.get_filename() or part.get_param("name", header="content-disposition") or "input",
+                     part.get_payload(decode=True) or b"")
+                    for part in message.iter_parts() if part.get_filename()]
+
+        extension = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+        name = self.headers.get("X-Filename") or f"input{extension}"
+        return [(name, body)]
+
+    def parse_options(self, mode, query):
+        """Combineer query parameters met de standaard opties"""
+        options = self.service.default_options(mode)
+        for key, value in query.items():
+            if key not in options:
+                raise ValueError(f"Onbekende optie: {key}")
+            if isinstance(options[key], bool):
+                options[key] = value.lower() in ("1", "true", "yes", "ja")
+            elif isinstance(options[key], int):
+                options[key] = int(value)
+            else:
+                options[key] = value
+        return options
+
+    def do_GET(self):
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        if parts == ["stats"]:
+            return self.send_json(200, self.service.get_stats())
+        if len(parts) < 2 or parts[0] != "jobs":
+            return self.send_error_json(404, "Onbekend endpoint")
+
+        job = self.service.get(parts[1])
+        if job is None:
+            return self.send_error_json(404, "Onbekende job")
+        if len(parts) == 2:
+            return self.send_json(200, job.to_dict())
+        if parts[2] != "result" or len(parts) > 4:
+            return self.send_error_json(404, "Onbekend endpoint")
+        if job.status != "done":
+            return self.send_json(409, job.to_dict())
+
+        if len(parts) == 4:
+            index = int(parts[3]) if parts[3].isdigit() else -1
+            if not 0 <= index < len(job.outputs):
+                return self.send_error_json(404, "Onbekend resultaat")
+            return self.send_file(job.outputs[index])
+        if len(job.outputs) == 1:
+            return self.send_file(job.outputs[0])
+        return self.send_zip(job)
+
+    def send_file(self, path):
+        """Stuur één resultaat bestand in blokken terug"""
+        self.send_response(200)
+        self.send_header("Content-Type", mimetypes.guess_type(path)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(os.path.getsize(path)))
+        self.send_header("Content-Disposition", f'attachment; filename="{os.path.basename(path)}"')
+        self.end_headers()
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, self.wfile, STREAM_CHUNK)
+
+    def send_zip(self, job):
+        """Stream alle resultaten als zip, zonder tussenbestand"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Disposition", f'attachment; filename="{job.id}.zip"')
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        # Afbeeldingen zijn al gecomprimeerd: opslaan zonder extra compressie
+        output_folder = os.path.join(job.folder, "output")
+        with zipfile.ZipFile(self.wfile, "w", zipfile.ZIP_STORED) as archive:
+            for path in job.outputs:
+                # Submappen (extra formaten) behouden, anders overschrijven gelijke namen elkaar
+                archive.write(path, os.path.relpath(path, output_folder))
+
+    def do_DELETE(self):
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        if len(parts) != 2 or parts[0] != "jobs":
+            return self.send_error_json(404, "Onbekend endpoint")
+        if not self.service.delete(parts[1]):
+            return self.send_error_json(409, "Job bestaat niet of is nog bezig")
+        self.send_json(200, {"deleted": parts[1]})
+
+
+def create_server(host="127.0.0.1", port=DEFAULT_PORT, **service_options):
+    """Maak een HTTP server met een eigen ConversionService"""
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": ConversionService(**service_options)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    """Start de HTTP service vanaf de command line"""
+    parser = argparse.ArgumentParser(description="MakkelijkPdf HTTP conversie service")
+    parser.add_argument("--host", default="127.0.0.1", help="Adres om op te luisteren")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Poort om op te luisteren")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Aantal gelijktijdige conversies")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="Maximaal aantal wachtende jobs")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_MB, help="Maximale request grootte in MB")
+    args = parser.parse_args()
+
+    server = create_server(
+        args.host,
+        args.port,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        max_bytes=int(args.max_mb * 1024 * 1024)
+    )
+    print(f"🌐 MakkelijkPdf service op http://{args.host}:{args.port} (stop met Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Service gestopt")
+    finally:
+        server.server_close()
+        shutil.rmtree(server.RequestHandlerClass.service.work_folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
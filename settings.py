@@ -2,9 +2,17 @@
 MakkelijkPdf - Instellingen Management
 """
 
+import atexit
+import copy
 import json
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from types import MappingProxyType
+
+# Wijzigingen buiten een batch worden zo lang verzameld voor ze worden bewaard (seconden)
+SAVE_DELAY = 0.5
 
 class SettingsManager:
     def __init__(self):
@@ -22,10 +30,26 @@ class SettingsManager:
             "conversion": {
                 "default_dpi": 300,
                 "default_format": "PNG",
-                "quality": 95,  # For JPEG
-                "compression": "none",  # none, fast, best
+                "quality": 95,  # JPEG, WebP en AVIF (WebP 100 = verliesvrij)
+                "compression": "none",  # none, fast, best, palette (PNG met kleurenpalet)
                 "preserve_metadata": True,
-                "auto_open_output": False
+                "auto_open_output": False,
+                "compact_pdf": False,  # Object streams + xref stream voor PDF output
+                "linearize_pdf": False,  # Fast web view voor PDF output
+                "split_method": "pages",  # pages, size, bookmarks
+                "split_pages": 100,
+                "split_size_mb": 10,
+                "optimize_dpi": 150,  # Afbeeldingen boven deze DPI worden verkleind
+                "optimize_quality": 75,  # JPEG kwaliteit bij optimaliseren
+                "optimize_compression": "jpeg",  # jpeg of flate
+                "blank_pages": "keep",  # keep, skip, placeholder (lege pagina's bij PDF naar afbeelding)
+                "blank_tolerance": 0.002,  # Maximale inktbedekking van een lege pagina (fractie)
+                "merge_skip_blank": False,  # Lege pagina's weglaten bij samenvoegen
+                "adaptive_color": False,  # Per pagina kleur, grijs of zwart-wit (PDF naar afbeelding)
+                "output_container": "files",  # files, tiff, zip, cbz, tar (één bestand per document), dzi (tegels)
+                "tile_size": 256,  # Tegelgrootte in pixels bij Deep Zoom (dzi) output
+                "tiff_compression": "auto",  # auto, none, lzw, deflate, group4 (multi-page TIFF)
+                "output_sizes": ""  # Extra formaten uit één rendering, bv. "medium:150:JPG:85, thumb:50:WEBP:75"
             },
             "ui": {
                 "window_width": 1400,
@@ -38,10 +62,66 @@ class SettingsManager:
                 "thread_count": 0,  # 0 = auto
                 "memory_limit": 512,  # MB
                 "temp_folder": "",
-                "log_level": "INFO"
+                "log_level": "INFO",
+                "render_cache": True,  # Hergebruik eerder gerenderde pagina's
+                "cache_folder": "",  # Leeg = ~/.makkelijkpdf/render_cache
+                "cache_size_mb": 1024,
+                "cache_hardlinks": False,  # Hard links in plaats van kopieën
+                "render_backend": "auto"  # auto, pdftoppm, pdftocairo, pymupdf
             }
         }
+        self.lock = threading.RLock()
+        self.batch_depth = 0
+        self.dirty = False
+        self.save_timer = None
         self.settings = self.load_settings()
+        self._update_snapshot()
+        atexit.register(self.flush)
+    
+    def _update_snapshot(self):
+        """Maak een nieuwe alleen-lezen kopie voor get() (lezen zonder lock)"""
+        self.snapshot = MappingProxyType({
+            section: MappingProxyType(dict(values)) for section, values in self.settings.items()
+        })
+    
+    def _changed(self):
+        """Na een wijziging: snapshot bijwerken en opslaan plannen"""
+        self._update_snapshot()
+        self.dirty = True
+        if self.batch_depth == 0:
+            # Snelle opeenvolgende wijzigingen (bv. venster resize) samen opslaan
+            if self.save_timer:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+    
+    @contextmanager
+    def batch(self):
+        """Groepeer wijzigingen: één keer opslaan aan het einde van het blok
+        
+        Gebruik: with settings.batch(): settings.set(...); settings.set(...)
+        """
+        with self.lock:
+            self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                outermost = self.batch_depth == 0
+            if outermost:
+                self.flush()
+    
+    def flush(self):
+        """Bewaar openstaande wijzigingen direct"""
+        with self.lock:
+            if self.save_timer:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.dirty:
+                return True
+            return self.save_settings()
     
     def load_settings(self):
         """Laad instellingen uit bestand"""
@@ -53,14 +133,24 @@ class SettingsManager:
                 return self._merge_settings(self.default_settings, loaded_settings)
             except Exception as e:
                 print(f"Fout bij laden instellingen: {e}")
-                return self.default_settings.copy()
-        return self.default_settings.copy()
+                return copy.deepcopy(self.default_settings)
+        return copy.deepcopy(self.default_settings)
     
     def save_settings(self):
-        """Bewaar instellingen naar bestand"""
+        """Bewaar instellingen naar bestand
+        
+        Eerst naar een tijdelijk bestand en dan vervangen, zodat een crash
+        tijdens het schrijven nooit een half settings.json achterlaat.
+        """
+        temp_file = self.settings_file.with_suffix(".json.tmp")
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            with self.lock:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.settings, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.settings_file)
+                self.dirty = False
             return True
         except Exception as e:
             print(f"Fout bij opslaan instellingen: {e}")
@@ -73,29 +163,34 @@ class SettingsManager:
                 with open(self.settings_file, 'r', encoding='utf-8') as f:
                     loaded_settings = json.load(f)
                 # Merge met default settings
-                self.settings = self._merge_settings(self.default_settings, loaded_settings)
+                with self.lock:
+                    self.settings = self._merge_settings(self.default_settings, loaded_settings)
+                    self._update_snapshot()
         except Exception as e:
             print(f"Fout bij herladen instellingen: {e}")
     
     def get(self, section, key, default=None):
-        """Haal instelling op"""
-        return self.settings.get(section, {}).get(key, default)
+        """Haal instelling op (veilig vanuit worker threads, zonder lock)"""
+        return self.snapshot.get(section, {}).get(key, default)
     
     def set(self, section, key, value):
         """Stel instelling in"""
-        if section not in self.settings:
-            self.settings[section] = {}
-        self.settings[section][key] = value
-        self.save_settings()
+        with self.lock:
+            if section not in self.settings:
+                self.settings[section] = {}
+            self.settings[section][key] = value
+            self._changed()
     
     def reset_to_defaults(self):
         """Reset alle instellingen naar standaard"""
-        self.settings = self.default_settings.copy()
-        self.save_settings()
+        with self.lock:
+            self.settings = copy.deepcopy(self.default_settings)
+            self._update_snapshot()
+            self.save_settings()
     
     def _merge_settings(self, default, loaded):
         """Merge loaded settings met defaults"""
-        result = default.copy()
+        result = copy.deepcopy(default)
         for section, values in loaded.items():
             if section in result:
                 result[section].update(values)
@@ -105,13 +200,13 @@ class SettingsManager:
     
     def get_all_settings(self):
         """Haal alle instellingen op"""
-        return self.settings.copy()
+        return copy.deepcopy(self.settings)
     
     def export_settings(self, filepath):
         """Exporteer instellingen naar bestand"""
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+                json.dump(self.get_all_settings(), f, indent=2, ensure_ascii=False)
             return True
         except Exception as e:
             print(f"Fout bij exporteren instellingen: {e}")
@@ -122,8 +217,10 @@ class SettingsManager:
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 imported_settings = json.load(f)
-            self.settings = self._merge_settings(self.default_settings, imported_settings)
-            self.save_settings()
+            with self.lock:
+                self.settings = self._merge_settings(self.default_settings, imported_settings)
+                self._update_snapshot()
+                self.save_settings()
             return True
         except Exception as e:
             print(f"Fout bij importeren instellingen: {e}")
@@ -5,7 +5,10 @@ MakkelijkPdf - Instellingen Venster
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from settings import SettingsManager
+from core import output_formats
+from image_pyramid import parse_sizes
 import os
+import threading
 
 class SettingsWindow:
     def __init__(self, parent, settings_manager, on_close_callback=None):
@@ -191,7 +194,7 @@ class SettingsWindow:
         format_menu = ctk.CTkOptionMenu(
             format_frame,
             variable=self.default_format_var,
-            values=["PNG", "JPG", "JPEG", "TIFF", "BMP"]
+            values=output_formats()
         )
         format_menu.pack(side="left", padx=10, pady=10)
         
@@ -199,7 +202,7 @@ class SettingsWindow:
         quality_frame = ctk.CTkFrame(conversion_frame)
         quality_frame.pack(fill="x", padx=15, pady=5)
         
-        ctk.CTkLabel(quality_frame, text="JPEG Kwaliteit:").pack(side="left", padx=10, pady=10)
+        ctk.CTkLabel(quality_frame, text="Kwaliteit (JPEG/WebP/AVIF, WebP 100 = verliesvrij):").pack(side="left", padx=10, pady=10)
         
         self.quality_var = ctk.IntVar(value=self.settings.get("conversion", "quality", 95))
         quality_slider = ctk.CTkSlider(
@@ -214,6 +217,125 @@ class SettingsWindow:
         quality_label = ctk.CTkLabel(quality_frame, textvariable=self.quality_var)
         quality_label.pack(side="left", padx=5, pady=10)
         
+        # Compressie voor PNG/TIFF (palette = PNG met kleurenpalet)
+        compression_frame = ctk.CTkFrame(conversion_frame)
+        compression_frame.pack(fill="x", padx=15, pady=5)
+        
+        ctk.CTkLabel(compression_frame, text="Compressie:").pack(side="left", padx=10, pady=10)
+        self.compression_var = ctk.StringVar(value=self.settings.get("conversion", "compression", "none"))
+        compression_menu = ctk.CTkOptionMenu(
+            compression_frame,
+            variable=self.compression_var,
+            values=["none", "fast", "best", "palette"]
+        )
+        compression_menu.pack(side="left", padx=10, pady=10)
+        
+        # PDF splitsen
+        split_frame = ctk.CTkFrame(conversion_frame)
+        split_frame.pack(fill="x", padx=15, pady=5)
+        
+        ctk.CTkLabel(split_frame, text="Splitsen per:").pack(side="left", padx=10, pady=10)
+        
+        self.split_method_var = ctk.StringVar(value=self.settings.get("conversion", "split_method", "pages"))
+        split_method_menu = ctk.CTkOptionMenu(
+            split_frame,
+            variable=self.split_method_var,
+            values=["pages", "size", "bookmarks"],
+            width=120
+        )
+        split_method_menu.pack(side="left", padx=10, pady=10)
+        
+        ctk.CTkLabel(split_frame, text="Pagina's:").pack(side="left", padx=5, pady=10)
+        self.split_pages_var = ctk.StringVar(value=str(self.settings.get("conversion", "split_pages", 100)))
+        split_pages_entry = ctk.CTkEntry(split_frame, textvariable=self.split_pages_var, width=60)
+        split_pages_entry.pack(side="left", padx=5, pady=10)
+        
+        ctk.CTkLabel(split_frame, text="MB:").pack(side="left", padx=5, pady=10)
+        self.split_size_var = ctk.StringVar(value=str(self.settings.get("conversion", "split_size_mb", 10)))
+        split_size_entry = ctk.CTkEntry(split_frame, textvariable=self.split_size_var, width=60)
+        split_size_entry.pack(side="left", padx=5, pady=10)
+        
+        # PDF optimaliseren
+        optimize_frame = ctk.CTkFrame(conversion_frame)
+        optimize_frame.pack(fill="x", padx=15, pady=5)
+        
+        ctk.CTkLabel(optimize_frame, text="Optimaliseren tot DPI:").pack(side="left", padx=10, pady=10)
+        self.optimize_dpi_var = ctk.StringVar(value=str(self.settings.get("conversion", "optimize_dpi", 150)))
+        optimize_dpi_entry = ctk.CTkEntry(optimize_frame, textvariable=self.optimize_dpi_var, width=60)
+        optimize_dpi_entry.pack(side="left", padx=5, pady=10)
+        
+        self.optimize_compression_var = ctk.StringVar(value=self.settings.get("conversion", "optimize_compression", "jpeg"))
+        optimize_compression_menu = ctk.CTkOptionMenu(
+            optimize_frame,
+            variable=self.optimize_compression_var,
+            values=["jpeg", "flate"],
+            width=100
+        )
+        optimize_compression_menu.pack(side="left", padx=10, pady=10)
+        
+        ctk.CTkLabel(optimize_frame, text="Kwaliteit:").pack(side="left", padx=5, pady=10)
+        self.optimize_quality_var = ctk.StringVar(value=str(self.settings.get("conversion", "optimize_quality", 75)))
+        optimize_quality_entry = ctk.CTkEntry(optimize_frame, textvariable=self.optimize_quality_var, width=60)
+        optimize_quality_entry.pack(side="left", padx=5, pady=10)
+        
+        # Eén bestand per document (multi-page TIFF of archief)
+        container_frame = ctk.CTkFrame(conversion_frame)
+        container_frame.pack(fill="x", padx=15, pady=5)
+        
+        ctk.CTkLabel(container_frame, text="Output bestand:").pack(side="left", padx=10, pady=10)
+        self.output_container_var = ctk.StringVar(value=self.settings.get("conversion", "output_container", "files"))
+        output_container_menu = ctk.CTkOptionMenu(
+            container_frame,
+            variable=self.output_container_var,
+            values=["files", "tiff", "zip", "cbz", "tar", "dzi"],
+            width=100
+        )
+        output_container_menu.pack(side="left", padx=10, pady=10)
+        
+        ctk.CTkLabel(container_frame, text="Tegels:").pack(side="left", padx=5, pady=10)
+        self.tile_size_var = ctk.StringVar(value=str(self.settings.get("conversion", "tile_size", 256)))
+        tile_size_entry = ctk.CTkEntry(container_frame, textvariable=self.tile_size_var, width=60)
+        tile_size_entry.pack(side="left", padx=5, pady=10)
+        
+        ctk.CTkLabel(container_frame, text="TIFF compressie:").pack(side="left", padx=5, pady=10)
+        self.tiff_compression_var = ctk.StringVar(value=self.settings.get("conversion", "tiff_compression", "auto"))
+        tiff_compression_menu = ctk.CTkOptionMenu(
+            container_frame,
+            variable=self.tiff_compression_var,
+            values=["auto", "none", "lzw", "deflate", "group4"],
+            width=100
+        )
+        tiff_compression_menu.pack(side="left", padx=10, pady=10)
+        
+        # Extra formaten uit dezelfde rendering (naam:dpi[:formaat[:kwaliteit]], ...)
+        sizes_frame = ctk.CTkFrame(conversion_frame)
+        sizes_frame.pack(fill="x", padx=15, pady=5)
+        
+        ctk.CTkLabel(sizes_frame, text="Extra formaten:").pack(side="left", padx=10, pady=10)
+        self.output_sizes_var = ctk.StringVar(value=self.settings.get("conversion", "output_sizes", ""))
+        output_sizes_entry = ctk.CTkEntry(sizes_frame, textvariable=self.output_sizes_var, width=300)
+        output_sizes_entry.pack(side="left", padx=10, pady=10)
+        ctk.CTkLabel(sizes_frame, text="bv. medium:150:JPG:85, thumb:50:WEBP:75").pack(side="left", padx=5, pady=10)
+        
+        # Lege pagina's
+        blank_frame = ctk.CTkFrame(conversion_frame)
+        blank_frame.pack(fill="x", padx=15, pady=5)
+        
+        ctk.CTkLabel(blank_frame, text="Lege pagina's:").pack(side="left", padx=10, pady=10)
+        self.blank_pages_var = ctk.StringVar(value=self.settings.get("conversion", "blank_pages", "keep"))
+        blank_pages_menu = ctk.CTkOptionMenu(
+            blank_frame,
+            variable=self.blank_pages_var,
+            values=["keep", "skip", "placeholder"],
+            width=120
+        )
+        blank_pages_menu.pack(side="left", padx=10, pady=10)
+        
+        ctk.CTkLabel(blank_frame, text="Tolerantie:").pack(side="left", padx=5, pady=10)
+        self.blank_tolerance_var = ctk.StringVar(value=str(self.settings.get("conversion", "blank_tolerance", 0.002)))
+        blank_tolerance_entry = ctk.CTkEntry(blank_frame, textvariable=self.blank_tolerance_var, width=60)
+        blank_tolerance_entry.pack(side="left", padx=5, pady=10)
+        
         # Checkboxes
         checkbox_frame = ctk.CTkFrame(conversion_frame)
         checkbox_frame.pack(fill="x", padx=15, pady=5)
@@ -234,6 +356,38 @@ class SettingsWindow:
         )
         auto_open_checkbox.pack(anchor="w", padx=10, pady=5)
         
+        self.compact_pdf_var = ctk.BooleanVar(value=self.settings.get("conversion", "compact_pdf", False))
+        compact_pdf_checkbox = ctk.CTkCheckBox(
+            checkbox_frame,
+            text="Compacte PDF output (object streams)",
+            variable=self.compact_pdf_var
+        )
+        compact_pdf_checkbox.pack(anchor="w", padx=10, pady=5)
+        
+        self.linearize_pdf_var = ctk.BooleanVar(value=self.settings.get("conversion", "linearize_pdf", False))
+        linearize_pdf_checkbox = ctk.CTkCheckBox(
+            checkbox_frame,
+            text="Gelineariseerde PDF output (snelle web weergave)",
+            variable=self.linearize_pdf_var
+        )
+        linearize_pdf_checkbox.pack(anchor="w", padx=10, pady=5)
+        
+        self.merge_skip_blank_var = ctk.BooleanVar(value=self.settings.get("conversion", "merge_skip_blank", False))
+        merge_skip_blank_checkbox = ctk.CTkCheckBox(
+            checkbox_frame,
+            text="Lege pagina's weglaten bij samenvoegen",
+            variable=self.merge_skip_blank_var
+        )
+        merge_skip_blank_checkbox.pack(anchor="w", padx=10, pady=5)
+        
+        self.adaptive_color_var = ctk.BooleanVar(value=self.settings.get("conversion", "adaptive_color", False))
+        adaptive_color_checkbox = ctk.CTkCheckBox(
+            checkbox_frame,
+            text="Kleur per pagina aanpassen (kleur, grijs of zwart-wit)",
+            variable=self.adaptive_color_var
+        )
+        adaptive_color_checkbox.pack(anchor="w", padx=10, pady=5)
+        
     def create_ui_tab(self, parent):
         """UI instellingen"""
         ui_frame = ctk.CTkFrame(parent)
@@ -342,6 +496,66 @@ class SettingsWindow:
         )
         temp_button.pack(side="right", padx=5, pady=10)
         
+        # Render backend
+        backend_frame = ctk.CTkFrame(advanced_frame)
+        backend_frame.pack(fill="x", padx=15, pady=5)
+        
+        ctk.CTkLabel(backend_frame, text="Render Backend:").pack(side="left", padx=10, pady=10)
+        
+        self.render_backend_var = ctk.StringVar(value=self.settings.get("advanced", "render_backend", "auto"))
+        backend_menu = ctk.CTkOptionMenu(
+            backend_frame,
+            variable=self.render_backend_var,
+            values=["auto", "pdftoppm", "pdftocairo", "pymupdf"]
+        )
+        backend_menu.pack(side="left", padx=10, pady=10)
+        
+        # Kalibratie
+        calibrate_frame = ctk.CTkFrame(advanced_frame)
+        calibrate_frame.pack(fill="x", padx=15, pady=5)
+        
+        self.calibrate_button = ctk.CTkButton(
+            calibrate_frame,
+            text="Kalibreer deze machine",
+            command=self.start_calibration,
+            width=180
+        )
+        self.calibrate_button.pack(side="left", padx=10, pady=10)
+        
+        self.calibrate_label = ctk.CTkLabel(calibrate_frame, text="Meet de beste instellingen (± 30 seconden)")
+        self.calibrate_label.pack(side="left", padx=10, pady=10)
+        
+    def start_calibration(self):
+        """Start de kalibratie in de achtergrond"""
+        self.calibrate_button.configure(state="disabled")
+        self.calibrate_label.configure(text="Bezig met meten...")
+        threading.Thread(target=self.run_calibration, daemon=True).start()
+        
+    def run_calibration(self):
+        """Kalibreer en toon het resultaat (draait in een thread)"""
+        from calibrate import calibrate
+        try:
+            report = calibrate(self.settings, log=lambda message: None)
+            self.window.after(0, self.calibration_done, report, None)
+        except Exception as e:
+            self.window.after(0, self.calibration_done, None, e)
+            
+    def calibration_done(self, report, error):
+        """Zet de gemeten waarden in het venster"""
+        if not self.window:
+            return
+        self.calibrate_button.configure(state="normal")
+        if error:
+            self.calibrate_label.configure(text=f"Kalibratie gefaald: {error}")
+            return
+        # Anders overschrijft save_settings de gemeten waarden weer
+        self.thread_count_var.set(str(report["thread_count"]))
+        self.memory_limit_var.set(str(report["memory_limit"]))
+        self.compression_var.set(report["compression"])
+        self.calibrate_label.configure(
+            text=f"Workers: {report['thread_count']}, geheugen: {report['memory_limit']} MB, compressie: {report['compression']}"
+        )
+        
     def on_closing(self):
         """Handler voor venster sluiten"""
         # Sla alle instellingen op
@@ -350,19 +564,22 @@ class SettingsWindow:
         # Sluit venster
         self.window.destroy()
         self.window = None
+        
+        if self.on_close_callback:
+            self.on_close_callback()
     
     def on_theme_change(self, theme):
         """Thema wijziging handler"""
         # Alleen opslaan, niet direct toepassen
         self.settings.set("general", "theme", theme)
-        self.settings.save_settings()
+        self.settings.flush()
         
     def on_language_change(self, language):
         """Taal wijziging handler"""
         print(f"Language changed to: {language}")
         # Alleen opslaan, niet direct toepassen
         self.settings.set("general", "language", language)
-        self.settings.save_settings()
+        self.settings.flush()
         
     def browse_temp_folder(self):
         """Blader naar temp map"""
@@ -404,13 +621,18 @@ class SettingsWindow:
                 messagebox.showerror("Fout", "Kon instellingen niet importeren!")
                 
     def save_and_close(self):
-        """Bewaar instellingen en herstart applicatie"""
+        """Bewaar instellingen en pas ze toe (zonder callback: herstart applicatie)"""
         self.save_settings()
         
         # Sluit instellingen venster
         self.window.destroy()
         self.window = None
         
+        # Thema en taal kunnen direct worden toegepast, dan is herstarten niet nodig
+        if self.on_close_callback:
+            self.on_close_callback()
+            return
+        
         # Herstart applicatie
         import sys
         import subprocess
@@ -419,30 +641,51 @@ class SettingsWindow:
         
     def save_settings(self):
         """Bewaar alle instellingen"""
-        # Algemene instellingen
-        self.settings.set("general", "theme", self.theme_var.get())
-        self.settings.set("general", "language", self.language_var.get())
-        self.settings.set("general", "auto_update_check", self.auto_update_var.get())
-        self.settings.set("general", "remember_last_folder", self.remember_folder_var.get())
-        
-        # Conversie instellingen
-        self.settings.set("conversion", "default_dpi", int(self.default_dpi_var.get()))
-        self.settings.set("conversion", "default_format", self.default_format_var.get())
-        self.settings.set("conversion", "quality", self.quality_var.get())
-        self.settings.set("conversion", "preserve_metadata", self.preserve_metadata_var.get())
-        self.settings.set("conversion", "auto_open_output", self.auto_open_var.get())
-        
-        # UI instellingen
-        self.settings.set("ui", "window_width", int(self.width_var.get()))
-        self.settings.set("ui", "window_height", int(self.height_var.get()))
-        self.settings.set("ui", "show_preview", self.show_preview_var.get())
-        self.settings.set("ui", "show_stats", self.show_stats_var.get())
-        self.settings.set("ui", "compact_mode", self.compact_mode_var.get())
-        
-        # Geavanceerde instellingen
-        self.settings.set("advanced", "thread_count", int(self.thread_count_var.get()))
-        self.settings.set("advanced", "memory_limit", int(self.memory_limit_var.get()))
-        self.settings.set("advanced", "temp_folder", self.temp_folder_var.get())
+        # Eén keer wegschrijven in plaats van bij elke set()
+        with self.settings.batch():
+            # Algemene instellingen
+            self.settings.set("general", "theme", self.theme_var.get())
+            self.settings.set("general", "language", self.language_var.get())
+            self.settings.set("general", "auto_update_check", self.auto_update_var.get())
+            self.settings.set("general", "remember_last_folder", self.remember_folder_var.get())
+        
+            # Conversie instellingen
+            self.settings.set("conversion", "default_dpi", int(self.default_dpi_var.get()))
+            self.settings.set("conversion", "default_format", self.default_format_var.get())
+            self.settings.set("conversion", "quality", self.quality_var.get())
+            self.settings.set("conversion", "compression", self.compression_var.get())
+            self.settings.set("conversion", "preserve_metadata", self.preserve_metadata_var.get())
+            self.settings.set("conversion", "auto_open_output", self.auto_open_var.get())
+            self.settings.set("conversion", "compact_pdf", self.compact_pdf_var.get())
+            self.settings.set("conversion", "linearize_pdf", self.linearize_pdf_var.get())
+            self.settings.set("conversion", "split_method", self.split_method_var.get())
+            self.settings.set("conversion", "split_pages", int(self.split_pages_var.get()))
+            self.settings.set("conversion", "split_size_mb", float(self.split_size_var.get()))
+            self.settings.set("conversion", "optimize_dpi", int(self.optimize_dpi_var.get()))
+            self.settings.set("conversion", "optimize_quality", int(self.optimize_quality_var.get()))
+            self.settings.set("conversion", "optimize_compression", self.optimize_compression_var.get())
+            self.settings.set("conversion", "blank_pages", self.blank_pages_var.get())
+            self.settings.set("conversion", "blank_tolerance", float(self.blank_tolerance_var.get()))
+            self.settings.set("conversion", "merge_skip_blank", self.merge_skip_blank_var.get())
+            self.settings.set("conversion", "adaptive_color", self.adaptive_color_var.get())
+            self.settings.set("conversion", "output_container", self.output_container_var.get())
+            self.settings.set("conversion", "tiff_compression", self.tiff_compression_var.get())
+            self.settings.set("conversion", "tile_size", int(self.tile_size_var.get()))
+            parse_sizes(self.output_sizes_var.get())
+            self.settings.set("conversion", "output_sizes", self.output_sizes_var.get().strip())
+        
+            # UI instellingen
+            self.settings.set("ui", "window_width", int(self.width_var.get()))
+            self.settings.set("ui", "window_height", int(self.height_var.get()))
+            self.settings.set("ui", "show_preview", self.show_preview_var.get())
+            self.settings.set("ui", "show_stats", self.show_stats_var.get())
+            self.settings.set("ui", "compact_mode", self.compact_mode_var.get())
+        
+            # Geavanceerde instellingen
+            self.settings.set("advanced", "thread_count", int(self.thread_count_var.get()))
+            self.settings.set("advanced", "memory_limit", int(self.memory_limit_var.get()))
+            self.settings.set("advanced", "temp_folder", self.temp_folder_var.get())
+            self.settings.set("advanced", "render_backend", self.render_backend_var.get())
         
     def close_window(self):
         """Sluit instellingen venster"""
@@ -4,7 +4,9 @@ MakkelijkPdf Setup Wizard
 Alles-in-één installatie en setup wizard
 """
 
+import importlib.util
 import os
+import shutil
 import sys
 import subprocess
 import platform
@@ -54,7 +56,8 @@ def install_dependencies():
         "Pillow==10.2.0", 
         "setuptools==69.5.1",
         "customtkinter==5.2.2",
-        "PyPDF2==3.0.1"
+        "PyPDF2==3.0.1",
+        "numpy==1.26.4"
     ]
     
     failed_deps = []
@@ -70,7 +73,7 @@ def install_dependencies():
     
     if failed_deps:
         print(f"\n⚠️ {len(failed_deps)} dependencies gefaald: {', '.join(failed_deps)}")
-        print("   Probeer handmatig: pip install pdf2image Pillow customtkinter setuptools")
+        print("   Probeer handmatig: pip install pdf2image Pillow customtkinter setuptools numpy")
         return False
     
     print("✅ Alle dependencies geïnstalleerd!")
@@ -225,18 +228,19 @@ def test_application():
     """Test de applicatie"""
     print("\n🧪 Test applicatie...")
     try:
-        # Import test
-        import customtkinter
-        import pdf2image
-        from PIL import Image
-        print("   ✅ Alle modules kunnen worden geïmporteerd")
+        # Import test (alleen zoeken, niet importeren: dat doet de applicatie zelf)
+        missing = [name for name in ["customtkinter", "pdf2image", "PIL", "PyPDF2", "numpy"]
+                   if importlib.util.find_spec(name) is None]
+        if missing:
+            raise ImportError(f"Ontbrekende modules: {', '.join(missing)}")
+        print("   ✅ Alle modules zijn geïnstalleerd")
         
         # Poppler test
-        try:
-            from pdf2image import convert_from_path
+        from poppler import poppler_command
+        if shutil.which(poppler_command("pdftoppm")):
             print("   ✅ Poppler is beschikbaar")
-        except Exception as e:
-            print(f"   ⚠️ Poppler test gefaald: {e}")
+        else:
+            print("   ⚠️ Poppler test gefaald: pdftoppm niet gevonden")
         
         return True
         
@@ -244,6 +248,18 @@ def test_application():
         print(f"   ❌ Test gefaald: {e}")
         return False
 
+def calibrate_machine():
+    """Stem prestatie-instellingen af op deze machine"""
+    print("\n📏 Kalibreer prestatie-instellingen...")
+    try:
+        from calibrate import calibrate
+        calibrate()
+        print("   ✅ Instellingen afgestemd op deze machine")
+        return True
+    except Exception as e:
+        print(f"   ❌ Kalibratie gefaald: {e}")
+        return False
+
 def start_application():
     """Start de applicatie"""
     print("\n🚀 Start MakkelijkPdf...")
@@ -287,7 +303,11 @@ def main():
     if not test_application():
         print("\n⚠️ Test gefaald, maar setup gaat door...")
     
-    # Stap 6: Start applicatie
+    # Stap 6: Kalibreren
+    if not calibrate_machine():
+        print("\n⚠️ Kalibratie gefaald, standaard instellingen blijven actief...")
+    
+    # Stap 7: Start applicatie
     print("\n" + "=" * 60)
     print("🎉 SETUP VOLTOOID!")
     print("=" * 60)
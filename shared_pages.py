@@ -0,0 +1,127 @@
+"""
+MakkelijkPdf - Gedeeld geheugen voor gerenderde pagina's
+
+Een pagina op 300-600 DPI is al snel 25-100 MB. Die met pickle van een
+worker proces terugsturen betekent kopiëren naar een pipe en aan de andere
+kant weer terug. Hier schrijft de worker de pixels in een blok gedeeld
+geheugen uit een pool die het hoofdproces beheert en hergebruikt; tussen
+de processen gaat alleen een beschrijving (naam, afmetingen, mode). Het
+hoofdproces maakt er met Image.frombuffer een afbeelding van zonder kopie.
+
+Pillow bewaart RGB intern als RGBX (4 bytes per pixel); alleen in die
+vorm kan een afbeelding direct op het geheugen blok staan. Kleur pagina's
+worden daarom als RGBX gedeeld.
+"""
+
+import threading
+from multiprocessing import shared_memory
+
+# Blokken worden afgerond op een veelvoud hiervan, zodat ze makkelijker herbruikbaar zijn
+BLOCK_ROUNDING = 1024 * 1024
+
+# Mode van de pagina -> (mode in het gedeelde blok, bytes per pixel)
+SHARED_MODES = {"RGB": ("RGBX", 4), "L": ("L", 1)}
+
+
+def page_bytes(width, height, mode="RGB"):
+    """Benodigde blokgrootte voor een pagina"""
+    return width * height * SHARED_MODES.get(mode, SHARED_MODES["RGB"])[1]
+
+
+def write_page(name, image):
+    """Worker: schrijf een pagina in een blok; geeft de beschrijving terug, None als hij niet past"""
+    if image.mode not in SHARED_MODES:
+        image = image.convert("RGB")
+    shared_mode, _ = SHARED_MODES[image.mode]
+    needed = page_bytes(image.width, image.height, image.mode)
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        if needed > block.size:
+            return None
+        block.buf[:needed] = image.tobytes("raw", shared_mode)
+    finally:
+        block.close()
+    return name, image.size, shared_mode
+
+
+class SharedPagePool:
+    """Herbruikbare blokken gedeeld geheugen, eigendom van het hoofdproces"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Naam -> SharedMemory, en de namen van blokken die niet in gebruik zijn
+        self.blocks = {}
+        self.free = []
+        # Verwijderde blokken waar nog een afbeelding naar verwees; later sluiten
+        self.retired = []
+
+    def acquire(self, size):
+        """Geef de naam van een vrij blok van minstens size bytes"""
+        with self.lock:
+            fitting = [name for name in self.free if self.blocks[name].size >= size]
+            if fitting:
+                name = min(fitting, key=lambda name: self.blocks[name].size)
+                self.free.remove(name)
+                return name
+
+            # Vrije blokken die te klein zijn worden niet meer gebruikt (bv. na een hogere DPI)
+            for name in self.free:
+                self._unlink(self.blocks.pop(name))
+            self.free = []
+
+            rounded = -(-size // BLOCK_ROUNDING) * BLOCK_ROUNDING
+            block = shared_memory.SharedMemory(create=True, size=rounded)
+            self.blocks[block.name] = block
+            return block.name
+
+    def release(self, name):
+        """Geef een blok terug; afbeeldingen erop zijn daarna niet meer geldig"""
+        with self.lock:
+            if name in self.blocks and name not in self.free:
+                self.free.append(name)
+
+    def trim(self):
+        """Verwijder de blokken die niet in gebruik zijn (geheugen in /dev/shm teruggeven)"""
+        with self.lock:
+            for name in self.free:
+                self._unlink(self.blocks.pop(name))
+            self.free = []
+            self._close_retired()
+
+    def image(self, descriptor):
+        """PIL afbeelding (RGBX of L) direct op het gedeelde geheugen, zonder kopie"""
+        from PIL import Image
+
+        name, size, mode = descriptor
+        return Image.frombuffer(mode, size, self.blocks[name].buf, "raw", mode, 0, 1)
+
+    def close(self):
+        """Verwijder alle blokken"""
+        with self.lock:
+            for block in self.blocks.values():
+                self._unlink(block)
+            self.blocks = {}
+            self.free = []
+            self._close_retired()
+
+    def _unlink(self, block):
+        """Sluit en verwijder één blok, ook als er nog een afbeelding naar verwijst"""
+        try:
+            block.close()
+        except BufferError:
+            # Er bestaat nog een afbeelding op dit blok; het geheugen verdwijnt met die afbeelding
+            self.retired.append(block)
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _close_retired(self):
+        """Sluit verwijderde blokken waarvan de afbeeldingen inmiddels weg zijn"""
+        still_used = []
+        for block in self.retired:
+            try:
+                block.close()
+            except BufferError:
+                still_used.append(block)
+        self.retired = still_used
@@ -0,0 +1,229 @@
+"""
+MakkelijkPdf - Gevirtualiseerd thumbnail raster voor de preview
+"""
+
+import math
+import os
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import customtkinter as ctk
+from renderer_pool import get_pool
+
+# Afmetingen van een cel in het raster (pixels)
+THUMB_WIDTH = 96
+CELL_WIDTH = 112
+CELL_HEIGHT = 150
+
+# Lage resolutie is genoeg voor thumbnails
+THUMB_DPI = 24
+
+# Aantal extra rijen boven en onder het zichtbare deel
+OVERSCAN_ROWS = 2
+
+# Aantal thumbnails dat in het geheugen bewaard blijft
+THUMB_CACHE_SIZE = 200
+
+# Aantal gelijktijdige render processen (pdftoppm)
+THUMB_WORKERS = 2
+
+# Interval voor het ophalen van klaar gerenderde thumbnails (ms)
+POLL_INTERVAL = 50
+
+
+def _scroll_canvas(container):
+    """Canvas waarin een CTkScrollableFrame scrolt
+
+    customtkinter heeft hier geen publieke API voor; _parent_canvas is intern.
+    De frame zelf staat altijd in die canvas, dus dat is de terugval.
+    """
+    canvas = getattr(container, "_parent_canvas", None)
+    return canvas if canvas is not None else container.master
+
+
+def _clear_image(cell):
+    """Haal de afbeelding uit een CTkLabel (image=None doet dat niet in elke versie)"""
+    label = getattr(cell, "_label", None)
+    if label is not None:
+        label.configure(image="")
+
+
+class ThumbnailGrid:
+    """Raster van pagina thumbnails dat alleen zichtbare rijen opbouwt en rendert"""
+
+    def __init__(self, container, workers=THUMB_WORKERS, cache_size=THUMB_CACHE_SIZE):
+        self.container = container
+        self.canvas = _scroll_canvas(container)
+        self.cache_size = cache_size
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.results = queue.Queue()
+        self.cache = OrderedDict()
+        self.cells = {}
+        self.free = []
+        self.futures = {}
+        self.path = None
+        self.mtime = None
+        self.page_count = 0
+        self.generation = 0
+        self.refresh_pending = False
+        self.polling = False
+
+        # Alle cellen worden met place() in deze frame gezet
+        self.spacer = ctk.CTkFrame(container, height=1, fg_color="transparent")
+        self.spacer.pack(fill="x", padx=5, pady=5)
+
+        # Meeluisteren met scrollen en resizen; de bestaande yscrollcommand (de scrollbar) blijft werken
+        previous = self.canvas.cget("yscrollcommand")
+
+        def on_scroll(first, last):
+            if previous:
+                self.canvas.tk.call(*self.canvas.tk.splitlist(previous), first, last)
+            self.schedule_refresh()
+
+        self.canvas.configure(yscrollcommand=on_scroll)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_refresh(), add="+")
+
+    def load(self, path, page_count):
+        """Toon de pagina's van een (nieuwe) PDF"""
+        self.clear()
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self.page_count = page_count
+        self.schedule_refresh()
+
+    def clear(self):
+        """Verwijder alle thumbnails en annuleer openstaand renderwerk"""
+        self.generation += 1
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        for page in list(self.cells):
+            self._release(page)
+        self.path = None
+        self.page_count = 0
+        self.spacer.configure(height=1)
+
+    def shutdown(self):
+        """Stop de render pool"""
+        self.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def schedule_refresh(self):
+        """Bundel scroll en resize events tot één refresh"""
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            self.container.after_idle(self.refresh)
+
+    def refresh(self):
+        """Plaats cellen voor de rijen in of vlak bij het zichtbare deel"""
+        self.refresh_pending = False
+        if not self.page_count:
+            return
+
+        columns = max(1, (self.canvas.winfo_width() - 10) // CELL_WIDTH)
+        rows = math.ceil(self.page_count / columns)
+        height = rows * CELL_HEIGHT
+        if self.spacer.cget("height") != height:
+            self.spacer.configure(height=height)
+
+        top = self.canvas.canvasy(0) - self.spacer.winfo_y()
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // CELL_HEIGHT) - OVERSCAN_ROWS)
+        last_row = min(rows - 1, int(bottom // CELL_HEIGHT) + OVERSCAN_ROWS)
+        wanted = range(first_row * columns, min(self.page_count, (last_row + 1) * columns))
+
+        # Cellen buiten beeld terug in de pool
+        for page in list(self.cells):
+            if page not in wanted:
+                self._release(page)
+
+        for page in wanted:
+            cell = self.cells.get(page)
+            if cell is None:
+                cell = self.free.pop() if self.free else self._create_cell()
+                self.cells[page] = cell
+                self._show(cell, page)
+            row, column = divmod(page, columns)
+            cell.place(x=column * CELL_WIDTH, y=row * CELL_HEIGHT, width=CELL_WIDTH - 6, height=CELL_HEIGHT - 6)
+
+    def _create_cell(self):
+        """Maak een nieuwe (herbruikbare) thumbnail cel"""
+        return ctk.CTkLabel(
+            self.spacer,
+            text="",
+            compound="top",
+            corner_radius=8,
+            fg_color=("#ecf0f1", "#2a3441"),
+            font=ctk.CTkFont(size=11)
+        )
+
+    def _release(self, page):
+        """Haal een cel uit beeld en zet hem terug in de pool"""
+        cell = self.cells.pop(page)
+        cell.place_forget()
+        self.free.append(cell)
+        future = self.futures.pop((cell, page), None)
+        if future:
+            future.cancel()
+
+    def _placeholder(self, cell, text):
+        """Toon tekst zonder afbeelding in een (hergebruikte) cel"""
+        cell.configure(image=None, text=text)
+        _clear_image(cell)
+
+    def _show(self, cell, page):
+        """Vul een cel met de thumbnail uit de cache of start het renderen"""
+        key = (self.path, self.mtime, page)
+        image = self.cache.get(key)
+        if image is not None:
+            self.cache.move_to_end(key)
+            cell.configure(image=image, text=str(page + 1))
+            return
+        self._placeholder(cell, f"⏳\n{page + 1}")
+        if (cell, page) not in self.futures:
+            self.futures[(cell, page)] = self.executor.submit(self._render, self.generation, key, cell)
+            if not self.polling:
+                self.polling = True
+                self.container.after(POLL_INTERVAL, self._poll)
+
+    def _render(self, generation, key, cell):
+        """Render één pagina op lage DPI (draait in de achtergrond pool)"""
+        if generation != self.generation:
+            return
+        path, _, page = key
+        try:
+            # Eén pdftoppm aanroep, pagina aantal uit de pool (geen pdfinfo per thumbnail)
+            images = get_pool().render(path, dpi=THUMB_DPI, first_page=page + 1, last_page=page + 1)
+            image = images[0] if images else None
+            if image:
+                image.thumbnail((THUMB_WIDTH, THUMB_WIDTH * 4))
+        except Exception:
+            image = None
+        self.results.put((generation, key, cell, image))
+
+    def _poll(self):
+        """Verwerk klaar gerenderde thumbnails in de Tk thread"""
+        while not self.results.empty():
+            generation, key, cell, image = self.results.get()
+            if generation != self.generation:
+                continue
+            page = key[2]
+            # Alleen de opdracht van deze cel; een nieuwere voor dezelfde pagina blijft staan
+            self.futures.pop((cell, page), None)
+            current = self.cells.get(page) is cell
+            if image is None:
+                if current:
+                    self._placeholder(cell, f"❌\n{page + 1}")
+                continue
+
+            thumbnail = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+            self.cache[key] = thumbnail
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            if current:
+                cell.configure(image=thumbnail, text=str(page + 1))
+
+        if self.futures:
+            self.container.after(POLL_INTERVAL, self._poll)
+        else:
+            self.polling = False
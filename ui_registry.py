@@ -0,0 +1,73 @@
+"""
+MakkelijkPdf - Register van vertaalbare en thema-afhankelijke widgets
+
+Widgets worden één keer geregistreerd met hun teksten per taal (of waarden
+per thema). Een taal- of themawissel loopt daarna alleen deze lijst door
+en configureert alleen de eigenschappen die echt veranderen, in plaats van
+de hele widget boom te updaten.
+"""
+
+
+class WidgetRegistry:
+    """Houdt bij welke widget eigenschappen van de taal of het thema afhangen"""
+
+    def __init__(self, language="nl", theme="system"):
+        self.language = language
+        self.theme = theme
+        # Lijsten van (widget, optie, bron, groep); bron is een dict of een functie
+        self.translations = []
+        self.themed = []
+
+    def translate(self, widget, texts, option="text", group=None):
+        """Registreer een tekst per taal: {"nl": ..., "en": ...} of functie(taal)"""
+        self.translations.append((widget, option, texts, group))
+        self._apply(widget, option, texts, self.language)
+
+    def theme_value(self, widget, values, option="text", group=None):
+        """Registreer een waarde per thema: {"light": ..., "dark": ..., "system": ...} of functie(thema)"""
+        self.themed.append((widget, option, values, group))
+        self._apply(widget, option, values, self.theme)
+
+    def set_language(self, language):
+        """Pas alle vertalingen in één keer toe"""
+        self.language = language
+        self.translations = self._apply_all(self.translations, language)
+
+    def set_theme(self, theme):
+        """Pas alle thema-afhankelijke waarden in één keer toe
+
+        Kleuren als (licht, donker) tuple werkt customtkinter zelf bij via
+        set_appearance_mode; hier staan alleen de overige eigenschappen.
+        """
+        self.theme = theme
+        self.themed = self._apply_all(self.themed, theme)
+
+    def refresh(self, group):
+        """Pas een groep opnieuw toe (bv. teksten die van de conversie mode afhangen)"""
+        for widget, option, source, entry_group in self.translations:
+            if entry_group == group:
+                self._apply(widget, option, source, self.language)
+        for widget, option, source, entry_group in self.themed:
+            if entry_group == group:
+                self._apply(widget, option, source, self.theme)
+
+    def _apply_all(self, entries, key):
+        """Pas alle entries toe en vergeet widgets die niet meer bestaan"""
+        alive = []
+        for entry in entries:
+            widget, option, source, _ = entry
+            try:
+                if not widget.winfo_exists():
+                    continue
+            except Exception:
+                continue
+            self._apply(widget, option, source, key)
+            alive.append(entry)
+        return alive
+
+    def _apply(self, widget, option, source, key):
+        """Configureer één eigenschap, alleen als de waarde verandert"""
+        value = source(key) if callable(source) else source.get(key)
+        if value is None or widget.cget(option) == value:
+            return
+        widget.configure(**{option: value})
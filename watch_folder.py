@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+MakkelijkPdf - Watch Folder (PDF's automatisch naar afbeeldingen converteren)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from image_pyramid import parse_sizes
+from renderer_pool import RendererPool
+from settings import SettingsManager
+
+# Een bestand moet zo lang onveranderd zijn voordat het wordt opgepakt (seconden)
+SETTLE_SECONDS = 2.0
+
+# Interval tussen twee scans van de input map (seconden)
+POLL_INTERVAL = 1.0
+
+# Bestand waarin de tellers worden gepubliceerd
+STATUS_FILENAME = "watch_status.json"
+
+
+def _move_unique(path, folder):
+    """Verplaats een bestand naar folder zonder bestaande bestanden te overschrijven"""
+    os.makedirs(folder, exist_ok=True)
+    target = Path(folder) / Path(path).name
+    counter = 1
+    while target.exists():
+        target = Path(folder) / f"{Path(path).stem}_{counter}{Path(path).suffix}"
+        counter += 1
+    shutil.move(path, target)
+    return target
+
+
+class FolderWatcher:
+    """Bewaak een map en converteer nieuwe PDF's met een warme renderer pool
+
+    PDF's die in dezelfde scan klaar zijn worden in batches geconverteerd,
+    zodat veel kleine bestanden niet elk een eigen poppler proces kosten.
+    """
+
+    def __init__(self, input_folder, output_folder, done_folder=None, error_folder=None,
+                 settings=None, workers=0, settle_seconds=SETTLE_SECONDS, poll_interval=POLL_INTERVAL):
+        self.settings = settings or SettingsManager()
+        self.input_folder = input_folder
+        self.output_folder = output_folder
+        self.done_folder = done_folder or os.path.join(input_folder, "done")
+        self.error_folder = error_folder or os.path.join(input_folder, "error")
+        self.workers = workers or self.settings.get("advanced", "thread_count", 0) or os.cpu_count() or 1
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.stop_event = threading.Event()
+
+        # Kandidaten: pad -> ((grootte, mtime), sinds wanneer onveranderd)
+        self.candidates = {}
+        self.futures = {}
+        self.stats = {
+            "started_at": time.time(),
+            "files_done": 0,
+            "files_failed": 0,
+            "pages_converted": 0,
+            "bytes_written": 0,
+            "in_progress": 0,
+            "waiting": 0,
+            "files_per_minute": 0.0,
+            "pages_per_minute": 0.0,
+        }
+
+    def stop(self):
+        """Stop de watch loop na de huidige scan"""
+        self.stop_event.set()
+
+    def run(self):
+        """Scan, verdeel en verwerk tot stop() wordt aangeroepen"""
+        os.makedirs(self.output_folder, exist_ok=True)
+        pool = RendererPool(self.workers, backend=self.settings.get("advanced", "render_backend", "auto"))
+        try:
+            while not self.stop_event.is_set():
+                self.scan(pool)
+                if self.collect():
+                    # Een worker is gecrasht: de executor is onbruikbaar, de volgende scan start verse workers
+                    pool.shutdown()
+                self.publish()
+                self.stop_event.wait(self.poll_interval)
+            # Lopende conversies netjes afronden
+            for future in list(self.futures):
+                future.exception()
+            self.collect()
+            self.publish()
+        finally:
+            pool.shutdown()
+
+    def scan(self, pool):
+        """Zoek PDF's die niet meer veranderen en start hun conversie (in batches)"""
+        now = time.time()
+        busy = {path for paths in self.futures.values() for path in paths}
+        seen = set()
+        ready = []
+        for entry in os.scandir(self.input_folder):
+            if not entry.is_file() or not entry.name.lower().endswith(".pdf") or entry.path in busy:
+                continue
+            seen.add(entry.path)
+            try:
+                stat = entry.stat()
+            except OSError as e:
+                # Verdwenen tussen scandir en stat; de volgende scan ziet hem niet meer
+                print(f"⚠️ {entry.name}: {e}")
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            previous = self.candidates.get(entry.path)
+            if previous is None or previous[0] != signature:
+                # Nieuw of nog in beweging: opnieuw wachten
+                self.candidates[entry.path] = (signature, now)
+            elif stat.st_size > 0 and now - previous[1] >= self.settle_seconds:
+                del self.candidates[entry.path]
+                ready.append(entry.path)
+
+        if ready:
+            output_format = self.settings.get("conversion", "default_format", "PNG")
+            quality = self.settings.get("conversion", "quality", 95)
+            try:
+                sizes = parse_sizes(self.settings.get("conversion", "output_sizes", ""), output_format, quality)
+            except ValueError as e:
+                # Een foute instelling mag de watcher niet stoppen; zonder extra formaten verder
+                print(f"⚠️ output_sizes genegeerd: {e}")
+                sizes = []
+            options = (self.settings.get("conversion", "default_dpi", 300), output_format, quality,
+                       self.settings.get("conversion", "compression", "none"), sizes)
+            try:
+                batches = pool.submit(ready, self.output_folder, *options)
+            except BrokenProcessPool:
+                # Gecrasht sinds de laatste collect(); opnieuw met verse workers
+                pool.shutdown()
+                batches = pool.submit(ready, self.output_folder, *options)
+            for future, paths in batches:
+                self.futures[future] = paths
+            submitted = {path for _, paths in batches for path in paths}
+            for path in ready:
+                if path not in submitted:
+                    print(f"⚠️ {os.path.basename(path)}: verdwenen voor de conversie")
+
+        # Verdwenen bestanden vergeten
+        for path in list(self.candidates):
+            if path not in seen:
+                del self.candidates[path]
+
+    def collect(self):
+        """Verwerk afgeronde conversies: input naar done of error
+
+        Geeft True terug als een worker gecrasht is (de pool moet opnieuw beginnen).
+        """
+        broken = False
+        for future in [future for future in self.futures if future.done()]:
+            paths = self.futures.pop(future)
+            if future.exception() is not None:
+                # De hele batch is mislukt (bv. een gecrashte worker)
+                error = future.exception()
+                broken = broken or isinstance(error, BrokenProcessPool)
+                results = [(path, None, f"{type(error).__name__}: {error}") for path in paths]
+            else:
+                results = future.result()
+            for path, output_paths, error in results:
+                try:
+                    self.finish(path, output_paths, error)
+                except OSError as e:
+                    # Input of output verdwenen of op slot; de watcher moet doorgaan
+                    print(f"⚠️ {os.path.basename(path)}: {e}")
+        return broken
+
+    def finish(self, path, output_paths, error):
+        """Verplaats één verwerkte PDF en werk de tellers bij"""
+        if error is None:
+            pages = len(output_paths)
+            size = sum(os.path.getsize(output_path) for output_path in output_paths)
+            _move_unique(path, self.done_folder)
+            self.stats["files_done"] += 1
+            self.stats["pages_converted"] += pages
+            self.stats["bytes_written"] += size
+            print(f"✅ {os.path.basename(path)}: {pages} pagina('s)")
+        else:
+            target = _move_unique(path, self.error_folder)
+            with open(f"{target}.error.txt", "w", encoding="utf-8") as f:
+                f.write(f"{error}\n")
+            self.stats["files_failed"] += 1
+            print(f"❌ {os.path.basename(path)}: {error}")
+
+    def publish(self):
+        """Werk de tellers bij en schrijf ze naar de status file"""
+        minutes = max((time.time() - self.stats["started_at"]) / 60, 1 / 60)
+        self.stats["in_progress"] = sum(len(paths) for paths in self.futures.values())
+        self.stats["waiting"] = len(self.candidates)
+        self.stats["files_per_minute"] = round(self.stats["files_done"] / minutes, 2)
+        self.stats["pages_per_minute"] = round(self.stats["pages_converted"] / minutes, 2)
+
+        status_path = os.path.join(self.output_folder, STATUS_FILENAME)
+        with open(status_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.stats, f, indent=2)
+        os.replace(status_path + ".tmp", status_path)
+
+
+def main():
+    """Start de watch folder vanaf de command line"""
+    parser = argparse.ArgumentParser(description="MakkelijkPdf watch folder: converteer PDF's die in een map verschijnen")
+    parser.add_argument("input_folder", help="Map die bewaakt wordt")
+    parser.add_argument("output_folder", help="Map voor de afbeeldingen")
+    parser.add_argument("--done", help="Map voor verwerkte PDF's (standaard: input/done)")
+    parser.add_argument("--error", help="Map voor mislukte PDF's (standaard: input/error)")
+    parser.add_argument("--workers", type=int, default=0, help="Aantal worker processen (0 = instelling/auto)")
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS, help="Seconden dat een bestand onveranderd moet zijn")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Seconden tussen twee scans")
+    args = parser.parse_args()
+
+    watcher = FolderWatcher(
+        args.input_folder,
+        args.output_folder,
+        done_folder=args.done,
+        error_folder=args.error,
+        workers=args.workers,
+        settle_seconds=args.settle,
+        poll_interval=args.interval
+    )
+    print(f"👀 Bewaakt {args.input_folder} ({watcher.workers} workers), stop met Ctrl+C")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+        print("\n👋 Watch folder gestopt")
+
+
+if __name__ == "__main__":
+    main()